@@ -0,0 +1,118 @@
+"""Pickup evidence ingestion benchmark for 5-10MB phone photos.
+
+Measures per-photo cost of the base64 and multipart paths and how long the
+event loop stalls when a burst of submissions is handled on the loop versus
+in the image executor.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_evidence --photos 8 --width 4000 --height 3000
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.controllers import service_common
+from src.controllers.service_common import (
+    insert_image_to_local_base64,
+    reencode_image_to_local,
+    run_in_image_executor,
+)
+
+
+def make_photo(width: int, height: int) -> bytes:
+    # Smooth gradients plus noise compress like a real phone photo (~5-10MB)
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    base = np.stack([x * 255 // width, y * 255 // height, (x + y) % 256], axis=-1)
+    noise = rng.integers(0, 64, size=(height, width, 3))
+    pixels = np.clip(base + noise, 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, "JPEG", quality=95)
+    return buffer.getvalue()
+
+
+async def measure_burst(label: str, handler, photos: int):
+    lag = 0.0
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal lag
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - start - 0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(i) for i in range(photos)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    print(
+        f"{label:<32} burst {elapsed * 1000:>8.0f} ms"
+        f"  max loop stall {lag * 1000:>8.0f} ms"
+    )
+
+
+async def run(args):
+    photo = make_photo(args.width, args.height)
+    payload = json.dumps(
+        {"image_base64": "data:image/jpeg;base64," + base64.b64encode(photo).decode()}
+    )
+    print(f"photo {len(photo) / 1e6:.1f} MB, payload {len(payload) / 1e6:.1f} MB")
+
+    async def on_loop(i):
+        insert_image_to_local_base64(payload, f"{i}_evidence", "pickup_image")
+
+    async def base64_in_executor(i):
+        await run_in_image_executor(
+            insert_image_to_local_base64, payload, f"{i}_evidence", "pickup_image"
+        )
+
+    async def multipart_in_executor(i):
+        raw_path = f"assets/pickup_image/raw_{i}.jpg"
+        with open(raw_path, "wb") as f:
+            f.write(photo)
+        await run_in_image_executor(
+            reencode_image_to_local, raw_path, f"{i}_evidence", "pickup_image"
+        )
+
+    await measure_burst("base64 on event loop", on_loop, args.photos)
+    await measure_burst("base64 in image executor", base64_in_executor, args.photos)
+    await measure_burst(
+        "multipart in image executor", multipart_in_executor, args.photos
+    )
+    print(f"image executor workers: {service_common.IMAGE_WORKERS}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--photos", type=int, default=8)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.makedirs(os.path.join(workdir, "assets", "pickup_image"))
+    os.chdir(workdir)
+    try:
+        asyncio.run(run(args))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Import-time budget for the application modules.
+
+Runs a fresh interpreter with ``-X importtime`` and fails (exit code 1) when
+the total import time exceeds the budget or a heavy dependency is imported
+at startup. Run from the repository root:
+
+    python -m benchmarks.bench_import_time --budget-ms 3000
+"""
+
+import argparse
+import ast
+import importlib.util
+import subprocess
+import sys
+
+# main.py itself also mounts static directories and installs database hooks,
+# so by default the application modules it imports are measured instead
+MAIN_PATH = "main.py"
+APP_PACKAGES = ("src", "config")
+FORBIDDEN = ["ultralytics", "torch", "pandas", "xlsxwriter"]
+
+
+def main_imports(path: str = MAIN_PATH):
+    """Every application module main.py imports, in import order."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            spec = importlib.util.find_spec(node.module)
+            if spec is not None and spec.submodule_search_locations is not None:
+                # ``from config.models import user_model`` names submodules
+                names = [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                names = [node.module]
+        else:
+            continue
+        for name in names:
+            if name.split(".")[0] in APP_PACKAGES and name not in modules:
+                modules.append(name)
+    return modules
+
+
+def measure(modules):
+    code = "import " + ", ".join(modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(proc.stderr)
+
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nesting is shown by two spaces per level after the separator
+        timings.append((name.rstrip()[1:], int(cumulative)))
+    top_level = [(name, us) for name, us in timings if not name.startswith(" ")]
+    return timings, sum(us for _, us in top_level)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget-ms", type=float, default=3000)
+    parser.add_argument("--module", action="append", dest="modules")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    timings, total_us = measure(args.modules or main_imports())
+    print(f"{'module':<60} {'cumulative':>12}")
+    for name, us in sorted(timings, key=lambda t: t[1], reverse=True)[: args.top]:
+        print(f"{name:<60} {us / 1000:>9.1f} ms")
+    print(f"total: {total_us / 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failures = []
+    imported = {name.strip().split(".")[0] for name, _ in timings}
+    for module in FORBIDDEN:
+        if module in imported:
+            failures.append(f"{module} is imported at startup")
+    if total_us / 1000 > args.budget_ms:
+        failures.append("import time is over budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Login throughput and event loop stalls under concurrent password checks.
+
+Simulates a login storm by verifying ``--requests`` passwords with
+``--concurrency`` tasks in flight, once calling bcrypt directly on the event
+loop (the old behaviour) and once through the password executor. A ticker
+task measures how long the loop is blocked, which is what stalls uploads
+handled by the same worker.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_login --rounds 12 --workers 2 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import numpy as np
+
+
+async def ticker(stalls, interval=0.005):
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        stalls.append(loop.time() - start - interval)
+
+
+async def storm(verify, hashed, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    # Every login arrives at once, latency is measured from the start
+    async def login():
+        async with semaphore:
+            assert await verify("correct horse", hashed)
+            latencies.append(time.perf_counter() - start)
+
+    stalls = []
+    tick = asyncio.create_task(ticker(stalls))
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    # Let the ticker record the stall that ended with the last login
+    await asyncio.sleep(0.02)
+    tick.cancel()
+    return elapsed, latencies, stalls
+
+
+def report(name, requests, elapsed, latencies, stalls):
+    print(
+        f"{name:<10} {requests / elapsed:>8.1f} logins/s"
+        f"  p50 {np.percentile(latencies, 50) * 1000:>7.1f} ms"
+        f"  p95 {np.percentile(latencies, 95) * 1000:>7.1f} ms"
+        f"  max loop stall {max(stalls, default=0) * 1000:>7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=64)
+    args = parser.parse_args()
+
+    # Read by service_security at import time
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    from src.controllers.auth import service_security
+
+    hashed = service_security.pwd_context.hash("correct horse")
+
+    async def blocking_verify(password, hashed):
+        return service_security.pwd_context.verify(password, hashed)
+
+    print(
+        f"bcrypt rounds={args.rounds} workers={args.workers}"
+        f" concurrency={args.concurrency} requests={args.requests}"
+    )
+    for name, verify in [
+        ("blocking", blocking_verify),
+        ("executor", service_security.verify_password),
+    ]:
+        result = asyncio.run(
+            storm(verify, hashed, args.requests, args.concurrency)
+        )
+        report(name, args.requests, *result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Pickup route planner benchmark on random stops.
+
+Times the haversine matrix, the nearest-neighbour tour and 2-opt separately
+for each stop count and reports how much 2-opt shortens the greedy route.
+Stops are spread uniformly over a square of ``--area-km`` around Jakarta.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_route --stops 100,500,1000,2000 --budget-ms 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.controllers.sampah.service_route import (
+    haversine_matrix,
+    nearest_neighbour,
+    path_length,
+    two_opt,
+)
+
+START = (-6.2, 106.8167)
+
+
+def run(n, area_km, budget_ms, closed, seed):
+    rng = np.random.default_rng(seed)
+    # Roughly 111 km per degree at this latitude
+    span = area_km / 111
+    latitudes = np.concatenate([[START[0]], START[0] + rng.random(n) * span])
+    longitudes = np.concatenate([[START[1]], START[1] + rng.random(n) * span])
+
+    t0 = time.perf_counter()
+    dist = haversine_matrix(latitudes, longitudes)
+    t1 = time.perf_counter()
+    path = nearest_neighbour(dist)
+    if closed:
+        path = np.append(path, 0)
+    t2 = time.perf_counter()
+    greedy = path_length(dist, path)
+    passes, timed_out = two_opt(dist, path, t2 + budget_ms / 1000, closed)
+    t3 = time.perf_counter()
+    improved = path_length(dist, path)
+    return {
+        "matrix_ms": (t1 - t0) * 1000,
+        "nearest_neighbour_ms": (t2 - t1) * 1000,
+        "two_opt_ms": (t3 - t2) * 1000,
+        "greedy_km": greedy / 1000,
+        "route_km": improved / 1000,
+        "passes": passes,
+        "timed_out": timed_out,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stops", default="100,500,1000,2000")
+    parser.add_argument("--area-km", type=float, default=30)
+    parser.add_argument("--budget-ms", type=int, default=2000)
+    parser.add_argument("--closed", action="store_true", help="return to start")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'stops':>6} {'matrix ms':>10} {'nn ms':>8} {'2-opt ms':>9}"
+        f" {'greedy km':>10} {'route km':>9} {'gain':>6} {'passes':>6}"
+    )
+    for n in [int(n) for n in args.stops.split(",")]:
+        r = run(n, args.area_km, args.budget_ms, args.closed, args.seed)
+        gain = 1 - r["route_km"] / r["greedy_km"] if r["greedy_km"] else 0
+        print(
+            f"{n:>6} {r['matrix_ms']:>10.1f} {r['nearest_neighbour_ms']:>8.1f}"
+            f" {r['two_opt_ms']:>9.1f} {r['greedy_km']:>10.1f}"
+            f" {r['route_km']:>9.1f} {gain:>6.1%} {r['passes']:>6}"
+            f"{' (budget hit)' if r['timed_out'] else ''}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Serializer benchmark for the get_all_sampah listing payload.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_serialization --rows 50000
+"""
+
+import argparse
+import datetime
+import json
+import random
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from config.schemas.sampah_schema import (
+    CountObject,
+    OutputSampahDetail,
+    OutputSampahItem,
+)
+from src.controllers.service_response import FastJSONResponse
+
+JENIS_SAMPAH = [
+    ("Plastic Bottle", 10),
+    ("Plastic Bag", 5),
+    ("Can", 8),
+    ("Cardboard", 6),
+    ("Styrofoam", 4),
+    ("Garbage", 60),
+]
+
+
+def build_rows(rows: int, validate: bool):
+    random.seed(0)
+    model = OutputSampahDetail if validate else OutputSampahDetail.model_construct
+    item_model = OutputSampahItem if validate else OutputSampahItem.model_construct
+    count_model = CountObject if validate else CountObject.model_construct
+    now = datetime.datetime(2025, 1, 1, 8, 0, 0)
+    data = []
+    for i in range(rows):
+        items = [
+            item_model(nama=nama, point=point)
+            for nama, point in random.choices(JENIS_SAMPAH, k=random.randint(1, 6))
+        ]
+        counts = {}
+        for item in items:
+            if item.nama in counts:
+                counts[item.nama].count += 1
+                counts[item.nama].point += item.point
+            else:
+                counts[item.nama] = count_model(
+                    name=item.nama, count=1, point=item.point
+                )
+        picked_up = i % 3 == 0
+        data.append(
+            model(
+                id=i,
+                is_waste_pile=i % 5 == 0,
+                address=f"Jl. Contoh No. {i}, Kota Malang, Jawa Timur",
+                geom=f"POINT ({112.6 + random.random() / 10} {-7.9 - random.random() / 10})",
+                captureTime=now - datetime.timedelta(minutes=i),
+                is_pickup=picked_up,
+                pickupAt=now if picked_up else None,
+                pickup_by_user="petugas" if picked_up else None,
+                point=sum(item.point for item in items),
+                total_sampah=len(items),
+                sampah_items=items,
+                count_items=list(counts.values()),
+                image=f"https://example.com/detected-image/garbage_pcs_{i}.jpg",
+                evidence=(
+                    f"https://example.com/evidence/{i}_pickup_evidence.jpg"
+                    if picked_up
+                    else ""
+                ),
+            )
+        )
+    return data
+
+
+def timed(label: str, func, repeat: int):
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(func())
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<45} {best * 1000:>10.1f} ms {size / 1e6:>8.1f} MB")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    validated = build_rows(args.rows, validate=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{'build (validated models)':<45} {elapsed:>10.1f} ms")
+    start = time.perf_counter()
+    constructed = build_rows(args.rows, validate=False)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{'build (model_construct)':<45} {elapsed:>10.1f} ms")
+
+    response = FastJSONResponse(content=None)
+    baseline = timed(
+        "jsonable_encoder + json.dumps",
+        lambda: json.dumps(jsonable_encoder(validated)).encode("utf-8"),
+        args.repeat,
+    )
+    fast = timed(
+        "FastJSONResponse.render (orjson)",
+        lambda: response.render(constructed),
+        args.repeat,
+    )
+    print(f"speedup: {baseline / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Full-frame versus tiled YOLOv8Seg inference benchmark.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_tiled_inference --image photo.jpg
+    python -m benchmarks.bench_tiled_inference --width 4000 --height 3000
+"""
+
+import argparse
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from src.controllers.sampah.yolov8seg import YOLOv8Seg
+
+
+def measure(func, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="assets/models/garbage-pcs-yolov8.onnx")
+    parser.add_argument("--yaml", default="assets/models/garbage_pcs_data.yaml")
+    parser.add_argument("--image")
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--max-tiles", type=int, default=12)
+    parser.add_argument("--overlap", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    model = YOLOv8Seg(args.model, args.yaml)
+    if args.image:
+        im = cv2.imread(args.image)
+    else:
+        im = np.random.default_rng(0).integers(
+            0, 255, (args.height, args.width, 3), dtype=np.uint8
+        )
+    model(im)  # warm-up
+
+    full, (boxes, _, _) = measure(lambda: model(im), args.repeat)
+    print(
+        f"full frame   median {statistics.median(full) * 1000:>8.1f} ms"
+        f"  detections {len(boxes)}"
+    )
+
+    tile_size = 2 * max(model.model_height, model.model_width)
+    tiles = model.tile_grid(im.shape, tile_size, args.overlap, args.max_tiles)
+    tiled, (boxes, _, _) = measure(
+        lambda: model.predict_tiled(
+            im, overlap=args.overlap, max_tiles=args.max_tiles
+        ),
+        args.repeat,
+    )
+    median = statistics.median(tiled)
+    print(
+        f"tiled        median {median * 1000:>8.1f} ms"
+        f"  detections {len(boxes)}  tiles {len(tiles)}"
+        f"  tiles/sec {len(tiles) / median:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Stage-by-stage YOLOv8Seg benchmark on synthetic models.
+
+Measures decode, preprocess, session.run, postprocess (split into
+decode+NMS, process_mask and masks2segments) and draw_and_visualize for
+every combination of image size and detection count, and reports p50/p95
+latency, end-to-end throughput and peak RSS. Runs offline: models are
+generated with benchmarks.synthetic_model (requires ``onnx``).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_yolov8seg --output results.json
+    python -m benchmarks.bench_yolov8seg --baseline results.json --tolerance 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+
+from benchmarks.synthetic_model import build_model, write_names
+from src.controllers.sampah.yolov8seg import YOLOv8Seg
+
+STAGES = [
+    "decode",
+    "preprocess",
+    "session_run",
+    "postprocess",
+    "nms",
+    "process_mask",
+    "masks2segments",
+    "draw",
+    "end_to_end",
+]
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1000 if values else 0.0
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+class StageTimer:
+    """Wraps model methods to time the sub-stages of postprocess."""
+
+    def __init__(self, model: YOLOv8Seg):
+        self.timings = {"process_mask": [], "masks2segments": []}
+        for name in self.timings:
+            setattr(model, name, self._wrap(name, getattr(model, name)))
+
+    def _wrap(self, name, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            self.timings[name].append(time.perf_counter() - start)
+            return result
+
+        return timed
+
+
+def run_scenario(model, timer, width, height, repeat, output_dir):
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])[1]
+    timings = {stage: [] for stage in STAGES}
+    for values in timer.timings.values():
+        values.clear()
+    detections = 0
+
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        im0 = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+        t1 = time.perf_counter()
+        im, ratio, (pad_w, pad_h) = model.preprocess(im0)
+        t2 = time.perf_counter()
+        preds = model.session.run(None, {model.input_name: im})
+        t3 = time.perf_counter()
+        boxes, segments, _ = model.postprocess(
+            preds,
+            im0=im0,
+            ratio=ratio,
+            pad_w=pad_w,
+            pad_h=pad_h,
+            conf_threshold=0.4,
+            iou_threshold=0.45,
+        )
+        t4 = time.perf_counter()
+        if len(boxes):
+            model.draw_and_visualize(
+                im0,
+                boxes,
+                segments,
+                vis=False,
+                save=True,
+                output_folder=output_dir,
+                filename="bench.jpg",
+            )
+        end = time.perf_counter()
+        detections = len(boxes)
+        timings["decode"].append(t1 - begin)
+        timings["preprocess"].append(t2 - t1)
+        timings["session_run"].append(t3 - t2)
+        timings["postprocess"].append(t4 - t3)
+        timings["draw"].append(end - t4)
+        timings["end_to_end"].append(end - begin)
+
+    timings["process_mask"] = list(timer.timings["process_mask"])
+    timings["masks2segments"] = list(timer.timings["masks2segments"])
+    if timings["process_mask"]:
+        timings["nms"] = [
+            post - mask - seg
+            for post, mask, seg in zip(
+                timings["postprocess"],
+                timings["process_mask"],
+                timings["masks2segments"],
+            )
+        ]
+    else:
+        timings["nms"] = list(timings["postprocess"])
+    return timings, detections
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            (r["width"], r["height"], r["detections"], r["stage"]): r
+            for r in json.load(f)["results"]
+        }
+    regressions = []
+    for r in results:
+        old = baseline.get((r["width"], r["height"], r["detections"], r["stage"]))
+        if not old or not old["p50_ms"]:
+            continue
+        change = r["p50_ms"] / old["p50_ms"] - 1
+        if change > tolerance:
+            regressions.append((r, old, change))
+    for r, old, change in regressions:
+        print(
+            f"REGRESSION {r['width']}x{r['height']} det={r['detections']} "
+            f"{r['stage']}: p50 {old['p50_ms']:.2f} -> {r['p50_ms']:.2f} ms "
+            f"({change:+.0%})"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="640x480,1920x1080,4000x3000")
+    parser.add_argument("--detections", default="0,5,50")
+    parser.add_argument("--classes", type=int, default=3)
+    parser.add_argument("--conv-layers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare p50 against a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    sizes = [tuple(map(int, size.split("x"))) for size in args.sizes.split(",")]
+    detection_counts = [int(n) for n in args.detections.split(",")]
+    results = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        names = write_names(os.path.join(workdir, "data.yaml"), args.classes)
+        print(
+            f"{'size':>10} {'det':>4} {'stage':<15} {'p50 ms':>9} {'p95 ms':>9}"
+            f" {'rss MB':>8}"
+        )
+        for count in detection_counts:
+            path = build_model(
+                os.path.join(workdir, f"model_{count}.onnx"),
+                num_classes=args.classes,
+                detections=count,
+                conv_layers=args.conv_layers,
+            )
+            model = YOLOv8Seg(path, names)
+            timer = StageTimer(model)
+            for width, height in sizes:
+                run_scenario(model, timer, width, height, args.warmup, workdir)
+                timings, detected = run_scenario(
+                    model, timer, width, height, args.repeat, workdir
+                )
+                rss = peak_rss_mb()
+                total = sum(timings["end_to_end"])
+                for stage in STAGES:
+                    record = {
+                        "width": width,
+                        "height": height,
+                        "detections": count,
+                        "detected": detected,
+                        "stage": stage,
+                        "p50_ms": percentile(timings[stage], 50),
+                        "p95_ms": percentile(timings[stage], 95),
+                        "samples": len(timings[stage]),
+                        "peak_rss_mb": rss,
+                    }
+                    if stage == "end_to_end":
+                        record["throughput_per_s"] = len(timings[stage]) / total
+                    results.append(record)
+                    print(
+                        f"{width}x{height:<5} {count:>4} {stage:<15}"
+                        f" {record['p50_ms']:>9.2f} {record['p95_ms']:>9.2f}"
+                        f" {rss:>8.0f}"
+                    )
+                print(
+                    f"{'':>16}throughput {len(timings['end_to_end']) / total:.1f}"
+                    " images/s"
+                )
+
+    if args.output:
+        report = {
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "numpy": np.__version__,
+                "opencv": cv2.__version__,
+                "onnxruntime": ort.__version__,
+            },
+            "config": vars(args),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {args.output}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Synthetic YOLOv8 segmentation ONNX models for offline benchmarks.
+
+The graph has the input/output signature of an exported YOLOv8-seg model
+(``images`` -> ``output0`` (1, 4 + nc + 32, 8400), ``output1`` (1, 32, 160,
+160)). A stack of random-weight convolutions gives ``session.run`` real work
+to do; its result is multiplied by zero and added to constant outputs so the
+number of detections that survive NMS is exactly ``detections``.
+
+Requires the ``onnx`` package, which the application itself does not need.
+"""
+
+import math
+
+import numpy as np
+
+NUM_ANCHORS = 8400
+NUM_PROTOS = 32
+PROTO_SIZE = 160
+
+
+def synthetic_outputs(num_classes: int, detections: int, input_size: int, seed=0):
+    rng = np.random.default_rng(seed)
+    channels = 4 + num_classes + NUM_PROTOS
+    output0 = np.zeros((1, channels, NUM_ANCHORS), np.float32)
+    output0[0, 4 : 4 + num_classes, :] = 0.01
+    output0[0, 4 + num_classes :, :] = rng.normal(size=(NUM_PROTOS, NUM_ANCHORS))
+
+    # Spread boxes on a grid so that none of them is suppressed by NMS. The
+    # grid covers the central half of the input, which stays inside the image
+    # after letterboxing for aspect ratios up to 2:1.
+    cols = max(1, math.ceil(math.sqrt(detections)))
+    cell = input_size / 2 / cols
+    offset = input_size / 4
+    anchors = rng.choice(NUM_ANCHORS, size=detections, replace=False)
+    for k, anchor in enumerate(anchors):
+        row, col = divmod(k, cols)
+        output0[0, 0, anchor] = offset + (col + 0.5) * cell
+        output0[0, 1, anchor] = offset + (row + 0.5) * cell
+        output0[0, 2:4, anchor] = cell * 0.6
+        output0[0, 4 + k % num_classes, anchor] = 0.9
+
+    output1 = rng.normal(size=(1, NUM_PROTOS, PROTO_SIZE, PROTO_SIZE))
+    return output0, output1.astype(np.float32)
+
+
+def build_model(
+    path: str,
+    num_classes: int = 3,
+    detections: int = 5,
+    input_size: int = 640,
+    conv_layers: int = 4,
+    dynamic_batch: bool = True,
+    seed: int = 0,
+):
+    """Write a synthetic model to ``path``."""
+    from onnx import TensorProto, helper, numpy_helper, save
+
+    rng = np.random.default_rng(seed)
+    output0, output1 = synthetic_outputs(num_classes, detections, input_size, seed)
+    batch = "batch" if dynamic_batch else 1
+    nodes = []
+    initializers = [
+        numpy_helper.from_array(np.array([1, 2, 3], np.int64), "axes"),
+        numpy_helper.from_array(np.array(0, np.float32), "zero"),
+        numpy_helper.from_array(np.array([-1, 1, 1], np.int64), "shape3"),
+        numpy_helper.from_array(np.array([-1, 1, 1, 1], np.int64), "shape4"),
+        numpy_helper.from_array(output0, "const0"),
+        numpy_helper.from_array(output1, "const1"),
+    ]
+
+    # Stride-2 3x3 convolutions roughly like the first stages of a backbone
+    features, in_channels = "images", 3
+    for i in range(conv_layers):
+        out_channels = min(16 * 2**i, 256)
+        weight = rng.normal(scale=0.1, size=(out_channels, in_channels, 3, 3))
+        weight = weight.astype(np.float32)
+        initializers.append(numpy_helper.from_array(weight, f"w{i}"))
+        nodes.append(
+            helper.make_node(
+                "Conv",
+                [features, f"w{i}"],
+                [f"conv{i}"],
+                kernel_shape=[3, 3],
+                strides=[2, 2],
+                pads=[1, 1, 1, 1],
+            )
+        )
+        nodes.append(helper.make_node("Relu", [f"conv{i}"], [f"relu{i}"]))
+        features, in_channels = f"relu{i}", out_channels
+
+    nodes += [
+        helper.make_node("ReduceMean", [features, "axes"], ["mean"], keepdims=1),
+        helper.make_node("Mul", ["mean", "zero"], ["zeros"]),
+        helper.make_node("Reshape", ["zeros", "shape3"], ["zeros3"]),
+        helper.make_node("Add", ["zeros3", "const0"], ["output0"]),
+        helper.make_node("Reshape", ["zeros", "shape4"], ["zeros4"]),
+        helper.make_node("Add", ["zeros4", "const1"], ["output1"]),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        "synthetic-yolov8-seg",
+        [
+            helper.make_tensor_value_info(
+                "images", TensorProto.FLOAT, [batch, 3, input_size, input_size]
+            )
+        ],
+        [
+            helper.make_tensor_value_info(
+                "output0", TensorProto.FLOAT, [batch, output0.shape[1], NUM_ANCHORS]
+            ),
+            helper.make_tensor_value_info(
+                "output1",
+                TensorProto.FLOAT,
+                [batch, NUM_PROTOS, PROTO_SIZE, PROTO_SIZE],
+            ),
+        ],
+        initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 18)])
+    model.ir_version = 9
+    save(model, path)
+    return path
+
+
+def write_names(path: str, num_classes: int = 3):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("names:\n")
+        for i in range(num_classes):
+            f.write(f"  {i}: class_{i}\n")
+    return path
@@ -9,7 +9,10 @@ class Point(Base):
 
     id = Column(BigInteger, primary_key=True, autoincrement=True, nullable=False)
     userId = Column(
-        BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        BigInteger,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     point = Column(BigInteger, nullable=False)
     createdAt = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, DateTime, Float, Integer, String
+from geoalchemy2.types import Geometry
+from datetime import datetime
+from config.database import Base
+
+
+class SampahCluster(Base):
+    """A group of nearby reports found by ST_ClusterDBSCAN.
+
+    The table is rebuilt by service_cluster whenever the sampahs data version
+    (``dataVersion``) changes.
+    """
+
+    __tablename__ = "sampah_clusters"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True, nullable=False)
+    geom = Column(Geometry(geometry_type="POINT", srid=4326, spatial_index=True))
+    # Distance from the centroid to the farthest report, in metres
+    radiusM = Column(Float, nullable=False)
+    reportCount = Column(Integer, nullable=False)
+    garbagePileCount = Column(Integer, nullable=False)
+    pickedUpCount = Column(Integer, nullable=False)
+    firstReportAt = Column(DateTime)
+    lastReportAt = Column(DateTime)
+    dataVersion = Column(String, nullable=False)
+    createdAt = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updatedAt = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
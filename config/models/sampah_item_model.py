@@ -9,7 +9,10 @@ class SampahItem(Base):
 
     id = Column(BigInteger, primary_key=True, autoincrement=True, nullable=False)
     sampahId = Column(
-        BigInteger, ForeignKey("sampahs.id", ondelete="CASCADE"), nullable=False
+        BigInteger,
+        ForeignKey("sampahs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     jenisSampahId = Column(BigInteger, ForeignKey("jenis_sampahs.id"), nullable=False)
     createdAt = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,4 +1,12 @@
-from sqlalchemy import Column, String, BigInteger, Boolean, DateTime, ForeignKey
+from sqlalchemy import (
+    Column,
+    String,
+    BigInteger,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+)
 from sqlalchemy.orm import validates, relationship
 from geoalchemy2.types import Geometry
 from datetime import datetime
@@ -36,3 +44,28 @@ class Sampah(Base):
         "SampahItem", back_populates="sampah", cascade="all, delete, delete-orphan"
     )
     user = relationship("User", back_populates="sampahs")
+
+    # Kept in sync with migrations/versions/0002_performance_indexes.py
+    __table_args__ = (
+        # Duplicate upload checks filter on both columns
+        Index("ix_sampahs_user_capture_time", userId, captureTime),
+        Index("ix_sampahs_capture_time", captureTime),
+        # Only a small share of reports is still waiting for pickup
+        Index(
+            "ix_sampahs_not_picked_up",
+            isGarbagePile,
+            captureTime,
+            postgresql_where=isPickup == False,
+        ),
+        Index(
+            "ix_sampahs_pickup_at",
+            pickupAt,
+            postgresql_where=pickupAt.is_not(None),
+        ),
+        Index(
+            "ix_sampahs_pickup_by_user",
+            pickupByUser,
+            pickupAt,
+            postgresql_where=pickupByUser.is_not(None),
+        ),
+    )
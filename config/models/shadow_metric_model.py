@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, DateTime, Float, Integer, String
+from datetime import datetime
+from config.database import Base
+
+
+class ShadowMetric(Base):
+    __tablename__ = "shadow_metrics"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True, nullable=False)
+    modelName = Column(String(64), nullable=False, index=True)
+    productionVersion = Column(String(64), nullable=False)
+    candidateVersion = Column(String(64), nullable=False)
+    imagePath = Column(String)
+    productionLatencyMs = Column(Float, nullable=False)
+    candidateLatencyMs = Column(Float, nullable=False)
+    productionCount = Column(Integer, nullable=False)
+    candidateCount = Column(Integer, nullable=False)
+    matchedCount = Column(Integer, nullable=False)
+    # Mean IoU of matched boxes and share of matches with the same class
+    meanIou = Column(Float)
+    classAgreement = Column(Float)
+    createdAt = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updatedAt = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
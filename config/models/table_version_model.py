@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, DateTime, String
+from datetime import datetime
+from config.database import Base
+
+
+class TableVersion(Base):
+    """Change counter per table, bumped by a trigger on every write.
+
+    See migration 0005. service_cache.get_data_version builds ETags from it.
+    """
+
+    __tablename__ = "table_versions"
+
+    tableName = Column(String, primary_key=True, nullable=False)
+    version = Column(BigInteger, nullable=False, default=0)
+    updatedAt = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
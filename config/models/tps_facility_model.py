@@ -0,0 +1,31 @@
+from sqlalchemy import BigInteger, Column, DateTime, String, UniqueConstraint
+from geoalchemy2.types import Geometry
+from datetime import datetime
+from config.database import Base
+
+
+class TpsFacility(Base):
+    """A facility from the SIPSN map, stored per getMarker request it came from.
+
+    ``sourceKey`` identifies the request parameters (see
+    ``service_sipsn.source_key``); the same facility can appear under several
+    sources, e.g. a province and one of its districts.
+    """
+
+    __tablename__ = "tps_facilities"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True, nullable=False)
+    sourceKey = Column(String, nullable=False, index=True)
+    sipsnId = Column(String, nullable=False)
+    name = Column(String)
+    facilityType = Column(String)
+    iconUrl = Column(String)
+    address = Column(String)
+    geom = Column(Geometry(geometry_type="POINT", srid=4326, spatial_index=True))
+    syncedAt = Column(DateTime, nullable=False, default=datetime.utcnow)
+    createdAt = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updatedAt = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    __table_args__ = (UniqueConstraint(sourceKey, sipsnId),)
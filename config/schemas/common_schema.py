@@ -9,3 +9,10 @@ class TokenData(BaseModel):
     userID: str
     name: str
     role: str
+
+
+class AuthenticatedUser(TokenData):
+    # name and role come from the user record rather than the token
+    id: int
+    email: str
+    active: bool
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 import datetime
 
@@ -100,3 +100,59 @@ class StatisticOutput(BaseModel):
     total_waste_collected: int
     not_collected: List[WasteNotCollected]
     collected: List[WasteCollected]
+
+
+class RouteRequest(BaseModel):
+    start_latitude: float = Field(..., ge=-90, le=90)
+    start_longitude: float = Field(..., ge=-180, le=180)
+    # Uncollected reports to visit; all of them (within bbox) when omitted
+    sampah_ids: Optional[List[int]] = None
+    # min_longitude, min_latitude, max_longitude, max_latitude
+    bbox: Optional[List[float]] = Field(None, min_length=4, max_length=4)
+    data_type: str = "all"
+    return_to_start: bool = False
+    time_budget_ms: Optional[int] = Field(None, ge=1)
+
+
+class RouteStop(BaseModel):
+    order: int
+    id: int
+    address: str
+    latitude: float
+    longitude: float
+    distance_from_previous_m: float
+
+
+class RouteResponse(BaseModel):
+    stops: List[RouteStop]
+    total_distance_m: float
+    return_distance_m: Optional[float]
+    stats: dict
+
+
+class SampahClusterOutput(BaseModel):
+    id: int
+    latitude: float
+    longitude: float
+    radius_m: float
+    report_count: int
+    garbage_pile_count: int
+    picked_up_count: int
+    pickup_rate: float
+    first_report_at: Optional[datetime.datetime]
+    last_report_at: Optional[datetime.datetime]
+
+
+class HeatmapCell(BaseModel):
+    latitude: float
+    longitude: float
+    count: int
+    garbage_pile_count: int
+    picked_up_count: int
+
+
+class HeatmapOutput(BaseModel):
+    resolution: int
+    cell_size: float
+    total: int
+    cells: List[HeatmapCell]
@@ -1,4 +1,5 @@
 # Define the request body structure
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -7,3 +8,17 @@ class TPS3RRequest(BaseModel):
     dd_district: str = ""
     dd_fasilitas: str = "tps3r"
     exclude_fasilitas: str = ""
+
+
+class TPSFacility(BaseModel):
+    name: Optional[str] = None
+    latitude: float
+    longitude: float
+    icon_url: Optional[str] = None
+    facility_type: Optional[str] = None
+    id: str
+    address: Optional[str] = None
+
+
+class NearestTPSFacility(TPSFacility):
+    distance_m: float
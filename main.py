@@ -1,3 +1,4 @@
+import asyncio
 from typing import Union
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -11,7 +12,34 @@ from src.routers.route_stackholder_auth import auth_stackholder_router
 from src.routers.route_stackholder_statistic import statistic_stackholder_router
 from src.routers.route_stackholder_sampah import sampah_stackholder_router
 from src.routers.route_sipsn_tps import sipsn_tps_router
-from config.models import (
+from src.routers.router_image import image_router
+from src.routers.router_health import health_router, metrics_router
+from src.routers.route_stackholder_model import model_stackholder_router
+from src.controllers.sampah.service_predict import (
+    MODEL_IDLE_UNLOAD_SECONDS,
+    MODEL_MAINTENANCE_INTERVAL,
+    load_models,
+    model_registry,
+)
+from src.controllers.sampah.service_metadata import get_geocoder
+from src.controllers.sampah.service_cluster import (
+    CLUSTER_REFRESH_SECONDS,
+    refresh_clusters,
+)
+from src.controllers.service_events import start_event_listener, stop_event_listener
+from src.controllers.service_http import close_http_client
+from src.controllers.service_scheduler import schedule_periodic, stop_scheduler
+from src.controllers.service_sipsn import SIPSN_SYNC_CHECK_SECONDS, sync_stale_sources
+from src.controllers.service_metrics import configure_logging, metrics_middleware
+from src.controllers.service_query_profiler import (
+    install_query_profiler,
+    query_profiler_middleware,
+)
+from src.controllers.service_response import FastJSONResponse
+from src.controllers.service_storage import get_storage
+
+# Import every model so relationship() string references resolve
+from config.models import (  # noqa: F401
     badge_model,
     user_model,
     article_model,
@@ -19,39 +47,59 @@ from config.models import (
     point_model,
     sampah_model,
     sampah_item_model,
+    sampah_cluster_model,
+    shadow_metric_model,
+    table_version_model,
+    tps_facility_model,
 )
 
-app = FastAPI(debug=True, swagger_ui_parameters={"deepLinking": False})
+configure_logging()
 
+app = FastAPI(
+    debug=True,
+    swagger_ui_parameters={"deepLinking": False},
+    default_response_class=FastJSONResponse,
+)
 
-user_model.Base.metadata.create_all(bind=engine)
-article_model.Base.metadata.create_all(bind=engine)
-jenis_sampah_model.Base.metadata.create_all(bind=engine)
-badge_model.Base.metadata.create_all(bind=engine)
-point_model.Base.metadata.create_all(bind=engine)
-sampah_model.Base.metadata.create_all(bind=engine)
-sampah_item_model.Base.metadata.create_all(bind=engine)
+install_query_profiler(engine)
+app.middleware("http")(query_profiler_middleware)
+app.middleware("http")(metrics_middleware)
 
-app.mount(
-    "/garbage-image",
-    StaticFiles(directory="assets/garbage_image"),
-    name="garbage_image",
-)
-app.mount(
-    "/article-image",
-    StaticFiles(directory="assets/article"),
-    name="article_image",
-)
+
+@app.on_event("startup")
+async def startup():
+    # Load and warm up models in the background so /health/live answers
+    # immediately; /health/ready turns green once this finishes
+    app.state.model_loading = asyncio.get_running_loop().run_in_executor(
+        None, load_models
+    )
+    # Build the reverse geocoding KD-tree before the first upload needs it
+    asyncio.get_running_loop().run_in_executor(None, get_geocoder)
+    model_registry.run_maintenance(
+        MODEL_MAINTENANCE_INTERVAL, MODEL_IDLE_UNLOAD_SECONDS
+    )
+    schedule_periodic(
+        "sipsn_sync", SIPSN_SYNC_CHECK_SECONDS, sync_stale_sources, initial_delay=30
+    )
+    schedule_periodic(
+        "sampah_clusters", CLUSTER_REFRESH_SECONDS, refresh_clusters, initial_delay=60
+    )
+    start_event_listener()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    stop_event_listener()
+    await stop_scheduler()
+    await close_http_client()
+
+
+get_storage().mount(app)
 app.mount(
     "/data",
     StaticFiles(directory="assets/data"),
     name="data",
 )
-app.mount(
-    "/evidence",
-    StaticFiles(directory="assets/pickup_image"),
-    name="evidence",
-)
 
 app.include_router(auth_router)
 app.include_router(article_router)
@@ -62,3 +110,7 @@ app.include_router(auth_stackholder_router)
 app.include_router(statistic_stackholder_router)
 app.include_router(sampah_stackholder_router)
 app.include_router(sipsn_tps_router)
+app.include_router(image_router)
+app.include_router(health_router)
+app.include_router(metrics_router)
+app.include_router(model_stackholder_router)
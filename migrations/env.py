@@ -0,0 +1,64 @@
+from logging.config import fileConfig
+from alembic import context
+from geoalchemy2 import alembic_helpers
+from sqlalchemy import engine_from_config, pool
+from config.database import SQLALCHEMY_DATABASE_URL, Base
+
+# Import every model so autogenerate sees the full schema
+from config.models import (  # noqa: F401
+    article_model,
+    badge_model,
+    jenis_sampah_model,
+    point_model,
+    sampah_cluster_model,
+    sampah_item_model,
+    sampah_model,
+    shadow_metric_model,
+    table_version_model,
+    tps_facility_model,
+    user_model,
+)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
+
+target_metadata = Base.metadata
+
+# Skip PostGIS' own tables and render Geometry columns correctly
+CONFIGURE_OPTIONS = {
+    "target_metadata": target_metadata,
+    "include_object": alembic_helpers.include_object,
+    "process_revision_directives": alembic_helpers.writer,
+    "render_item": alembic_helpers.render_item,
+}
+
+
+def run_migrations_offline():
+    context.configure(
+        url=SQLALCHEMY_DATABASE_URL,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        **CONFIGURE_OPTIONS,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(connection=connection, **CONFIGURE_OPTIONS)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
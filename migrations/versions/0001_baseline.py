@@ -0,0 +1,130 @@
+"""Baseline schema previously created by create_all at startup
+
+Databases created before migrations existed already have these tables;
+mark them as migrated with ``alembic stamp 0001`` instead of upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def timestamps():
+    return [
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("fullName", sa.String()),
+        sa.Column("jenisKelamin", sa.String()),
+        sa.Column("noTelp", sa.String()),
+        sa.Column("alamat", sa.String()),
+        *timestamps(),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("username"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_table(
+        "articles",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("content", sa.String(), nullable=False),
+        sa.Column("imagePath", sa.String()),
+        *timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("title"),
+    )
+    op.create_table(
+        "jenis_sampahs",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("nama", sa.String(), nullable=False),
+        sa.Column("point", sa.BigInteger(), nullable=False),
+        *timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "badges",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("pointMinimum", sa.Integer()),
+        sa.Column("imageUrl", sa.String(length=255)),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "points",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("userId", sa.BigInteger(), nullable=False),
+        sa.Column("point", sa.BigInteger(), nullable=False),
+        *timestamps(),
+        sa.Column("badgeId", sa.Integer()),
+        sa.ForeignKeyConstraint(["userId"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["badgeId"], ["badges.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "sampahs",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("userId", sa.BigInteger(), nullable=False),
+        sa.Column("address", sa.String(), nullable=False),
+        sa.Column(
+            "geom",
+            geoalchemy2.types.Geometry(
+                geometry_type="POINT", srid=4326, spatial_index=False
+            ),
+        ),
+        sa.Column("imagePath", sa.String()),
+        sa.Column("captureTime", sa.DateTime()),
+        sa.Column("point", sa.BigInteger(), nullable=False),
+        *timestamps(),
+        sa.Column("isGarbagePile", sa.Boolean()),
+        sa.Column("isPickup", sa.Boolean()),
+        sa.Column("pickupAt", sa.DateTime(timezone=True)),
+        sa.Column("pickupByUser", sa.String()),
+        sa.Column("evidencePath", sa.String()),
+        sa.ForeignKeyConstraint(["userId"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Same name as the index GeoAlchemy2 created alongside create_all
+    op.create_index("idx_sampahs_geom", "sampahs", ["geom"], postgresql_using="gist")
+    op.create_table(
+        "sampah_items",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("sampahId", sa.BigInteger(), nullable=False),
+        sa.Column("jenisSampahId", sa.BigInteger(), nullable=False),
+        *timestamps(),
+        sa.ForeignKeyConstraint(["sampahId"], ["sampahs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["jenisSampahId"], ["jenis_sampahs.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("sampah_items")
+    op.drop_table("sampahs")
+    op.drop_table("points")
+    op.drop_table("badges")
+    op.drop_table("jenis_sampahs")
+    op.drop_table("articles")
+    op.drop_table("users")
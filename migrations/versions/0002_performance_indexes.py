@@ -0,0 +1,63 @@
+"""Indexes for the hot sampah, sampah item and point queries
+
+Indexes are built CONCURRENTLY so the upgrade does not block uploads on a
+live database.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# name, table, columns, partial index predicate
+INDEXES = [
+    ("ix_sampahs_user_capture_time", "sampahs", ["userId", "captureTime"], None),
+    ("ix_sampahs_capture_time", "sampahs", ["captureTime"], None),
+    (
+        "ix_sampahs_not_picked_up",
+        "sampahs",
+        ["isGarbagePile", "captureTime"],
+        '"isPickup" = false',
+    ),
+    ("ix_sampahs_pickup_at", "sampahs", ["pickupAt"], '"pickupAt" IS NOT NULL'),
+    (
+        "ix_sampahs_pickup_by_user",
+        "sampahs",
+        ["pickupByUser", "pickupAt"],
+        '"pickupByUser" IS NOT NULL',
+    ),
+    ("ix_sampah_items_sampahId", "sampah_items", ["sampahId"], None),
+    ("ix_points_userId", "points", ["userId"], None),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,47 @@
+"""Local store of SIPSN TPS facilities
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "tps_facilities",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("sourceKey", sa.String(), nullable=False),
+        sa.Column("sipsnId", sa.String(), nullable=False),
+        sa.Column("name", sa.String()),
+        sa.Column("facilityType", sa.String()),
+        sa.Column("iconUrl", sa.String()),
+        sa.Column("address", sa.String()),
+        sa.Column(
+            "geom",
+            geoalchemy2.types.Geometry(
+                geometry_type="POINT", srid=4326, spatial_index=False
+            ),
+        ),
+        sa.Column("syncedAt", sa.DateTime(), nullable=False),
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("sourceKey", "sipsnId"),
+    )
+    op.create_index("ix_tps_facilities_sourceKey", "tps_facilities", ["sourceKey"])
+    op.create_index(
+        "idx_tps_facilities_geom", "tps_facilities", ["geom"], postgresql_using="gist"
+    )
+
+
+def downgrade():
+    op.drop_table("tps_facilities")
@@ -0,0 +1,45 @@
+"""Precomputed clusters of nearby sampah reports
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "sampah_clusters",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column(
+            "geom",
+            geoalchemy2.types.Geometry(
+                geometry_type="POINT", srid=4326, spatial_index=False
+            ),
+        ),
+        sa.Column("radiusM", sa.Float(), nullable=False),
+        sa.Column("reportCount", sa.Integer(), nullable=False),
+        sa.Column("garbagePileCount", sa.Integer(), nullable=False),
+        sa.Column("pickedUpCount", sa.Integer(), nullable=False),
+        sa.Column("firstReportAt", sa.DateTime()),
+        sa.Column("lastReportAt", sa.DateTime()),
+        sa.Column("dataVersion", sa.String(), nullable=False),
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "idx_sampah_clusters_geom", "sampah_clusters", ["geom"], postgresql_using="gist"
+    )
+
+
+def downgrade():
+    op.drop_table("sampah_clusters")
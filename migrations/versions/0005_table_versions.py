@@ -0,0 +1,67 @@
+"""Change counters for the tables behind cached responses
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+VERSIONED_TABLES = (
+    "articles",
+    "jenis_sampahs",
+    "points",
+    "sampah_clusters",
+    "sampah_items",
+    "sampahs",
+    "users",
+)
+
+
+def upgrade():
+    op.create_table(
+        "table_versions",
+        sa.Column("tableName", sa.String(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("tableName"),
+    )
+    # Statement level, so a bulk update bumps the counter once. The updated
+    # row stays locked until the writing transaction commits.
+    op.execute(
+        """
+        CREATE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions ("tableName", version, "updatedAt")
+            VALUES (TG_TABLE_NAME, 1, timezone('utc', now()))
+            ON CONFLICT ("tableName") DO UPDATE
+            SET version = table_versions.version + 1,
+                "updatedAt" = EXCLUDED."updatedAt";
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in VERSIONED_TABLES:
+        op.execute(
+            f"INSERT INTO table_versions (\"tableName\", version, \"updatedAt\") "
+            f"VALUES ('{table}', 0, timezone('utc', now()))"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
+
+
+def downgrade():
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    op.drop_table("table_versions")
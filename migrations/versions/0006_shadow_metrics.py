@@ -0,0 +1,46 @@
+"""Shadow comparisons between the production and a candidate model
+
+Added by the shadow evaluation, after the create_all baseline.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Servers that ran create_all after the shadow evaluation shipped already
+    # have the table
+    if sa.inspect(op.get_bind()).has_table("shadow_metrics"):
+        return
+    op.create_table(
+        "shadow_metrics",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("modelName", sa.String(length=64), nullable=False),
+        sa.Column("productionVersion", sa.String(length=64), nullable=False),
+        sa.Column("candidateVersion", sa.String(length=64), nullable=False),
+        sa.Column("imagePath", sa.String()),
+        sa.Column("productionLatencyMs", sa.Float(), nullable=False),
+        sa.Column("candidateLatencyMs", sa.Float(), nullable=False),
+        sa.Column("productionCount", sa.Integer(), nullable=False),
+        sa.Column("candidateCount", sa.Integer(), nullable=False),
+        sa.Column("matchedCount", sa.Integer(), nullable=False),
+        sa.Column("meanIou", sa.Float()),
+        sa.Column("classAgreement", sa.Float()),
+        sa.Column("createdAt", sa.DateTime(), nullable=False),
+        sa.Column("updatedAt", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_shadow_metrics_modelName", "shadow_metrics", ["modelName"])
+
+
+def downgrade():
+    op.drop_table("shadow_metrics")
@@ -0,0 +1,70 @@
+"""Generate missing thumbnail/medium/full derivatives for stored images.
+
+Run from the repository root:
+
+    python -m scripts.backfill_derivatives [--force]
+"""
+
+import argparse
+from concurrent.futures import as_completed
+
+from config.database import SessionLocal
+from config.models.article_model import Article
+from config.models.sampah_model import Sampah
+from src.controllers.service_common import image_executor
+from src.controllers.service_derivative import (
+    DERIVATIVE_FORMATS,
+    DERIVATIVE_SIZES,
+    derivative_key,
+    generate_derivatives,
+)
+from src.controllers.service_storage import get_storage, storage_key
+
+
+def stored_image_keys():
+    db = SessionLocal()
+    try:
+        paths = [row[0] for row in db.query(Sampah.imagePath).all()]
+        paths += [row[0] for row in db.query(Sampah.evidencePath).all()]
+        paths += [row[0] for row in db.query(Article.imagePath).all()]
+    finally:
+        db.close()
+    return sorted({storage_key(path) for path in paths if path})
+
+
+def is_complete(storage, key: str) -> bool:
+    return all(
+        storage.exists(derivative_key(key, size, fmt))
+        for size in DERIVATIVE_SIZES
+        for fmt in DERIVATIVE_FORMATS
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--force", action="store_true", help="Regenerate all")
+    args = parser.parse_args()
+
+    storage = get_storage()
+    keys = [
+        key
+        for key in stored_image_keys()
+        if storage.exists(key) and (args.force or not is_complete(storage, key))
+    ]
+    print(f"Generating derivatives for {len(keys)} images")
+
+    futures = {image_executor.submit(generate_derivatives, key): key for key in keys}
+    failed = 0
+    for done, future in enumerate(as_completed(futures), start=1):
+        try:
+            future.result()
+        except Exception as e:
+            failed += 1
+            print(f"Failed {futures[future]}: {e}")
+        if done % 100 == 0:
+            print(f"{done}/{len(keys)}")
+    print(f"Done, {len(keys) - failed} generated, {failed} failed")
+
+
+if __name__ == "__main__":
+    main()
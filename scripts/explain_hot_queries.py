@@ -0,0 +1,137 @@
+"""Check that the hot repository queries are served by their indexes.
+
+Calls the repository methods, captures the SQL they send and runs
+EXPLAIN (FORMAT JSON) on each statement against the database in
+DATABASE_URL (run ``alembic upgrade head`` first) and exits with status 1
+when a plan does not use the expected index. Sequential scans are disabled
+for the session so the check also works on a small development database,
+where the planner would otherwise prefer scanning the whole table.
+
+Run from the repository root:
+
+    python -m scripts.explain_hot_queries
+"""
+
+import asyncio
+import json
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import event, text
+
+from config.database import SessionLocal
+from config.models import badge_model, jenis_sampah_model, user_model  # noqa: F401
+from config.schemas.common_schema import TokenData
+from src.repositories.repository_point import PointRepository
+from src.repositories.repository_sampah import SampahRepository
+from src.repositories.repository_statistic import StatisticRepository
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def hot_calls(db):
+    """Repository calls and the indexes their statements must use."""
+    points = PointRepository(db)
+    sampahs = SampahRepository(db, points)
+    statistics = StatisticRepository(db)
+    token = TokenData(userID="1", name="admin", role="admin")
+    now = datetime(2026, 1, 1)
+    yield "find_same_capture_time", "ix_sampahs_user_capture_time", (
+        sampahs.find_same_capture_time(1, now)
+    )
+    yield "find_uploads_within_timeframe", "ix_sampahs_user_capture_time", (
+        sampahs.find_uploads_within_timeframe(1, now - timedelta(minutes=5))
+    )
+    yield "get_sampah_timeseries", "ix_sampahs_capture_time", (
+        sampahs.get_sampah_timeseries("all", "all", now - timedelta(days=30), now)
+    )
+    yield "get_unpicked_locations", "ix_sampahs_not_picked_up", (
+        sampahs.get_unpicked_locations("garbage_pile")
+    )
+    # The overall and the per-user transport history
+    yield "get_total_statistic", (
+        "ix_sampahs_pickup_at",
+        "ix_sampahs_pickup_by_user",
+    ), statistics.get_total_statistic(token)
+    yield "get_sampah_detail", "ix_sampah_items_sampahId", (
+        sampahs.get_sampah_detail(1)
+    )
+    yield "get_current_user_point", "ix_points_userId", (
+        points.get_current_user_point(1)
+    )
+
+
+@contextmanager
+def captured_statements(db):
+    """Collect the SQL and parameters the block sends to the database.
+
+    Uses the same ``before_cursor_execute`` hook as the query profiler, so the
+    statements are exactly what the repositories run.
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def used_indexes(plan):
+    if plan.get("Node Type") in INDEX_SCANS:
+        yield plan.get("Index Name")
+    for child in plan.get("Plans", []):
+        yield from used_indexes(child)
+
+
+def explain(db, statement, parameters):
+    plan = (
+        db.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        .scalar()
+    )
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return set(used_indexes(plan[0]["Plan"]))
+
+
+async def main():
+    db = SessionLocal()
+    failed = 0
+    try:
+        # SET LOCAL only lasts for the transaction the session is in
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        for name, expected, call in hot_calls(db):
+            if isinstance(expected, str):
+                expected = (expected,)
+            with captured_statements(db) as statements:
+                try:
+                    await call
+                except HTTPException:
+                    # e.g. 404 on an empty database, the statements still ran
+                    pass
+            indexes = set()
+            for statement, parameters in statements:
+                indexes |= explain(db, statement, parameters)
+            ok = indexes.issuperset(expected)
+            failed += not ok
+            print(f"{'ok' if ok else 'MISSING':<8} {name:<32} {', '.join(expected)}")
+            if not ok:
+                print(f"{'':<8} used: {sorted(indexes) or 'no index'}")
+    finally:
+        db.rollback()
+        db.close()
+
+    if failed:
+        print(f"{failed} queries do not use their index")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""Sync SIPSN TPS facilities into the local store.
+
+Without arguments, refreshes every stale or configured source like the
+background job does. With a province, syncs that single request; a response
+saved with --record can be replayed with --fixture to sync without reaching
+sipsn.menlhk.go.id.
+
+Run from the repository root:
+
+    python -m scripts.sync_tps
+    python -m scripts.sync_tps --propinsi 31 --record tps_31.json
+    python -m scripts.sync_tps --propinsi 31 --fixture tps_31.json
+"""
+
+import argparse
+import asyncio
+import json
+
+from config.database import SessionLocal
+from config.schemas.sipsn_schema import TPS3RRequest
+from src.controllers.service_http import close_http_client
+from src.controllers.service_sipsn import (
+    fetch_markers,
+    sync_source,
+    sync_stale_sources,
+)
+from src.repositories.repository_tps_facility import TpsFacilityRepository
+
+
+async def sync_one(args):
+    request_data = TPS3RRequest(
+        dd_propinsi=args.propinsi,
+        dd_district=args.district,
+        dd_fasilitas=args.fasilitas,
+        exclude_fasilitas=args.exclude,
+    )
+    if args.fixture:
+        with open(args.fixture, encoding="utf-8") as f:
+            response_data = json.load(f)
+    else:
+        response_data = await fetch_markers(request_data)
+        if args.record:
+            with open(args.record, "w", encoding="utf-8") as f:
+                json.dump(response_data, f)
+
+    db = SessionLocal()
+    try:
+        facilities, stored = await sync_source(
+            TpsFacilityRepository(db), request_data, response_data
+        )
+    finally:
+        db.close()
+    if stored:
+        print(f"Stored {len(facilities)} facilities")
+    else:
+        print("Skipped, another worker is syncing this source")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--propinsi", help="sync only this dd_propinsi")
+    parser.add_argument("--district", default="")
+    parser.add_argument("--fasilitas", default="tps3r")
+    parser.add_argument("--exclude", default="")
+    parser.add_argument("--fixture", help="replay a recorded getMarker response")
+    parser.add_argument("--record", help="save the getMarker response to a file")
+    args = parser.parse_args()
+
+    try:
+        if args.propinsi:
+            await sync_one(args)
+        else:
+            await sync_stale_sources()
+    finally:
+        await close_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
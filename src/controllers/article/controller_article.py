@@ -6,6 +6,7 @@ from src.controllers.service_common import (
     insert_image_to_local,
 )
 from src.controllers.auth.service_jwt import JWTService
+from src.controllers.service_storage import get_storage, image_url, storage_key
 from src.repositories.repository_article import ArticleRepository
 
 
@@ -21,7 +22,7 @@ class ArticleController:
     def get_articles(self, page: int, page_size: int):
         data, total_count = self.article_repository.get_all_articles(page, page_size)
         for article in data:
-            article.image = f"https://jjmbm5rz-8000.asse.devtunnels.ms/article-image/{article.image.split('/')[-1]}"
+            article.image = image_url(article.image)
         return {
             "data": data,
             "total_count": total_count,
@@ -40,6 +41,7 @@ class ArticleController:
     def insert_new_article(self, input_article: InputArticle, file):
         filename = insert_image_to_local(file, folder="article")
         filename = f"assets/article/{filename}"
+        get_storage().put_file(filename, storage_key(filename))
         found_duplicate_title = self.article_repository.find_article_by_title(
             input_article.title
         )
@@ -5,7 +5,7 @@ from src.repositories.repository_user import UserRepository
 from src.controllers.auth.service_jwt import JWTService
 from src.controllers.auth import service_security
 from config.schemas.auth_schema import InputUser, InputLogin, OutputLogin, OutputProfile
-from config.schemas.common_schema import TokenData
+from config.schemas.common_schema import AuthenticatedUser, TokenData
 
 
 class AuthController:
@@ -30,7 +30,7 @@ class AuthController:
             raise HTTPException(status_code=404, detail="Username already exists")
         if found_duplicate_email:
             raise HTTPException(status_code=404, detail="Invalid Email or Password")
-        input_user.password = self.security_service.get_password_hash(
+        input_user.password = await self.security_service.get_password_hash(
             input_user.password
         )
         return await self.user_repository.insert_new_user(input_user)
@@ -42,11 +42,16 @@ class AuthController:
             raise HTTPException(status_code=404, detail="Invalid Email or Password")
         if found_user.active is False:
             raise HTTPException(status_code=404, detail="User is not active")
-        if not self.security_service.verify_password(
+        valid, new_hash = await self.security_service.verify_and_update(
             input_login.password,
             found_user.password,
-        ):
+        )
+        if not valid:
             raise HTTPException(status_code=404, detail="Invalid Email or Password")
+        if new_hash:
+            # Stored with a different BCRYPT_ROUNDS, rehash while we have it
+            found_user.password = new_hash
+            await self.user_repository.update_user(found_user)
         jwt_token = self.jwt_service.create_access_token(
             TokenData(
                 userID=found_user.id.__str__(),
@@ -61,21 +66,17 @@ class AuthController:
             role=found_user.role,
         )
 
-    async def get_current_user(self, tokenData: TokenData):
-        try:
-            found_user = await self.user_repository.find_user_by_username(
-                tokenData.name
-            )
-            return OutputProfile(username=found_user.username, email=found_user.email)
-        except Exception as e:
-            raise HTTPException(status_code=404, detail="Invalid Token")
+    async def get_current_user(self, user: AuthenticatedUser):
+        return OutputProfile(username=user.name, email=user.email)
 
     async def forgot_password(self, username: str, email: str, password: str):
         # search username and email, if match then update password
         found_user = await self.user_repository.match_username_email(username, email)
         if found_user is None:
             raise HTTPException(status_code=404, detail="Invalid Username or Email")
-        found_user.password = self.security_service.get_password_hash(password)
+        found_user.password = await self.security_service.get_password_hash(
+            password
+        )
         await self.user_repository.update_user(found_user)
         return {"message": "Password Updated"}
 
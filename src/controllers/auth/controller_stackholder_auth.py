@@ -11,7 +11,7 @@ from config.schemas.auth_schema import (
     OutputLogin,
     OutputProfile,
 )
-from config.schemas.common_schema import TokenData
+from config.schemas.common_schema import AuthenticatedUser, TokenData
 
 
 class AuthStackholderController:
@@ -36,7 +36,7 @@ class AuthStackholderController:
             raise HTTPException(status_code=404, detail="Username already exists")
         if found_duplicate_email:
             raise HTTPException(status_code=404, detail="Invalid Email or Password")
-        input_user.password = self.security_service.get_password_hash(
+        input_user.password = await self.security_service.get_password_hash(
             input_user.password
         )
         return await self.user_repository.insert_new_user(input_user)
@@ -49,11 +49,16 @@ class AuthStackholderController:
             raise HTTPException(status_code=404, detail="User is not active")
         if found_user.role == "user":
             raise HTTPException(status_code=404, detail="User is not a stackholder")
-        if not self.security_service.verify_password(
+        valid, new_hash = await self.security_service.verify_and_update(
             input_login.password,
             found_user.password,
-        ):
+        )
+        if not valid:
             raise HTTPException(status_code=404, detail="Invalid Email or Password")
+        if new_hash:
+            # Stored with a different BCRYPT_ROUNDS, rehash while we have it
+            found_user.password = new_hash
+            await self.user_repository.update_user(found_user)
         jwt_token = self.jwt_service.create_access_token(
             TokenData(
                 userID=found_user.id.__str__(),
@@ -68,19 +73,12 @@ class AuthStackholderController:
             role=found_user.role,
         )
 
-    async def get_current_user(self, tokenData: TokenData):
-        try:
-            found_user = await self.user_repository.find_user_by_username(
-                tokenData.name
-            )
-            return OutputProfile(username=found_user.username, email=found_user.email)
-        except Exception as e:
-            raise HTTPException(status_code=404, detail="Invalid Token")
+    async def get_current_user(self, user: AuthenticatedUser):
+        return OutputProfile(username=user.name, email=user.email)
 
-    async def deactivate_user(self, tokenData: TokenData, id: int):
+    async def deactivate_user(self, user: AuthenticatedUser, id: int):
         # First check user permissions
-        found_user = await self.user_repository.find_user_by_username(tokenData.name)
-        if found_user.role != "admin":
+        if user.role != "admin":
             raise HTTPException(status_code=403, detail="User is not a Admin")
 
         # Attempt to deactivate user
@@ -95,14 +93,13 @@ class AuthStackholderController:
             "detail": f"User with username: {deactivate_user.username} has been deactivated"
         }
 
-    async def reset_password(self, tokenData: TokenData, id: int, password: str):
+    async def reset_password(self, user: AuthenticatedUser, id: int, password: str):
         # First check user permissions
-        found_user = await self.user_repository.find_user_by_username(tokenData.name)
-        if found_user.role != "admin":
+        if user.role != "admin":
             raise HTTPException(status_code=403, detail="User is not a Admin")
 
         # Attempt to reset password
-        password = self.security_service.get_password_hash(password)
+        password = await self.security_service.get_password_hash(password)
         reset_password = await self.user_repository.reset_password(id, password)
 
         # Return success response
@@ -112,7 +109,7 @@ class AuthStackholderController:
 
     async def get_all_user(
         self,
-        token: TokenData,
+        user: AuthenticatedUser,
         page: int,
         page_size: int,
         sort_by: str,
@@ -120,8 +117,7 @@ class AuthStackholderController:
         search: str,
     ):
         # First check user permissions
-        found_user = await self.user_repository.find_user_by_username(token.name)
-        if found_user.role != "admin":
+        if user.role != "admin":
             raise HTTPException(status_code=403, detail="User is not an Admin")
 
         # Fetch paginated users with sorting and search
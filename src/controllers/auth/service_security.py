@@ -1,11 +1,46 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
+from src.controllers.service_metrics import track_executor_queue
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
 
+# Hashes made with any other cost are upgraded (or downgraded) at next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# bcrypt releases the GIL, so a small pool hashes in parallel without stalling
+# the event loop or the image and inference pools during login storms
+password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password"
+)
+track_executor_queue("password", password_executor)
 
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def run_in_password_executor(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, func, *args)
+
+
+async def verify_password(plain_password, hashed_password):
+    return await run_in_password_executor(
+        pwd_context.verify, plain_password, hashed_password
+    )
+
+
+async def verify_and_update(plain_password, hashed_password):
+    """Return ``(valid, new_hash)``; ``new_hash`` is set when the cost changed."""
+    return await run_in_password_executor(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+async def get_password_hash(password):
+    return await run_in_password_executor(pwd_context.hash, password)
@@ -1,35 +1,50 @@
 import asyncio
 import base64
+import uuid
 from datetime import datetime, timedelta
+from typing import Optional
 from fastapi import Depends, HTTPException, UploadFile
 from geopy.distance import geodesic
 from geoalchemy2.shape import to_shape
-from config.schemas.common_schema import TokenData
-from config.schemas.sampah_schema import InputSampah
+from config.schemas.common_schema import AuthenticatedUser, TokenData
+from config.schemas.sampah_schema import (
+    InputSampah,
+    RouteRequest,
+    RouteResponse,
+    RouteStop,
+)
+from src.controllers.sampah.service_metadata import resolve_upload_metadata
 from src.controllers.sampah.service_predict import process_image
+from src.controllers.sampah.service_route import (
+    ROUTE_MAX_STOPS,
+    ROUTE_TIME_BUDGET_MS,
+    plan_route,
+)
 from src.controllers.service_common import (
-    insert_image_to_local,
+    download_image_to_local,
     insert_image_to_local_base64,
+    reencode_image_to_local,
+    run_in_image_executor,
+    save_upload_to_local,
 )
-from src.repositories.repository_user import UserRepository
+from src.controllers.service_metrics import stage_timer
+from src.controllers.service_response import FastJSONResponse
+from src.controllers.service_derivative import schedule_derivatives
+from src.controllers.service_events import publish_event, sampah_event
+from src.controllers.service_storage import image_url, publish_file
 from src.repositories.repository_sampah import SampahRepository
-import os
-import requests
 
 
 class SampahController:
     def __init__(
         self,
         sampah_repository: SampahRepository = Depends(),
-        user_repository: UserRepository = Depends(),
     ):
         self.sampah_repository = sampah_repository
-        self.user_repository = user_repository
 
-    async def get_all_user_sampah(self, token: TokenData, page: int, page_size: int):
-        user = await self.user_repository.find_user_by_username(token.name)
-        if user is None:
-            raise HTTPException(status_code=404, detail="User not found")
+    async def get_all_user_sampah(
+        self, user: AuthenticatedUser, page: int, page_size: int
+    ):
         all_data, total_count = await self.sampah_repository.get_all_user_sampah(
             user.id, page, page_size
         )
@@ -45,36 +60,29 @@ class SampahController:
         data = await self.sampah_repository.get_sampah_detail(sampah_id)
         if data is None:
             raise HTTPException(status_code=404, detail="Sampah not found")
-        if "detected_image" in data.image:
-            data.image = f"https://jjmbm5rz-8000.asse.devtunnels.ms/detected-image/{data.image.split('/')[-1]}"
-        else:
-            data.image = f"https://jjmbm5rz-8000.asse.devtunnels.ms/garbage-image/{data.image.split('/')[-1]}"
+        data.image = image_url(data.image)
         if data.evidence:
-            data.evidence = f"https://jjmbm5rz-8000.asse.devtunnels.ms/evidence-image/{data.evidence.split('/')[-1]}"
+            data.evidence = image_url(data.evidence)
         return data
 
-    async def get_all_sampah(self, token: TokenData, data_type: str, status: str):
+    async def get_all_sampah(
+        self, token: TokenData, data_type: str, status: str, image_size: str = None
+    ):
         data = await self.sampah_repository.get_all_sampah(data_type, status)
         for item in data:
             if item.evidence:
-                item.evidence = f"https://jjmbm5rz-8000.asse.devtunnels.ms/pickup-image/{item.evidence.split('/')[-1]}"
-
-            if "detected_image" in item.image:
-                item.image = f"https://jjmbm5rz-8000.asse.devtunnels.ms/detected-image/{item.image.split('/')[-1]}"
-            else:
-                item.image = f"https://jjmbm5rz-8000.asse.devtunnels.ms/garbage-image/{item.image.split('/')[-1]}"
-        return data
+                item.evidence = image_url(item.evidence, image_size)
+            item.image = image_url(item.image, image_size)
+        return FastJSONResponse(data)
 
     async def store_image(self, file):
-        filename = insert_image_to_local(file, folder="garbage_image")
+        filename = await save_upload_to_local(file, folder="garbage_image")
         filename = f"assets/garbage_image/{filename}"
+        await publish_file(filename)
+        schedule_derivatives(filename)
         return {"image_path": filename}
 
-    async def post_sampah(self, input_sampah: InputSampah, token: TokenData):
-        user = await self.user_repository.find_user_by_username(token.name)
-        if user is None:
-            raise HTTPException(status_code=404, detail="User not found")
-
+    async def post_sampah(self, input_sampah: InputSampah, user: AuthenticatedUser):
         current_time = input_sampah.capture_date
         time_threshold = current_time - timedelta(minutes=15)
 
@@ -97,20 +105,40 @@ class SampahController:
                     detail="Upload within 15 meters and 15 minutes detected",
                 )
         input_sampah.image_url = await self.download_image(input_sampah.image_url)
-        return await self.sampah_repository.insert_new_sampah(input_sampah, user.id)
+        result = await self.sampah_repository.insert_new_sampah(input_sampah, user.id)
+        self._publish_created(result["id"], input_sampah)
+        return result
 
-    async def download_image(self, image_url: str):
-        response = requests.get(image_url)
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code, detail="Failed to download image"
+    def _publish_created(self, sampah_id: int, input_sampah: InputSampah):
+        publish_event(
+            sampah_event(
+                "created",
+                sampah_id,
+                input_sampah.latitude,
+                input_sampah.longitude,
+                input_sampah.is_waste_pile,
+                False,
             )
-        image_data = response.content
-        filename = os.path.basename(image_url)
-        file_path = os.path.join("assets", "garbage_image", filename)
-        with open(file_path, "wb") as f:
-            f.write(image_data)
-        file_path = f"assets/garbage_image/{filename}"
+        )
+
+    async def _publish_changed(self, event_type: str, sampah_id: int):
+        location = await self.sampah_repository.get_sampah_location(sampah_id)
+        if location is not None:
+            publish_event(
+                sampah_event(
+                    event_type,
+                    sampah_id,
+                    location.latitude,
+                    location.longitude,
+                    location.isGarbagePile,
+                    location.isPickup,
+                )
+            )
+
+    async def download_image(self, image_url: str):
+        file_path = await download_image_to_local(image_url, folder="garbage_image")
+        await publish_file(file_path)
+        schedule_derivatives(file_path)
         return file_path
 
     async def get_sampah_timeseries(
@@ -120,85 +148,177 @@ class SampahController:
         status: str,
         start_date: datetime,
         end_date: datetime,
+        image_size: str = None,
     ):
         data = await self.sampah_repository.get_sampah_timeseries(
             data_type, status, start_date, end_date
         )
         for item in data:
             if item.evidence:
-                item.evidence = f"https://jjmbm5rz-8000.asse.devtunnels.ms/evidence-image/{item.evidence.split('/')[-1]}"
-            if "detected_image" in item.image:
-                item.image = f"https://jjmbm5rz-8000.asse.devtunnels.ms/detected-image/{item.image.split('/')[-1]}"
-            else:
-                item.image = f"https://jjmbm5rz-8000.asse.devtunnels.ms/garbage-image/{item.image.split('/')[-1]}"
-        return data
+                item.evidence = image_url(item.evidence, image_size)
+            item.image = image_url(item.image, image_size)
+        return FastJSONResponse(data)
 
     async def pickup_garbage(self, token: TokenData, sampah_id: int, image_base64: str):
-        # save image to local and get the path
-        image_path = insert_image_to_local_base64(
-            image_base64, f"{sampah_id}_pickup_evidence", folder="pickup_image"
+        # Decoding and re-encoding phone photos is CPU heavy, keep it off the loop
+        image_path = await run_in_image_executor(
+            insert_image_to_local_base64,
+            image_base64,
+            f"{sampah_id}_pickup_evidence",
+            "pickup_image",
+        )
+        return await self._store_pickup_evidence(token, sampah_id, image_path)
+
+    async def pickup_garbage_upload(
+        self, token: TokenData, sampah_id: int, file: UploadFile
+    ):
+        # A unique name keeps the raw upload from colliding with the evidence
+        # written next to it, which the re-encode would then delete
+        file.filename = f"{uuid.uuid4().hex}.upload"
+        filename = await save_upload_to_local(file, folder="pickup_image")
+        image_path = await run_in_image_executor(
+            reencode_image_to_local,
+            f"assets/pickup_image/{filename}",
+            f"{sampah_id}_pickup_evidence",
+            "pickup_image",
         )
-        return await self.sampah_repository.pickup_garbage(token, sampah_id, image_path)
+        return await self._store_pickup_evidence(token, sampah_id, image_path)
+
+    async def _store_pickup_evidence(
+        self, token: TokenData, sampah_id: int, image_path: str
+    ):
+        await publish_file(image_path)
+        schedule_derivatives(image_path)
+        result = await self.sampah_repository.pickup_garbage(
+            token, sampah_id, image_path
+        )
+        await self._publish_changed("picked_up", sampah_id)
+        return result
 
     async def unpickup_garbage(self, token: TokenData, sampah_id: int):
-        return await self.sampah_repository.unpickup_garbage(token, sampah_id)
+        result = await self.sampah_repository.unpickup_garbage(token, sampah_id)
+        await self._publish_changed("unpicked", sampah_id)
+        return result
+
+    async def plan_pickup_route(self, route_request: RouteRequest):
+        time_budget_ms = min(
+            route_request.time_budget_ms or ROUTE_TIME_BUDGET_MS, ROUTE_TIME_BUDGET_MS
+        )
+        # One more than allowed to tell a full area apart from a too large one
+        stops = await self.sampah_repository.get_unpicked_locations(
+            route_request.data_type,
+            route_request.sampah_ids,
+            route_request.bbox,
+            limit=ROUTE_MAX_STOPS + 1,
+        )
+        if not stops:
+            raise HTTPException(status_code=404, detail="Sampah not found")
+        if len(stops) > ROUTE_MAX_STOPS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many stops, select at most {ROUTE_MAX_STOPS}",
+            )
+
+        route = await asyncio.to_thread(
+            plan_route,
+            [route_request.start_latitude] + [stop.latitude for stop in stops],
+            [route_request.start_longitude] + [stop.longitude for stop in stops],
+            route_request.return_to_start,
+            time_budget_ms,
+        )
+        legs = route["legs"]
+        return RouteResponse(
+            stops=[
+                RouteStop(
+                    order=k + 1,
+                    id=stops[index - 1].id,
+                    address=stops[index - 1].address,
+                    latitude=stops[index - 1].latitude,
+                    longitude=stops[index - 1].longitude,
+                    distance_from_previous_m=legs[k],
+                )
+                for k, index in enumerate(route["order"])
+            ],
+            total_distance_m=route["total_distance_m"],
+            return_distance_m=legs[-1] if route_request.return_to_start else None,
+            stats=route["stats"],
+        )
 
     async def post_sampah_v2(
         self,
-        token: TokenData,
+        user: AuthenticatedUser,
         lang: str,
-        longitude: float,
-        latitude: float,
-        address: str,
-        use_garbage_pile_model: bool,
-        capture_date: datetime,
+        longitude: Optional[float],
+        latitude: Optional[float],
+        address: Optional[str],
+        use_garbage_pile_model: Optional[bool],
+        capture_date: Optional[datetime],
         file: UploadFile,
     ):
-        # Validate user
-        user = await self.user_repository.find_user_by_username(token.name)
-        if user is None:
-            raise HTTPException(status_code=404, detail="User not found")
+        if None in (longitude, latitude, capture_date) or not address:
+            with stage_timer("metadata"):
+                (
+                    longitude,
+                    latitude,
+                    address,
+                    capture_date,
+                ) = await resolve_upload_metadata(
+                    file, longitude, latitude, address, capture_date
+                )
 
         # Define time thresholds
         time_threshold = capture_date - timedelta(minutes=15)
 
-        # Run the two independent database queries concurrently:
-        same_capture, previous_uploads = await asyncio.gather(
-            self.sampah_repository.find_same_capture_time(user.id, capture_date),
-            self.sampah_repository.find_uploads_within_timeframe(
-                user.id, time_threshold
-            ),
-        )
-
-        if same_capture:
-            raise HTTPException(
-                status_code=400,
-                detail="Image with the same capture time already exists",
+        with stage_timer("duplicate_check"):
+            # Run the two independent database queries concurrently:
+            same_capture, previous_uploads = await asyncio.gather(
+                self.sampah_repository.find_same_capture_time(user.id, capture_date),
+                self.sampah_repository.find_uploads_within_timeframe(
+                    user.id, time_threshold
+                ),
             )
 
-        # Check if any previous upload is within 15 meters and 15 minutes
-
-        for upload in previous_uploads:
-            # Convert the WKT string to extract coordinates
-            geom = to_shape(upload.geom).wkt
-            previous_longitude, previous_latitude = geom.x, geom.y
-            upload_location = (previous_latitude, previous_longitude)
-            current_location = (latitude, longitude)
-            distance = geodesic(upload_location, current_location).meters
-            if distance <= 15:
+            if same_capture:
                 raise HTTPException(
                     status_code=400,
-                    detail="Upload within 15 meters and 15 minutes detected",
+                    detail="Image with the same capture time already exists",
                 )
 
+            # Check if any previous upload is within 15 meters and 15 minutes
+
+            for upload in previous_uploads:
+                # Convert the WKT string to extract coordinates
+                geom = to_shape(upload.geom).wkt
+                previous_longitude, previous_latitude = geom.x, geom.y
+                upload_location = (previous_latitude, previous_longitude)
+                current_location = (latitude, longitude)
+                distance = geodesic(upload_location, current_location).meters
+                if distance <= 15:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Upload within 15 meters and 15 minutes detected",
+                    )
+
         # Rename and store the file
-        file.filename = f"{token.name}_{file.filename}"
-        filename = insert_image_to_local(file, folder="original_image")
+        file.filename = f"{user.name}_{file.filename}"
+        with stage_timer("file_write"):
+            filename = await save_upload_to_local(file, folder="original_image")
 
         # Offload the CPU-bound image processing to a separate thread
-        processed_imagepath, total_point, list_sampah_items = await asyncio.to_thread(
-            process_image, filename, use_garbage_pile_model
-        )
+        with stage_timer("inference"):
+            (
+                processed_imagepath,
+                total_point,
+                list_sampah_items,
+                is_garbage_pile,
+            ) = await asyncio.to_thread(
+                process_image, filename, use_garbage_pile_model
+            )
+
+        with stage_timer("publish"):
+            await publish_file(f"assets/original_image/{filename}")
+            await publish_file(f"assets/detected_image/{processed_imagepath}")
+        schedule_derivatives(f"assets/detected_image/{processed_imagepath}")
 
         # Prepare the input for new sampah entry
         input_sampah = InputSampah(
@@ -208,12 +328,16 @@ class SampahController:
             capture_date=capture_date,
             image_url=f"assets/detected_image/{processed_imagepath}",
             point=total_point,
-            is_waste_pile=use_garbage_pile_model,
+            is_waste_pile=is_garbage_pile,
             sampah_items=list_sampah_items,
         )
 
         # Insert the new sampah record (await the async DB operation)
-        result = await self.sampah_repository.insert_new_sampah(input_sampah, user.id)
+        with stage_timer("db_insert"):
+            result = await self.sampah_repository.insert_new_sampah(
+                input_sampah, user.id
+            )
+        self._publish_created(result["id"], input_sampah)
 
         messages = {
             "id": {
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import Depends
+from config.schemas.sampah_schema import (
+    HeatmapCell,
+    HeatmapOutput,
+    SampahClusterOutput,
+)
+from src.controllers.service_common import parse_bbox
+from src.repositories.repository_stackholder_sampah import (
+    StackholderSampahRepository,
+)
+
+# Resolution r snaps reports to cells of 180 / 2^r degrees: 12 is about 5 km,
+# 16 about 300 m and 20 about 20 m at the equator
+HEATMAP_MIN_RESOLUTION = 1
+HEATMAP_MAX_RESOLUTION = 20
+
+
+def heatmap_cell_size(resolution: int) -> float:
+    return 180 / 2**resolution
+
+
+class StackholderSampahController:
+    def __init__(
+        self,
+        stackholder_sampah_repository: StackholderSampahRepository = Depends(),
+    ):
+        self.stackholder_sampah_repository = stackholder_sampah_repository
+
+    async def get_clusters(
+        self, bbox: Optional[str], min_reports: int, recent_days: Optional[int]
+    ):
+        recent_since = (
+            datetime.now() - timedelta(days=recent_days) if recent_days else None
+        )
+        rows = await self.stackholder_sampah_repository.get_clusters(
+            parse_bbox(bbox) if bbox else None, min_reports, recent_since
+        )
+        return [
+            SampahClusterOutput(
+                **row._mapping,
+                pickup_rate=row.picked_up_count / row.report_count,
+            )
+            for row in rows
+        ]
+
+    async def get_heatmap(
+        self,
+        resolution: int,
+        data_type: str,
+        status: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        bbox: Optional[str],
+    ):
+        cell_size = heatmap_cell_size(resolution)
+        rows = await self.stackholder_sampah_repository.get_heatmap(
+            cell_size,
+            data_type,
+            status,
+            start_date,
+            end_date,
+            parse_bbox(bbox) if bbox else None,
+        )
+        cells = [HeatmapCell(**row._mapping) for row in rows]
+        return HeatmapOutput(
+            resolution=resolution,
+            cell_size=cell_size,
+            total=sum(cell.count for cell in cells),
+            cells=cells,
+        )
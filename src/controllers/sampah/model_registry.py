@@ -0,0 +1,281 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from src.controllers.sampah.yolov8seg import YOLOv8Seg
+
+
+class ModelEntry:
+    """One loaded model version and the requests currently using it."""
+
+    def __init__(self, name: str, version: str, model: YOLOv8Seg):
+        self.name = name
+        self.version = version
+        self.model = model
+        self.refs = 0
+        self.retired = False
+        self.last_used = time.monotonic()
+        self.drained = threading.Event()
+        self.load_ms = 0.0
+        self.warmup_ms = []
+
+
+class ModelRegistry:
+    """Load YOLO models by name and version from a JSON manifest.
+
+    The manifest maps a model name to its active version and the files of
+    every version, relative to the manifest directory::
+
+        {
+          "garbage_pcs": {
+            "active": "v2",
+            "versions": {
+              "v1": {"model": "garbage-pcs-yolov8.onnx",
+                     "names": "garbage_pcs_data.yaml"},
+              "v2": {"model": "garbage-pcs-v2.onnx",
+                     "names": "garbage_pcs_data.yaml"}
+            },
+            "shadow": "v2"
+          }
+        }
+
+    The optional ``shadow`` version is loaded next to the active one for
+    shadow inference and never serves responses.
+
+    One session per model is shared by all threads. ``swap`` loads the new
+    version before replacing the old one, so requests never wait on a load,
+    and the old session is released once its in-flight requests finish.
+    """
+
+    def __init__(self, manifest_path: str, defaults: dict, warmup_runs: int = 0):
+        self.manifest_path = manifest_path
+        self.base_dir = os.path.dirname(manifest_path)
+        self.defaults = defaults
+        self.warmup_runs = warmup_runs
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._manifest_mtime = None
+        self._manifest = self._read_manifest()
+
+    def _read_manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return self.defaults
+        self._manifest_mtime = os.path.getmtime(self.manifest_path)
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        # A private temporary file per write, so concurrent swaps in other
+        # workers never interleave into the same file
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=os.path.dirname(os.path.abspath(self.manifest_path)),
+            prefix=".manifest.",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            json.dump(self._manifest, f, indent=2)
+        try:
+            # mkstemp creates the file as 0600
+            os.chmod(f.name, 0o644)
+            os.replace(f.name, self.manifest_path)
+        except OSError:
+            os.remove(f.name)
+            raise
+        self._manifest_mtime = os.path.getmtime(self.manifest_path)
+
+    def names(self):
+        return list(self._manifest)
+
+    def versions(self, name: str):
+        return list(self._manifest[name]["versions"])
+
+    def active_version(self, name: str) -> str:
+        return self._manifest[name]["active"]
+
+    def shadow_version(self, name: str):
+        return self._manifest[name].get("shadow")
+
+    def _version(self, name: str, shadow: bool):
+        return self.shadow_version(name) if shadow else self.active_version(name)
+
+    def _build(self, name: str, version: str) -> ModelEntry:
+        spec = self._manifest[name]["versions"][version]
+        start = time.perf_counter()
+        model = YOLOv8Seg(
+            os.path.join(self.base_dir, spec["model"]),
+            os.path.join(self.base_dir, spec["names"]),
+        )
+        model.label = name
+        entry = ModelEntry(name, version, model)
+        entry.load_ms = (time.perf_counter() - start) * 1000
+        if self.warmup_runs:
+            entry.warmup_ms = model.warmup(self.warmup_runs)
+        print(
+            f"Loaded model {name}:{version} in {entry.load_ms:.0f} ms, "
+            f"warm-up {sum(entry.warmup_ms):.0f} ms"
+        )
+        return entry
+
+    def load(self, name: str, shadow: bool = False) -> ModelEntry:
+        """Return the active (or shadow) entry of ``name``, loading it if needed."""
+        key = (name, shadow)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        # Loading takes seconds; only callers of this model wait for it
+        with load_lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._build(name, self._version(name, shadow))
+                with self._lock:
+                    self._entries[key] = entry
+            return entry
+
+    @contextmanager
+    def acquire(self, name: str, shadow: bool = False):
+        """Borrow a model for the duration of one request."""
+        while True:
+            entry = self.load(name, shadow)
+            with self._lock:
+                # A swap may have retired the entry between load and here
+                if not entry.retired:
+                    entry.refs += 1
+                    entry.drained.clear()
+                    break
+        try:
+            yield entry
+        finally:
+            with self._lock:
+                entry.refs -= 1
+                entry.last_used = time.monotonic()
+                if entry.refs == 0:
+                    entry.drained.set()
+
+    def swap(self, name: str, version: str, drain_timeout: float = 30.0) -> dict:
+        """Atomically make ``version`` the active version of ``name``.
+
+        Returns once requests still using the previous version have finished
+        or ``drain_timeout`` seconds have passed.
+        """
+        if version not in self._manifest[name]["versions"]:
+            raise KeyError(f"Unknown version {version} for model {name}")
+        key = (name, False)
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            new_entry = self._build(name, version)
+            with self._lock:
+                old_entry = self._entries.get(key)
+                self._entries[key] = new_entry
+                self._manifest[name]["active"] = version
+                self._retire(old_entry)
+                if self.shadow_version(name) == version:
+                    # The candidate was promoted, stop shadowing it
+                    self._manifest[name].pop("shadow")
+                    self._retire(self._entries.pop((name, True), None))
+        if os.path.exists(self.manifest_path):
+            self._write_manifest()
+
+        drained = True
+        if old_entry is not None:
+            drained = old_entry.drained.wait(drain_timeout)
+        return {
+            "name": name,
+            "version": version,
+            "previous_version": old_entry.version if old_entry else None,
+            "drained": drained,
+        }
+
+    def _retire(self, entry: ModelEntry):
+        # Called with the lock held; the session is freed once refs drop to 0
+        if entry is not None:
+            entry.retired = True
+            if entry.refs == 0:
+                entry.drained.set()
+
+    def unload(self, name: str, shadow: bool = False) -> bool:
+        """Drop the session of ``name`` if no request is using it."""
+        with self._lock:
+            entry = self._entries.get((name, shadow))
+            if entry is None or entry.refs:
+                return False
+            del self._entries[(name, shadow)]
+        print(f"Unloaded model {name}:{entry.version}")
+        return True
+
+    def unload_idle(self, max_idle_seconds: float):
+        now = time.monotonic()
+        idle = [
+            key
+            for key, entry in list(self._entries.items())
+            if entry.refs == 0 and now - entry.last_used >= max_idle_seconds
+        ]
+        return [key for key in idle if self.unload(*key)]
+
+    def sync_with_manifest(self):
+        """Apply active versions changed in the manifest by another worker."""
+        if not os.path.exists(self.manifest_path):
+            return []
+        if os.path.getmtime(self.manifest_path) == self._manifest_mtime:
+            return []
+        manifest = self._read_manifest()
+        swapped = []
+        for name, spec in manifest.items():
+            entry = self._entries.get((name, False))
+            shadow_entry = self._entries.get((name, True))
+            self._manifest[name] = spec
+            if entry is not None and entry.version != spec["active"]:
+                swapped.append(self.swap(name, spec["active"]))
+            if shadow_entry is not None and shadow_entry.version != spec.get("shadow"):
+                with self._lock:
+                    self._retire(self._entries.pop((name, True), None))
+        return swapped
+
+    def describe(self) -> dict:
+        status = {}
+        for name in self.names():
+            entry = self._entries.get((name, False))
+            status[name] = {
+                "active_version": self.active_version(name),
+                "shadow_version": self.shadow_version(name),
+                "versions": self.versions(name),
+                "loaded": entry is not None,
+            }
+            if entry is not None:
+                status[name].update(
+                    {
+                        "in_flight": entry.refs,
+                        "load_ms": round(entry.load_ms, 1),
+                        "warmup_ms": [round(ms, 1) for ms in entry.warmup_ms],
+                        "input_shape": [
+                            entry.model.model_height,
+                            entry.model.model_width,
+                        ],
+                    }
+                )
+        return status
+
+    def run_maintenance(self, interval: float, max_idle_seconds: float):
+        """Periodically pick up manifest changes and unload idle models."""
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sync_with_manifest()
+                    if max_idle_seconds > 0:
+                        self.unload_idle(max_idle_seconds)
+                except Exception as e:
+                    print(f"Model registry maintenance failed: {e}")
+
+        thread = threading.Thread(target=loop, name="model-registry", daemon=True)
+        thread.start()
+        return thread
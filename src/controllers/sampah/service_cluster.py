@@ -0,0 +1,46 @@
+import asyncio
+import logging
+import os
+from config.database import SessionLocal
+from config.models.sampah_model import Sampah
+from src.controllers.service_cache import get_data_version
+from src.repositories.repository_stackholder_sampah import (
+    StackholderSampahRepository,
+)
+
+# Reports closer than this to a cluster member join the cluster
+CLUSTER_EPS_METERS = float(os.environ.get("CLUSTER_EPS_METERS", 50))
+CLUSTER_MIN_POINTS = int(os.environ.get("CLUSTER_MIN_POINTS", 3))
+# How often the sampahs data version is checked (0 disables the job)
+CLUSTER_REFRESH_SECONDS = float(os.environ.get("CLUSTER_REFRESH_SECONDS", 300))
+
+logger = logging.getLogger("sampah.cluster")
+# Also covers builds that found no clusters, which leave no version behind
+_built_version = None
+
+
+def cluster_version(data_version: str) -> str:
+    # Changing the parameters must rebuild the clusters as well
+    return f"{data_version}|eps={CLUSTER_EPS_METERS}|min={CLUSTER_MIN_POINTS}"
+
+
+async def refresh_clusters():
+    """Rebuild the clusters when sampahs changed since the last build."""
+    global _built_version
+    db = SessionLocal()
+    try:
+        repository = StackholderSampahRepository(db)
+        version = cluster_version(get_data_version(db, Sampah)[0])
+        if version in (_built_version, await repository.get_cluster_version()):
+            return
+        count = await asyncio.to_thread(
+            repository.refresh_clusters,
+            version,
+            CLUSTER_EPS_METERS,
+            CLUSTER_MIN_POINTS,
+        )
+        if count is not None:
+            _built_version = version
+            logger.info("Rebuilt %d sampah clusters", count)
+    finally:
+        db.close()
@@ -0,0 +1,159 @@
+import asyncio
+import datetime
+import logging
+import os
+import threading
+import pycountry
+from exif import Image as ExifImage
+from fastapi import HTTPException, UploadFile
+from src.controllers.service_cache import TTLCache
+
+# The EXIF block sits in the APP1 segment at the start of a JPEG and is at
+# most 64 KiB, so the pixels never have to be read or decoded
+EXIF_HEADER_BYTES = int(os.environ.get("EXIF_HEADER_BYTES", 64 * 1024))
+# Coordinates are rounded to this many decimals (3 is about 110 m) before the
+# lookup, so nearby reports share a cache entry
+GEOCODE_PRECISION = int(os.environ.get("GEOCODE_PRECISION", 3))
+GEOCODE_CACHE_TTL_SECONDS = float(
+    os.environ.get("GEOCODE_CACHE_TTL_SECONDS", 24 * 60 * 60)
+)
+GEOCODE_CACHE_MAX_ENTRIES = int(os.environ.get("GEOCODE_CACHE_MAX_ENTRIES", 4096))
+
+logger = logging.getLogger("sampah.metadata")
+geocode_cache = TTLCache(GEOCODE_CACHE_TTL_SECONDS, GEOCODE_CACHE_MAX_ENTRIES)
+_geocoder = None
+_geocoder_lock = threading.Lock()
+
+
+def _to_degrees(value, ref: str) -> float:
+    degrees, minutes, seconds = value
+    decimal = degrees + minutes / 60 + seconds / 3600
+    return -decimal if ref in ("S", "W") else decimal
+
+
+def parse_exif(header: bytes) -> dict:
+    """Capture time and GPS position from the first bytes of an image.
+
+    Keys are only present for the values the photo actually carries.
+    """
+    try:
+        image = ExifImage(header)
+        if not image.has_exif:
+            return {}
+    except Exception:
+        # Missing, truncated or vendor specific tags are common on phones
+        logger.debug("Unreadable EXIF data", exc_info=True)
+        return {}
+
+    # Parsed separately, a bogus timestamp such as "0000:00:00 00:00:00" must
+    # not cost the GPS position and vice versa
+    metadata = {}
+    try:
+        taken = image.get("datetime_original") or image.get("datetime")
+        if taken:
+            metadata["capture_date"] = datetime.datetime.strptime(
+                taken, "%Y:%m:%d %H:%M:%S"
+            )
+    except Exception:
+        logger.debug("Unreadable EXIF capture time", exc_info=True)
+    try:
+        latitude, longitude = image.get("gps_latitude"), image.get("gps_longitude")
+        if latitude and longitude:
+            metadata["latitude"] = _to_degrees(
+                latitude, image.get("gps_latitude_ref", "N")
+            )
+            metadata["longitude"] = _to_degrees(
+                longitude, image.get("gps_longitude_ref", "E")
+            )
+    except Exception:
+        metadata.pop("latitude", None)
+        logger.debug("Unreadable EXIF GPS position", exc_info=True)
+    return metadata
+
+
+def get_geocoder():
+    """The reverse_geocoder KD-tree, built once per process on first use."""
+    global _geocoder
+    with _geocoder_lock:
+        if _geocoder is None:
+            # Imported lazily, loading the city table takes about a second
+            import reverse_geocoder
+
+            _geocoder = reverse_geocoder.RGeocoder(mode=1, verbose=False)
+    return _geocoder
+
+
+def format_place(place: dict) -> str:
+    country = pycountry.countries.get(alpha_2=place["cc"])
+    parts = [
+        place["name"],
+        place["admin2"],
+        place["admin1"],
+        country.name if country else place["cc"],
+    ]
+    return ", ".join(part for part in parts if part)
+
+
+def reverse_geocode_many(coordinates) -> list:
+    """Addresses for ``(latitude, longitude)`` pairs in one KD-tree query.
+
+    The lookup is offline and CPU bound; call it through ``asyncio.to_thread``.
+    """
+    keys = [
+        (round(latitude, GEOCODE_PRECISION), round(longitude, GEOCODE_PRECISION))
+        for latitude, longitude in coordinates
+    ]
+    addresses = {key: geocode_cache.get(key) for key in keys}
+    missing = [key for key, address in addresses.items() if address is None]
+    if missing:
+        for key, place in zip(missing, get_geocoder().query(missing)):
+            addresses[key] = format_place(place)
+            geocode_cache.set(key, addresses[key])
+    return [addresses[key] for key in keys]
+
+
+async def read_upload_header(file: UploadFile) -> bytes:
+    header = await file.read(EXIF_HEADER_BYTES)
+    await file.seek(0)
+    return header
+
+
+async def resolve_upload_metadata(
+    file: UploadFile,
+    longitude: float = None,
+    latitude: float = None,
+    address: str = None,
+    capture_date: datetime.datetime = None,
+):
+    """Fill in what the client left out from EXIF and reverse geocoding.
+
+    Values sent by the client win. Returns
+    ``(longitude, latitude, address, capture_date)``.
+    """
+    if None in (longitude, latitude, capture_date):
+        metadata = parse_exif(await read_upload_header(file))
+        if (longitude is None or latitude is None) and "latitude" in metadata:
+            longitude, latitude = metadata["longitude"], metadata["latitude"]
+        capture_date = capture_date or metadata.get("capture_date")
+
+    missing = [
+        name
+        for name, value in (
+            ("longitude", longitude),
+            ("latitude", latitude),
+            ("capture_date", capture_date),
+        )
+        if value is None
+    ]
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Missing {', '.join(missing)} and the photo has no EXIF data "
+            "for it",
+        )
+
+    if not address:
+        (address,) = await asyncio.to_thread(
+            reverse_geocode_many, [(latitude, longitude)]
+        )
+    return longitude, latitude, address, capture_date
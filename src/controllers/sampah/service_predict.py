@@ -1,24 +1,92 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Optional
 import cv2
 from fastapi import HTTPException
 
 from assets.models.label_mapping_points import LABEL_MAPPING_POINTS
 from config.schemas.sampah_schema import CountObject, InputSampahItem
-from src.controllers.sampah.YOLOOnnxsingleton import YOLOOnnxSingleton
+from src.controllers.sampah.model_registry import ModelRegistry
+from src.controllers.service_metrics import (
+    ModelCollector,
+    register_local_collector,
+    track_executor_queue,
+)
+from src.controllers.sampah.service_shadow import (
+    save_shadow_metric,
+    shadow_executor,
+    should_shadow,
+)
 
 # Configuration Constants
 INPUT_DIR = "assets/original_image"
 OUTPUT_DIR = "assets/detected_image"
-MODEL_PATH_GARBAGE_PCS = "assets/models/garbage-pcs-yolov8.onnx"
-MODEL_PATH_GARBAGE_PILE = "assets/models/garbage-pile-yolov8.onnx"
-GARBAGE_PCS_YAML = "assets/models/garbage_pcs_data.yaml"
-GARBAGE_PILE_YAML = "assets/models/garbage_pile_data.yaml"
+MODEL_MANIFEST = os.environ.get("MODEL_MANIFEST", "assets/models/manifest.json")
+# Used when no manifest file exists
+DEFAULT_MODELS = {
+    "garbage_pcs": {
+        "active": "v1",
+        "versions": {
+            "v1": {
+                "model": "garbage-pcs-yolov8.onnx",
+                "names": "garbage_pcs_data.yaml",
+            }
+        },
+    },
+    "garbage_pile": {
+        "active": "v1",
+        "versions": {
+            "v1": {
+                "model": "garbage-pile-yolov8.onnx",
+                "names": "garbage_pile_data.yaml",
+            }
+        },
+    },
+}
+# Photos whose longest side reaches this size use tiled inference (0 disables)
+TILED_INFERENCE_MIN_SIDE = int(os.environ.get("TILED_INFERENCE_MIN_SIDE", 0))
+TILED_INFERENCE_MAX_TILES = int(os.environ.get("TILED_INFERENCE_MAX_TILES", 12))
+# "concurrent" runs both models at once, "sequential" runs the pieces model
+# only when the pile model finds no pile
+CASCADE_STRATEGY = os.environ.get("CASCADE_STRATEGY", "concurrent")
+CASCADE_PILE_CONFIDENCE = float(os.environ.get("CASCADE_PILE_CONFIDENCE", 0.5))
+
+cascade_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cascade")
+track_executor_queue("cascade", cascade_executor)
+track_executor_queue("shadow", shadow_executor)
+
+MODEL_WARMUP_RUNS = int(os.environ.get("MODEL_WARMUP_RUNS", 2))
+# Models unused for this long are unloaded and reloaded on demand (0 disables)
+MODEL_IDLE_UNLOAD_SECONDS = float(os.environ.get("MODEL_IDLE_UNLOAD_SECONDS", 0))
+MODEL_MAINTENANCE_INTERVAL = float(os.environ.get("MODEL_MAINTENANCE_INTERVAL", 30))
+
+model_registry = ModelRegistry(MODEL_MANIFEST, DEFAULT_MODELS, MODEL_WARMUP_RUNS)
+register_local_collector(ModelCollector(model_registry.describe))
+
+# Set by load_models() and reported by /health/ready
+model_status = {"ready": False, "error": None}
+
+
+def get_model_status():
+    return {**model_status, "models": model_registry.describe()}
 
-GARBAGE_PCS_MODEL = YOLOOnnxSingleton.get_instance(
-    MODEL_PATH_GARBAGE_PCS, GARBAGE_PCS_YAML
-)
-GARBAGE_PILE_MODEL = YOLOOnnxSingleton.get_instance(
-    MODEL_PATH_GARBAGE_PILE, GARBAGE_PILE_YAML
-)
+
+def load_models():
+    """Load every model in parallel and run warm-up inferences.
+
+    Called once from the startup event; requests arriving earlier still work
+    but load the model themselves.
+    """
+    names = model_registry.names()
+    try:
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            list(executor.map(model_registry.load, names))
+        model_status["ready"] = True
+    except Exception as e:
+        model_status["error"] = str(e)
+        print(f"Model loading failed: {e}")
 
 
 def calculate_objects(detected_objects):
@@ -34,16 +102,130 @@ def calculate_objects(detected_objects):
     return list(object_summary.values())
 
 
-def process_image(filename: str, use_garbage_pile_model: bool) -> tuple:
-    if use_garbage_pile_model:
-        model_label = "garbage_pile"
-        model = GARBAGE_PILE_MODEL
-    else:
-        model_label = "garbage_pcs"
-        model = GARBAGE_PCS_MODEL
+def detect(model, im, prep=None, allow_tiled=False):
+    if (
+        allow_tiled
+        and TILED_INFERENCE_MIN_SIDE
+        and max(im.shape[:2]) >= TILED_INFERENCE_MIN_SIDE
+    ):
+        # Small litter disappears when a 12MP photo is letterboxed to 640px
+        return model.predict_tiled(im, max_tiles=TILED_INFERENCE_MAX_TILES)
+    return model(im, prep=prep)
+
+
+def timed_detect(model, im, prep=None, allow_tiled=False):
+    start = time.perf_counter()
+    result = detect(model, im, prep, allow_tiled)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def detect_cascade(im, pcs_model, pile_model):
+    """Run the pile and pieces models on one decoded image.
+
+    Returns ``(is_garbage_pile, (boxes, segments, masks), latency_ms)`` where
+    the latency is that of the model whose result is used. The letterboxed
+    tensor is shared when both models take the same input size.
+    """
+    prep = pcs_model.preprocess(im)
+    same_input = (pile_model.model_height, pile_model.model_width) == (
+        pcs_model.model_height,
+        pcs_model.model_width,
+    )
+    pile_prep = prep if same_input else None
+
+    if CASCADE_STRATEGY == "sequential":
+        pile, pile_ms = timed_detect(pile_model, im, pile_prep)
+        if is_garbage_pile(pile[0]):
+            return True, pile, pile_ms
+        return (False, *timed_detect(pcs_model, im, prep, allow_tiled=True))
+
+    # onnxruntime releases the GIL, so both sessions run in parallel
+    pile_future = cascade_executor.submit(timed_detect, pile_model, im, pile_prep)
+    pcs, pcs_ms = timed_detect(pcs_model, im, prep, allow_tiled=True)
+    pile, pile_ms = pile_future.result()
+    if is_garbage_pile(pile[0]):
+        return True, pile, pile_ms
+    return False, pcs, pcs_ms
+
+
+def is_garbage_pile(boxes):
+    return len(boxes) > 0 and max(box[4] for box in boxes) >= CASCADE_PILE_CONFIDENCE
+
+
+def run_shadow(name, production_version, im, production_boxes, latency_ms, image):
+    """Run the candidate version of ``name`` and store how it compares."""
+    try:
+        with model_registry.acquire(name, shadow=True) as candidate:
+            result, candidate_ms = timed_detect(
+                candidate.model, im, allow_tiled=name == "garbage_pcs"
+            )
+        save_shadow_metric(
+            model_name=name,
+            production_version=production_version,
+            candidate_version=candidate.version,
+            image_path=image,
+            production_latency_ms=latency_ms,
+            candidate_latency_ms=candidate_ms,
+            production_boxes=production_boxes,
+            candidate_boxes=result[0],
+        )
+    except Exception as e:
+        print(f"Shadow inference for {name} failed: {e}")
+
+
+def process_image(filename: str, use_garbage_pile_model: Optional[bool]) -> tuple:
+    """Detect garbage in an uploaded image.
+
+    ``use_garbage_pile_model=None`` lets the cascade pick the model. Returns
+    ``(filename, total_point, sampah_items, is_garbage_pile)``.
+    """
     file_path = f"{INPUT_DIR}/{filename}"
     im = cv2.imread(file_path)
-    boxes, segments, masks = model(im)
+    with ExitStack() as stack:
+        if use_garbage_pile_model is None:
+            pcs = stack.enter_context(model_registry.acquire("garbage_pcs"))
+            pile = stack.enter_context(model_registry.acquire("garbage_pile"))
+            use_garbage_pile_model, result, latency_ms = detect_cascade(
+                im, pcs.model, pile.model
+            )
+        elif use_garbage_pile_model:
+            pile = stack.enter_context(model_registry.acquire("garbage_pile"))
+            result, latency_ms = timed_detect(pile.model, im)
+        else:
+            pcs = stack.enter_context(model_registry.acquire("garbage_pcs"))
+            result, latency_ms = timed_detect(pcs.model, im, allow_tiled=True)
+        boxes, segments, masks = result
+
+        if use_garbage_pile_model:
+            model_label = "garbage_pile"
+            entry = pile
+        else:
+            model_label = "garbage_pcs"
+            entry = pcs
+        if should_shadow(model_registry.shadow_version(model_label)):
+            shadow_executor.submit(
+                run_shadow,
+                model_label,
+                entry.version,
+                im,
+                boxes,
+                latency_ms,
+                filename,
+            )
+        return _collect_detections(
+            im,
+            filename,
+            entry.model,
+            model_label,
+            boxes,
+            segments,
+            use_garbage_pile_model,
+        )
+
+
+def _collect_detections(
+    im, filename, model, model_label, boxes, segments, use_garbage_pile_model
+):
     detected_objects = []
     filename = f"{model_label}_{filename}"
     if len(boxes) > 0:
@@ -73,6 +255,6 @@ def process_image(filename: str, use_garbage_pile_model: bool) -> tuple:
         list_sampah_item = [
             InputSampahItem(jenisSampahId=obj["class"]) for obj in detected_objects
         ]
-        return filename, total_point, list_sampah_item
+        return filename, total_point, list_sampah_item, use_garbage_pile_model
     else:
         raise HTTPException(status_code=400, detail="No object detected")
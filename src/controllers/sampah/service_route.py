@@ -0,0 +1,109 @@
+import os
+import time
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+# Upper bounds for a single request; the distance matrix needs 8 * n^2 bytes
+ROUTE_MAX_STOPS = int(os.environ.get("ROUTE_MAX_STOPS", 2000))
+ROUTE_TIME_BUDGET_MS = int(os.environ.get("ROUTE_TIME_BUDGET_MS", 2000))
+
+
+def haversine_matrix(latitudes, longitudes) -> np.ndarray:
+    """Great-circle distances in metres between every pair of points."""
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def nearest_neighbour(dist: np.ndarray, start: int = 0) -> np.ndarray:
+    """Greedy tour from ``start`` that always visits the closest unvisited node."""
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    tour = np.empty(n, dtype=np.int64)
+    tour[0] = current = start
+    visited[start] = True
+    for k in range(1, n):
+        candidates = np.where(visited, np.inf, dist[current])
+        current = int(np.argmin(candidates))
+        tour[k] = current
+        visited[current] = True
+    return tour
+
+
+def path_length(dist: np.ndarray, path: np.ndarray) -> float:
+    return float(dist[path[:-1], path[1:]].sum())
+
+
+def two_opt(dist: np.ndarray, path: np.ndarray, deadline: float, closed: bool):
+    """Improve ``path`` in place with 2-opt moves until no move helps.
+
+    ``path[0]`` stays the first node. A closed path also ends with its first
+    node, which stays last; an open path may end anywhere. For each position
+    the gain of every possible reversal is computed at once with NumPy and the
+    best one is applied. Stops early at ``deadline`` (``time.perf_counter``).
+    Returns ``(passes, timed_out)``.
+    """
+    m = len(path)
+    # Last position a reversal may touch
+    last = m - 2 if closed else m - 1
+    passes = 0
+    improved = True
+    while improved:
+        improved = False
+        passes += 1
+        for i in range(1, last):
+            if time.perf_counter() > deadline:
+                return passes, True
+            a, b = path[i - 1], path[i]
+            c = path[i + 1 : last + 1]
+            # The node after each candidate end, none past an open path's end
+            d = path[i + 2 : last + 2]
+            gain = dist[a, b] - dist[a, c]
+            gain[: len(d)] += dist[c[: len(d)], d] - dist[b, d]
+            j = int(np.argmax(gain))
+            if gain[j] > 1e-6:
+                path[i : i + j + 2] = path[i : i + j + 2][::-1].copy()
+                improved = True
+    return passes, False
+
+
+def plan_route(
+    latitudes,
+    longitudes,
+    return_to_start: bool = False,
+    time_budget_ms: int = ROUTE_TIME_BUDGET_MS,
+):
+    """Order the stops 1..n-1 for a crew starting at point 0.
+
+    Returns the visiting order as indices into the input (without the start),
+    the distance of every leg and solver statistics.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget_ms / 1000
+    dist = haversine_matrix(latitudes, longitudes)
+    path = nearest_neighbour(dist)
+    if return_to_start:
+        path = np.append(path, 0)
+    initial = path_length(dist, path)
+    passes, timed_out = two_opt(dist, path, deadline, closed=return_to_start)
+    total = path_length(dist, path)
+
+    order = path[1:-1] if return_to_start else path[1:]
+    return {
+        "order": order.tolist(),
+        "legs": dist[path[:-1], path[1:]].tolist(),
+        "total_distance_m": total,
+        "stats": {
+            "stops": len(order),
+            "nearest_neighbour_distance_m": initial,
+            "two_opt_passes": passes,
+            "timed_out": timed_out,
+            "elapsed_ms": (time.perf_counter() - started) * 1000,
+        },
+    }
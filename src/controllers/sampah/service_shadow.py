@@ -0,0 +1,93 @@
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config.database import SessionLocal
+from config.models.shadow_metric_model import ShadowMetric
+
+# Share of uploads that also run the candidate ("shadow") model version
+SHADOW_SAMPLE_RATE = float(os.environ.get("SHADOW_SAMPLE_RATE", 0))
+SHADOW_MAX_PENDING = int(os.environ.get("SHADOW_MAX_PENDING", 8))
+SHADOW_MATCH_IOU = float(os.environ.get("SHADOW_MATCH_IOU", 0.5))
+
+# A single worker keeps shadow runs from competing with production inference
+shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+
+
+def should_shadow(shadow_version) -> bool:
+    if not shadow_version or SHADOW_SAMPLE_RATE <= 0:
+        return False
+    # Skip samples instead of queueing without bound when shadows fall behind
+    if shadow_executor._work_queue.qsize() >= SHADOW_MAX_PENDING:
+        return False
+    return random.random() < SHADOW_SAMPLE_RATE
+
+
+def box_iou(a, b):
+    """Pairwise IoU of two ``(n, 4)`` arrays of xyxy boxes."""
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:4], b[None, :, 2:4])
+    inter = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:4] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:4] - b[:, :2], axis=1)
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def compare_detections(production_boxes, candidate_boxes, match_iou=SHADOW_MATCH_IOU):
+    """Greedily match boxes by IoU and measure how much the outputs agree.
+
+    Boxes are ``(x1, y1, x2, y2, conf, class)`` rows as returned by YOLOv8Seg.
+    """
+    production = np.asarray(production_boxes, dtype=np.float32).reshape(-1, 6)
+    candidate = np.asarray(candidate_boxes, dtype=np.float32).reshape(-1, 6)
+    matches = []
+    if len(production) and len(candidate):
+        iou = box_iou(production, candidate)
+        while True:
+            i, j = np.unravel_index(np.argmax(iou), iou.shape)
+            if iou[i, j] < match_iou:
+                break
+            matches.append((iou[i, j], production[i, 5] == candidate[j, 5]))
+            iou[i, :] = -1
+            iou[:, j] = -1
+    return {
+        "production_count": len(production),
+        "candidate_count": len(candidate),
+        "matched_count": len(matches),
+        "mean_iou": float(np.mean([m[0] for m in matches])) if matches else None,
+        "class_agreement": (
+            float(np.mean([m[1] for m in matches])) if matches else None
+        ),
+    }
+
+
+def save_shadow_metric(
+    model_name: str,
+    production_version: str,
+    candidate_version: str,
+    image_path: str,
+    production_latency_ms: float,
+    candidate_latency_ms: float,
+    production_boxes,
+    candidate_boxes,
+):
+    comparison = compare_detections(production_boxes, candidate_boxes)
+    # Runs on the shadow worker thread, outside any request session
+    with SessionLocal() as db:
+        db.add(
+            ShadowMetric(
+                modelName=model_name,
+                productionVersion=production_version,
+                candidateVersion=candidate_version,
+                imagePath=image_path,
+                productionLatencyMs=production_latency_ms,
+                candidateLatencyMs=candidate_latency_ms,
+                productionCount=comparison["production_count"],
+                candidateCount=comparison["candidate_count"],
+                matchedCount=comparison["matched_count"],
+                meanIou=comparison["mean_iou"],
+                classAgreement=comparison["class_agreement"],
+            )
+        )
+        db.commit()
+    return comparison
@@ -0,0 +1,105 @@
+import ast
+
+
+def _scalar(value: str):
+    value = value.strip()
+    if value[:1] in "'\"" and value[-1:] == value[:1]:
+        return value[1:-1]
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _strip_comment(line: str) -> str:
+    quote = None
+    for i, char in enumerate(line):
+        if char in "'\"":
+            quote = None if quote == char else quote or char
+        elif char == "#" and quote is None:
+            return line[:i]
+    return line
+
+
+def load_class_names(yaml_path: str):
+    """Read the ``names`` entry of a YOLO dataset YAML file.
+
+    Supports the layouts exported by ultralytics: an inline list, an inline
+    mapping, a block list (``- name``) and a block mapping (``0: name``).
+    Mappings are returned as ``{class_id: name}``, lists as lists.
+    """
+    with open(yaml_path, encoding="utf-8") as f:
+        lines = [_strip_comment(line).rstrip() for line in f]
+
+    for i, line in enumerate(lines):
+        if not line.startswith("names:"):
+            continue
+        inline = line[len("names:") :].strip()
+        if inline:
+            if inline.startswith("{"):
+                return {
+                    _scalar(k): _scalar(v)
+                    for k, v in (
+                        item.split(":", 1)
+                        for item in inline.strip("{}").split(",")
+                        if item.strip()
+                    )
+                }
+            return list(ast.literal_eval(inline))
+
+        names = None
+        for entry in lines[i + 1 :]:
+            if not entry.strip():
+                continue
+            if not entry[0].isspace() and not entry.startswith("- "):
+                break
+            entry = entry.strip()
+            if entry.startswith("- "):
+                names = names if names is not None else []
+                names.append(_scalar(entry[2:]))
+            else:
+                key, _, value = entry.partition(":")
+                names = names if names is not None else {}
+                names[_scalar(key)] = _scalar(value)
+        return names
+    raise ValueError(f"No 'names' entry in {yaml_path}")
+
+
+class Colors:
+    """Ultralytics default color palette, without importing ultralytics.
+
+    Copied from ``ultralytics.utils.plotting.Colors`` (8.1 and later).
+    """
+
+    HEXS = (
+        "042AFF",
+        "0BDBEB",
+        "F3F3F3",
+        "00DFB7",
+        "111F68",
+        "FF6FDD",
+        "FF444F",
+        "CCED00",
+        "00F344",
+        "BD00FF",
+        "00B4FF",
+        "DD00BA",
+        "00FFFF",
+        "26C000",
+        "01FFB3",
+        "7D24FF",
+        "7B0068",
+        "FF1B6C",
+        "FC6D2F",
+        "A2FF0B",
+    )
+
+    def __init__(self):
+        self.palette = [
+            tuple(int(h[i : i + 2], 16) for i in (0, 2, 4)) for h in self.HEXS
+        ]
+        self.n = len(self.palette)
+
+    def __call__(self, i, bgr=False):
+        color = self.palette[int(i) % self.n]
+        return (color[2], color[1], color[0]) if bgr else color
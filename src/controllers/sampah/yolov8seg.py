@@ -1,10 +1,11 @@
+import math
 import os
+import time
 import cv2
 import numpy as np
 import onnxruntime as ort
-from ultralytics.utils import ASSETS, yaml_load
-from ultralytics.utils.checks import check_yaml
-from ultralytics.utils.plotting import Colors
+from src.controllers.sampah.yolo_utils import Colors, load_class_names
+from src.controllers.service_metrics import INFERENCE_DURATION
 
 
 class YOLOv8Seg:
@@ -27,12 +28,34 @@ class YOLOv8Seg:
         self.model_height, self.model_width = [
             x.shape for x in self.session.get_inputs()
         ][0][-2:]
-        self.classes = yaml_load(check_yaml(yaml_path or "data.yaml"))["names"]
+        self.input_name = self.session.get_inputs()[0].name
+        self.classes = load_class_names(yaml_path or "data.yaml")
         self.color_palette = Colors()
+        # Metric label; the model registry replaces it with the model name
+        self.label = os.path.splitext(os.path.basename(onnx_model))[0]
 
-    def __call__(self, im0, conf_threshold=0.4, iou_threshold=0.45, nm=32):
-        im, ratio, (pad_w, pad_h) = self.preprocess(im0)
-        preds = self.session.run(None, {self.session.get_inputs()[0].name: im})
+    def warmup(self, runs=1):
+        """Run inference on a blank input so the first request skips session setup.
+
+        Returns the latency of every run in milliseconds.
+        """
+        im = np.zeros((1, 3, self.model_height, self.model_width), dtype=self.ndtype)
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            self.session.run(None, {self.input_name: im})
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def __call__(self, im0, conf_threshold=0.4, iou_threshold=0.45, nm=32, prep=None):
+        start = time.perf_counter()
+        # ``prep`` lets callers reuse a preprocess() result shared between models
+        im, ratio, (pad_w, pad_h) = prep or self.preprocess(im0)
+        if im.dtype != self.ndtype:
+            im = im.astype(self.ndtype)
+        preprocessed = time.perf_counter()
+        preds = self.session.run(None, {self.input_name: im})
+        inferred = time.perf_counter()
         boxes, segments, masks = self.postprocess(
             preds,
             im0=im0,
@@ -43,8 +66,163 @@ class YOLOv8Seg:
             iou_threshold=iou_threshold,
             nm=nm,
         )
+        end = time.perf_counter()
+        for stage, elapsed in (
+            ("preprocess", preprocessed - start),
+            ("session_run", inferred - preprocessed),
+            ("postprocess", end - inferred),
+        ):
+            INFERENCE_DURATION.labels(self.label, stage).observe(elapsed)
+        return boxes, segments, masks
+
+    def predict_tiled(
+        self,
+        im0,
+        tile_size=None,
+        overlap=0.2,
+        max_tiles=12,
+        max_batch=8,
+        conf_threshold=0.4,
+        iou_threshold=0.45,
+        ios_threshold=0.6,
+        nm=32,
+    ):
+        """Sliced inference for high resolution photos.
+
+        The image is split into overlapping tiles that are letterboxed and run
+        through the model in batches, then detections are merged across tiles.
+        Masks are returned as ``(mask, x, y)`` crops of their box instead of
+        full-frame arrays to keep memory bounded on 12MP images.
+        """
+        tile_size = tile_size or 2 * max(self.model_height, self.model_width)
+        tiles = self.tile_grid(im0.shape, tile_size, overlap, max_tiles)
+        crops, batch = [], []
+        for x0, y0, x1, y1 in tiles:
+            crop = im0[y0:y1, x0:x1]
+            im, ratio, pad = self.preprocess(crop)
+            crops.append((crop, ratio, pad))
+            batch.append(im)
+        preds_per_tile = self.run_batch(np.concatenate(batch), max_batch)
+
+        boxes, masks = [], []
+        for (x0, y0, _, _), (crop, ratio, (pad_w, pad_h)), preds in zip(
+            tiles, crops, preds_per_tile
+        ):
+            tile_boxes, _, tile_masks = self.postprocess(
+                preds,
+                im0=crop,
+                ratio=ratio,
+                pad_w=pad_w,
+                pad_h=pad_h,
+                conf_threshold=conf_threshold,
+                iou_threshold=iou_threshold,
+                nm=nm,
+            )
+            for box, mask in zip(tile_boxes, tile_masks):
+                bx0, by0 = int(box[0]), int(box[1])
+                bx1, by1 = math.ceil(box[2]), math.ceil(box[3])
+                if bx1 <= bx0 or by1 <= by0:
+                    continue
+                box = box.copy()
+                box[[0, 2]] += x0
+                box[[1, 3]] += y0
+                boxes.append(box)
+                masks.append((mask[by0:by1, bx0:bx1], bx0 + x0, by0 + y0))
+
+        if not boxes:
+            return [], [], []
+        boxes, masks = self.merge_tile_detections(
+            np.array(boxes), masks, iou_threshold, ios_threshold
+        )
+        segments = []
+        for mask, x, y in masks:
+            segments.append(self.masks2segments(mask[None])[0] + [x, y])
         return boxes, segments, masks
 
+    @staticmethod
+    def tile_grid(shape, tile_size, overlap, max_tiles):
+        h, w = shape[:2]
+        tile = int(tile_size)
+        # A single tile always fits, so a budget below one cannot loop forever
+        max_tiles = max(int(max_tiles), 1)
+        # Grow the tiles until the grid fits the budget so latency stays bounded
+        while True:
+            stride = max(int(tile * (1 - overlap)), 1)
+            nx = 1 if w <= tile else math.ceil((w - tile) / stride) + 1
+            ny = 1 if h <= tile else math.ceil((h - tile) / stride) + 1
+            if nx * ny <= max_tiles:
+                break
+            tile = int(tile * 1.25)
+        xs = np.linspace(0, max(w - tile, 0), nx).round().astype(int)
+        ys = np.linspace(0, max(h - tile, 0), ny).round().astype(int)
+        return [
+            (int(x), int(y), int(min(x + tile, w)), int(min(y + tile, h)))
+            for y in ys
+            for x in xs
+        ]
+
+    def run_batch(self, batch, max_batch=8):
+        """Run ``batch`` through the session, one output list per image."""
+        batch_dim = self.session.get_inputs()[0].shape[0]
+        # Dynamic batch axes are reported as a name or None
+        step = batch_dim if isinstance(batch_dim, int) and batch_dim > 0 else max_batch
+        outputs = []
+        for start in range(0, len(batch), step):
+            preds = self.session.run(
+                None, {self.input_name: batch[start : start + step]}
+            )
+            outputs.extend(
+                [pred[i : i + 1] for pred in preds] for i in range(len(preds[0]))
+            )
+        return outputs
+
+    @staticmethod
+    def merge_tile_detections(boxes, masks, iou_threshold, ios_threshold):
+        """Greedy non-maximum merging of detections from overlapping tiles.
+
+        Same-class detections overlapping by IoU, or by intersection over the
+        smaller box (objects cut by a tile edge), are merged into the highest
+        scoring one: boxes are unioned and mask crops stitched together.
+        """
+        order = np.argsort(-boxes[:, 4])
+        boxes = boxes[order]
+        masks = [masks[i] for i in order]
+        x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+        areas = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+        used = np.zeros(len(boxes), dtype=bool)
+        merged_boxes, merged_masks = [], []
+        for i in range(len(boxes)):
+            if used[i]:
+                continue
+            inter = (np.minimum(x2[i], x2) - np.maximum(x1[i], x1)).clip(0) * (
+                np.minimum(y2[i], y2) - np.maximum(y1[i], y1)
+            ).clip(0)
+            iou = inter / (areas[i] + areas - inter + 1e-9)
+            ios = inter / (np.minimum(areas[i], areas) + 1e-9)
+            group = (
+                ~used
+                & (boxes[:, 5] == boxes[i, 5])
+                & ((iou > iou_threshold) | (ios > ios_threshold))
+            )
+            group[i] = True
+            used |= group
+            idx = np.flatnonzero(group)
+
+            box = boxes[i].copy()
+            box[:2] = x1[idx].min(), y1[idx].min()
+            box[2:4] = x2[idx].max(), y2[idx].max()
+            ox, oy = int(box[0]), int(box[1])
+            canvas = np.zeros(
+                (math.ceil(box[3]) - oy, math.ceil(box[2]) - ox), dtype=bool
+            )
+            for j in idx:
+                mask, mx, my = masks[j]
+                h, w = mask.shape
+                canvas[my - oy : my - oy + h, mx - ox : mx - ox + w] |= mask
+            merged_boxes.append(box)
+            merged_masks.append((canvas, ox, oy))
+        return np.array(merged_boxes), merged_masks
+
     def preprocess(self, img):
         shape = img.shape[:2]
         new_shape = (self.model_height, self.model_width)
@@ -170,15 +348,22 @@ class YOLOv8Seg:
             cls_int = int(cls_)
             color = self.color_palette(cls_int, bgr=True)  # Warna solid untuk BBOX
 
-            # Gambar contour segmentasi dengan garis putih sebagai border
-            cv2.polylines(
-                im_canvas, np.int32([segment]), True, (255, 255, 255), 3, cv2.LINE_AA
-            )
-            # Isi area segmentasi dengan warna dari palette
-            overlay = im_canvas.copy()
-            cv2.fillPoly(overlay, np.int32([segment]), color)
-            alpha = 0.4  # Transparansi
-            cv2.addWeighted(overlay, alpha, im_canvas, 1 - alpha, 0, im_canvas)
+            # Masks cropped away entirely have no contour to draw
+            if len(segment):
+                # Gambar contour segmentasi dengan garis putih sebagai border
+                cv2.polylines(
+                    im_canvas,
+                    np.int32([segment]),
+                    True,
+                    (255, 255, 255),
+                    3,
+                    cv2.LINE_AA,
+                )
+                # Isi area segmentasi dengan warna dari palette
+                overlay = im_canvas.copy()
+                cv2.fillPoly(overlay, np.int32([segment]), color)
+                alpha = 0.4  # Transparansi
+                cv2.addWeighted(overlay, alpha, im_canvas, 1 - alpha, 0, im_canvas)
 
             # Gambar bounding box dengan warna solid dan garis tebal
             cv2.rectangle(
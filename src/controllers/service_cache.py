@@ -0,0 +1,150 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import timezone
+from email.utils import format_datetime
+from fastapi import Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from config.database import get_db
+from config.models.article_model import Article
+from config.models.jenis_sampah_model import JenisSampah
+from config.models.sampah_cluster_model import SampahCluster
+from config.models.sampah_item_model import SampahItem
+from config.models.sampah_model import Sampah
+from config.models.table_version_model import TableVersion
+from config.models.user_model import User
+from src.controllers.service_response import FastJSONResponse
+
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", 5))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", 256))
+# Changes made by another worker process reach this one after at most the TTL
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.environ.get("PRINCIPAL_CACHE_MAX_ENTRIES", 1024))
+# Heatmap bodies are keyed by data version, so they can live much longer
+HEATMAP_CACHE_TTL_SECONDS = float(os.environ.get("HEATMAP_CACHE_TTL_SECONDS", 600))
+HEATMAP_CACHE_MAX_ENTRIES = int(os.environ.get("HEATMAP_CACHE_MAX_ENTRIES", 128))
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# Tables whose changes invalidate each family of cached responses
+SAMPAH_TABLES = (Sampah, SampahItem, JenisSampah)
+LEADERBOARD_TABLES = (Sampah, User)
+ARTICLE_TABLES = (Article,)
+CLUSTER_TABLES = (SampahCluster,)
+HEATMAP_TABLES = (Sampah,)
+
+response_cache = TTLCache(RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_ENTRIES)
+# Authenticated users by user id, see service_common.get_current_principal
+principal_cache = TTLCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_ENTRIES)
+heatmap_cache = TTLCache(HEATMAP_CACHE_TTL_SECONDS, HEATMAP_CACHE_MAX_ENTRIES)
+
+
+def get_data_version(db: Session, *models):
+    """Return (version, last_modified) for the given tables in one round trip.
+
+    The version is built from the per-table change counters that a trigger
+    bumps on every insert, update and delete (migration 0005). Unlike row
+    timestamps they always move forward, whichever clock the writer used.
+    """
+    names = [model.__tablename__ for model in models]
+    rows = db.execute(
+        select(
+            TableVersion.tableName, TableVersion.version, TableVersion.updatedAt
+        ).where(TableVersion.tableName.in_(names))
+    ).all()
+    found = {row.tableName: row for row in rows}
+
+    last_modified = max((row.updatedAt for row in rows), default=None)
+    version = "|".join(
+        f"{name}:{found[name].version if name in found else 0}" for name in names
+    )
+    return version, last_modified
+
+
+class ConditionalResponse:
+    """ETag based conditional GET with a short-lived in-process response cache."""
+
+    def __init__(self, request: Request, db: Session = Depends(get_db)):
+        self.request = request
+        self.db = db
+
+    def _etag(self, version: str, vary: str) -> str:
+        query = "&".join(
+            sorted(f"{k}={v}" for k, v in self.request.query_params.multi_items())
+        )
+        key = f"{self.request.url.path}?{query}#{vary}#{version}"
+        return f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()}"'
+
+    def _not_modified(self, etag: str) -> bool:
+        if_none_match = self.request.headers.get("if-none-match")
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    async def respond(self, models, build, vary: str = "", cache=None):
+        """Answer 304 or a cached body; ``cache`` defaults to response_cache."""
+        cache = response_cache if cache is None else cache
+        version, last_modified = get_data_version(self.db, *models)
+        etag = self._etag(version, vary)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if last_modified:
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+            headers["Last-Modified"] = format_datetime(
+                last_modified.astimezone(timezone.utc), usegmt=True
+            )
+
+        if self._not_modified(etag):
+            return Response(status_code=304, headers=headers)
+
+        body = cache.get(etag)
+        if body is None:
+            result = await build()
+            if isinstance(result, Response):
+                body = result.body
+            else:
+                body = FastJSONResponse(result).body
+            cache.set(etag, body)
+        return Response(content=body, media_type="application/json", headers=headers)
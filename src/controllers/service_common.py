@@ -1,18 +1,45 @@
+import asyncio
 import base64
+import hashlib
 import json
 import os
 import io
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import httpx
 from PIL import Image
 from typing_extensions import Annotated
-from fastapi import Depends, HTTPException, UploadFile, logger
+from fastapi import Depends, HTTPException, UploadFile
 from fastapi.security import OAuth2PasswordBearer
 from src.controllers.auth.controller_auth import AuthController
 from src.controllers.auth import service_jwt
-from config.schemas.common_schema import TokenData
+from src.controllers.service_cache import principal_cache
+from src.controllers.service_http import download_semaphore, get_http_client
+from src.controllers.service_metrics import track_executor_queue
+from src.controllers.service_storage import get_storage, storage_key
+from src.repositories.repository_user import UserRepository
+from config.schemas.common_schema import AuthenticatedUser, TokenData
 import datetime
 
 oauth2_scheme_user = OAuth2PasswordBearer(tokenUrl="/api/v1/login", scheme_name="JWT")
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_SIZE = int(os.environ.get("MAX_UPLOAD_SIZE_MB", 20)) * 1024 * 1024
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", 2))
+
+# Dedicated pool for image decoding/encoding so it never competes with the
+# default executor used by FastAPI for sync dependencies
+image_executor = ThreadPoolExecutor(
+    max_workers=IMAGE_WORKERS, thread_name_prefix="image"
+)
+track_executor_queue("image", image_executor)
+
+
+async def run_in_image_executor(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(image_executor, func, *args)
+
 
 def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme_user)],
@@ -21,6 +48,66 @@ def get_current_user(
     return TokenData.parse_obj(service_jwt.decode_access_token(token))
 
 
+async def get_current_principal(
+    token: Annotated[TokenData, Depends(get_current_user)],
+    user_repository: UserRepository = Depends(),
+):
+    """Resolve the token to its user record.
+
+    FastAPI runs the dependency once per request and the user is cached by id
+    for a short time, so most authenticated requests skip the users query.
+    The repository drops the entry when the user is deactivated or their
+    password changes.
+    """
+    user_id = int(token.userID)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = await user_repository.find_user_by_id(user_id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal = AuthenticatedUser(
+            userID=token.userID,
+            name=user.username,
+            role=user.role,
+            id=user.id,
+            email=user.email,
+            active=user.active,
+        )
+        principal_cache.set(user_id, principal)
+    if not principal.active:
+        raise HTTPException(status_code=401, detail="User is not active")
+    return principal
+
+
+def parse_bbox(bbox: str):
+    """Parse ``min_lon,min_lat,max_lon,max_lat`` into four floats."""
+    try:
+        values = [float(value) for value in bbox.split(",")]
+    except ValueError:
+        values = []
+    if (
+        len(values) != 4
+        or not -180 <= values[0] <= values[2] <= 180
+        or not -90 <= values[1] <= values[3] <= 90
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="bbox must be min_longitude,min_latitude,max_longitude,max_latitude",
+        )
+    return values
+
+
+def _save_as_jpeg(image: Image.Image, filename: str, folder: str):
+    # Convert RGBA to RGB mode for JPEG compatibility
+    if image.mode in ("RGBA", "LA"):
+        image = image.convert("RGB")
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    filename = f"{timestamp}_{filename}.jpg"
+    output_path = f"assets/{folder}/{filename}"
+    image.save(output_path, "JPEG", quality=85, optimize=True, progressive=True)
+    return output_path
+
+
 def insert_image_to_local_base64(
     image_data: str, filename: str, folder: str = "default"
 ):
@@ -30,17 +117,24 @@ def insert_image_to_local_base64(
         base64_string = image_data_dict["image_base64"]
         decoded_image = base64.b64decode(base64_string)
         image = Image.open(io.BytesIO(decoded_image))
-        # Convert RGBA to RGB mode for JPEG compatibility
-        if image.mode in ("RGBA", "LA"):
-            image = image.convert("RGB")
-        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-        filename = f"{timestamp}_{filename}.jpg"
-        output_path = f"assets/{folder}/{filename}"
-        image.save(output_path, "JPEG", quality=85, optimize=True, progressive=True)
-        return output_path
+        return _save_as_jpeg(image, filename, folder)
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail="Error saving image file")
+
+
+def reencode_image_to_local(source_path: str, filename: str, folder: str = "default"):
+    """Re-encode an already stored upload as JPEG and remove the source file."""
+    try:
+        with Image.open(source_path) as image:
+            output_path = _save_as_jpeg(image, filename, folder)
     except Exception as e:
         print(e)
         raise HTTPException(status_code=500, detail="Error saving image file")
+    finally:
+        if os.path.exists(source_path):
+            os.remove(source_path)
+    return output_path
 
 
 def insert_image_to_local(file: UploadFile, folder: str = "default"):
@@ -58,21 +152,137 @@ def insert_image_to_local(file: UploadFile, folder: str = "default"):
     return filename
 
 
-def delete_image_from_local(file_path: str):
+def sniff_image_type(head: bytes):
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp" and head[8:12] in (b"heic", b"heix", b"mif1", b"msf1"):
+        return "image/heic"
+    return None
+
+
+async def write_stream_to_local(
+    chunks, folder: str, filename: str, max_size: int = MAX_UPLOAD_SIZE
+):
+    """Stream ``chunks`` into ``assets/{folder}/`` without buffering.
+
+    The first bytes are sniffed before anything is kept, the size limit is
+    enforced while streaming and the SHA-256 is computed on the fly. Data is
+    written to a temporary file in the target folder and renamed into place,
+    so readers never see a partial image. The stored name is ``filename``
+    prefixed with the start of the digest, so different images uploaded under
+    the same name never overwrite each other. Returns the stored name.
+    """
+    tmp_path = f"assets/{folder}/.{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    f = await asyncio.to_thread(open, tmp_path, "wb")
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_size:
+                raise HTTPException(status_code=413, detail="Image file too large")
+            digest.update(chunk)
+            if head is not None:
+                # Hold back the first bytes until there are enough to sniff
+                head += chunk
+                if len(head) < 16:
+                    continue
+                if sniff_image_type(head) is None:
+                    raise HTTPException(
+                        status_code=415, detail="Unsupported image type"
+                    )
+                chunk, head = head, None
+            await asyncio.to_thread(f.write, chunk)
+        if head is not None:
+            if sniff_image_type(head) is None:
+                raise HTTPException(status_code=415, detail="Unsupported image type")
+            await asyncio.to_thread(f.write, head)
+        await asyncio.to_thread(f.close)
+        filename = f"{digest.hexdigest()[:16]}_{filename}"
+        await asyncio.to_thread(os.replace, tmp_path, f"assets/{folder}/{filename}")
+    except BaseException:
+        f.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return filename
+
+
+async def save_upload_to_local(
+    file: UploadFile, folder: str = "default", max_size: int = MAX_UPLOAD_SIZE
+):
+    if file.size is not None and file.size > max_size:
+        await file.close()
+        raise HTTPException(status_code=413, detail="Image file too large")
+    if file.content_type and not (
+        file.content_type.startswith("image/")
+        or file.content_type == "application/octet-stream"
+    ):
+        await file.close()
+        raise HTTPException(status_code=415, detail="Unsupported image type")
+
+    async def chunks():
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    filename = f"{timestamp}_{os.path.basename(file.filename)}"
+    try:
+        return await write_stream_to_local(chunks(), folder, filename, max_size)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail="Error saving image file")
+    finally:
+        await file.close()
+
+
+async def download_image_to_local(
+    image_url: str, folder: str = "default", max_size: int = MAX_UPLOAD_SIZE
+):
+    filename = os.path.basename(urlparse(image_url).path)
+    async with download_semaphore:
+        try:
+            async with get_http_client().stream("GET", image_url) as response:
+                if response.status_code != 200:
+                    raise HTTPException(
+                        status_code=response.status_code,
+                        detail="Failed to download image",
+                    )
+                content_length = response.headers.get("content-length")
+                if content_length and int(content_length) > max_size:
+                    raise HTTPException(status_code=413, detail="Image file too large")
+                filename = await write_stream_to_local(
+                    response.aiter_bytes(UPLOAD_CHUNK_SIZE), folder, filename, max_size
+                )
+        except httpx.TimeoutException:
+            raise HTTPException(status_code=504, detail="Timed out downloading image")
+        except httpx.RequestError:
+            raise HTTPException(status_code=502, detail="Failed to download image")
+    return f"assets/{folder}/{filename}"
+
+
+def delete_image(file_path: str):
     try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        get_storage().delete(storage_key(os.path.normpath(file_path)))
         return {"detail": "File deleted successfully"}
-    except OSError as e:
-        logger.error(f"Error deleting image file: {e}")
+    except Exception as e:
+        print(f"Error deleting image file: {e}")
         raise HTTPException(status_code=500, detail="Error deleting image file")
 
 
 def get_image_from_image_path(image_path: str) -> str:
     try:
-        normalized_path = os.path.normpath(image_path)
-        with open(normalized_path, "rb") as image_file:
-            image_data = image_file.read()
+        image_data = get_storage().read(storage_key(os.path.normpath(image_path)))
         base64_encoded_data = base64.b64encode(image_data).decode("utf-8")
         return base64_encoded_data
     except FileNotFoundError:
@@ -0,0 +1,51 @@
+import io
+from typing import Literal
+from PIL import Image, ImageOps
+from src.controllers.service_common import image_executor
+from src.controllers.service_storage import get_storage, storage_key
+
+# Longest side in pixels of every derivative; None keeps the original size
+DERIVATIVE_SIZES = {"thumb": 256, "medium": 1024, "full": None}
+# Query parameter type, so unknown sizes are rejected with 422
+ImageSize = Literal[tuple(DERIVATIVE_SIZES)]
+DERIVATIVE_FORMATS = {
+    "jpeg": ("jpg", "JPEG", "image/jpeg", {"quality": 80, "progressive": True}),
+    "webp": ("webp", "WEBP", "image/webp", {"quality": 80, "method": 4}),
+}
+
+
+def derivative_key(key: str, size: str, fmt: str) -> str:
+    # The original extension stays, x.png and x.jpg must not share variants
+    folder, _, name = key.partition("/")
+    return f"{folder}/{size}/{name}.{DERIVATIVE_FORMATS[fmt][0]}"
+
+
+def generate_derivatives(key: str):
+    storage = get_storage()
+    with Image.open(io.BytesIO(storage.read(key))) as source:
+        image = ImageOps.exif_transpose(source).convert("RGB")
+
+    # Largest first, so every smaller variant is resampled from fewer pixels
+    for size, max_side in sorted(
+        DERIVATIVE_SIZES.items(), key=lambda item: -(item[1] or float("inf"))
+    ):
+        if max_side is not None:
+            image.thumbnail((max_side, max_side), Image.LANCZOS)
+        for fmt, (_, pil_format, content_type, options) in DERIVATIVE_FORMATS.items():
+            buffer = io.BytesIO()
+            image.save(buffer, pil_format, **options)
+            storage.put_bytes(
+                buffer.getvalue(), derivative_key(key, size, fmt), content_type
+            )
+
+
+def _generate_derivatives_safely(key: str):
+    try:
+        generate_derivatives(key)
+    except Exception as e:
+        print(f"Error generating derivatives for {key}: {e}")
+
+
+def schedule_derivatives(path: str):
+    """Queue derivative generation for a stored image off the request path."""
+    return image_executor.submit(_generate_derivatives_safely, storage_key(path))
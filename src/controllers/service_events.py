@@ -0,0 +1,251 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+import psycopg2
+from sqlalchemy import text
+from config.database import engine
+
+# Relay events through Postgres NOTIFY so every worker process sees them;
+# without it only subscribers of the publishing process are notified
+EVENTS_PG_NOTIFY = os.environ.get("EVENTS_PG_NOTIFY", "false").lower() == "true"
+EVENTS_CHANNEL = os.environ.get("EVENTS_CHANNEL", "sampah_events")
+EVENTS_QUEUE_SIZE = int(os.environ.get("EVENTS_QUEUE_SIZE", 100))
+EVENTS_HEARTBEAT_SECONDS = float(os.environ.get("EVENTS_HEARTBEAT_SECONDS", 15))
+# Upper bound of the exponential backoff while the LISTEN connection is down
+EVENTS_RECONNECT_MAX_SECONDS = float(
+    os.environ.get("EVENTS_RECONNECT_MAX_SECONDS", 30)
+)
+
+logger = logging.getLogger("sampah.events")
+
+
+class Subscription:
+    def __init__(self, bbox=None, queue_size: int = EVENTS_QUEUE_SIZE):
+        self.bbox = bbox
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+    def matches(self, event: dict) -> bool:
+        if self.bbox is None or "latitude" not in event:
+            return True
+        min_longitude, min_latitude, max_longitude, max_latitude = self.bbox
+        return (
+            min_longitude <= event["longitude"] <= max_longitude
+            and min_latitude <= event["latitude"] <= max_latitude
+        )
+
+    def offer(self, event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client fell behind
+            self.resync()
+
+    def resync(self) -> None:
+        """Drop what is queued and ask the client to reload."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait({"type": "resync"})
+
+
+class EventBroker:
+    """In-process fan-out of change events to the subscribed streams.
+
+    Must only be used from the event loop.
+    """
+
+    def __init__(self):
+        self._subscriptions = set()
+
+    def subscribe(self, bbox=None) -> Subscription:
+        subscription = Subscription(bbox)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def publish(self, event: dict) -> None:
+        for subscription in list(self._subscriptions):
+            if subscription.matches(event):
+                subscription.offer(event)
+
+    def resync(self) -> None:
+        """Ask every client to reload, e.g. after events may have been lost."""
+        for subscription in list(self._subscriptions):
+            subscription.resync()
+
+    def close(self) -> None:
+        """End every stream, e.g. on shutdown."""
+        for subscription in list(self._subscriptions):
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(None)
+        self._subscriptions.clear()
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+
+broker = EventBroker()
+_listener = None
+_listener_fd = None
+_reconnect_task = None
+
+
+def sampah_event(
+    event_type: str,
+    sampah_id: int,
+    latitude: float,
+    longitude: float,
+    is_garbage_pile: bool,
+    is_pickup: bool,
+) -> dict:
+    return {
+        "type": event_type,
+        "id": sampah_id,
+        "latitude": latitude,
+        "longitude": longitude,
+        "is_garbage_pile": is_garbage_pile,
+        "is_pickup": is_pickup,
+        "at": datetime.now().isoformat(),
+    }
+
+
+def publish_event(event: dict) -> None:
+    """Deliver ``event`` to subscribers; failures never fail the caller."""
+    if not EVENTS_PG_NOTIFY:
+        broker.publish(event)
+        return
+    try:
+        # The listener of every process, this one included, delivers it
+        with engine.begin() as connection:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": EVENTS_CHANNEL, "payload": json.dumps(event)},
+            )
+    except Exception:
+        logger.exception("Publishing event %s failed", event.get("type"))
+        broker.publish(event)
+
+
+def _drain_notifications(connection) -> None:
+    try:
+        connection.poll()
+    except psycopg2.Error:
+        # The socket stays readable after the server went away, so the reader
+        # must go before anything else
+        logger.warning("Lost the events LISTEN connection, reconnecting")
+        _close_listener()
+        broker.resync()
+        _start_reconnect()
+        return
+    while connection.notifies:
+        notification = connection.notifies.pop(0)
+        try:
+            broker.publish(json.loads(notification.payload))
+        except ValueError:
+            logger.warning("Ignoring malformed event %r", notification.payload)
+
+
+def _connect_listener():
+    pooled = engine.raw_connection()
+    pooled.detach()
+    connection = pooled.driver_connection
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute(f'LISTEN "{EVENTS_CHANNEL}"')
+    return connection
+
+
+def _watch(connection) -> None:
+    global _listener, _listener_fd
+    # Keep the descriptor, fileno() raises once the connection is broken
+    _listener_fd = connection.fileno()
+    asyncio.get_running_loop().add_reader(
+        _listener_fd, _drain_notifications, connection
+    )
+    _listener = connection
+
+
+def _close_listener() -> None:
+    global _listener, _listener_fd
+    if _listener is None:
+        return
+    asyncio.get_running_loop().remove_reader(_listener_fd)
+    try:
+        _listener.close()
+    except psycopg2.Error:
+        pass
+    _listener = _listener_fd = None
+
+
+async def _reconnect() -> None:
+    delay = 1
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            connection = await asyncio.to_thread(_connect_listener)
+        except Exception as e:
+            logger.warning("Events LISTEN reconnect failed: %s", e)
+            delay = min(delay * 2, EVENTS_RECONNECT_MAX_SECONDS)
+            continue
+        _watch(connection)
+        # Events published while disconnected never arrived here
+        broker.resync()
+        logger.info("Events LISTEN connection restored")
+        return
+
+
+def _start_reconnect() -> None:
+    global _reconnect_task
+    if _reconnect_task is None or _reconnect_task.done():
+        _reconnect_task = asyncio.get_running_loop().create_task(_reconnect())
+
+
+def start_event_listener() -> None:
+    """LISTEN on the events channel when EVENTS_PG_NOTIFY is enabled.
+
+    Must be called from the event loop. The connection is taken out of the
+    pool and watched with ``add_reader``, so no thread is needed. A lost
+    connection is re-established with backoff and clients are told to resync.
+    """
+    if not EVENTS_PG_NOTIFY or _listener is not None:
+        return
+    try:
+        _watch(_connect_listener())
+    except Exception as e:
+        logger.warning("Events LISTEN connection failed: %s", e)
+        _start_reconnect()
+
+
+def stop_event_listener() -> None:
+    global _reconnect_task
+    broker.close()
+    if _reconnect_task is not None:
+        _reconnect_task.cancel()
+        _reconnect_task = None
+    _close_listener()
+
+
+async def event_stream(subscription: Subscription):
+    """Server-sent events for ``subscription`` with periodic heartbeats."""
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Comments keep proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            if event["type"] == "resync":
+                return
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,34 @@
+import asyncio
+import os
+import httpx
+
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", 10))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 20))
+IMAGE_DOWNLOAD_CONCURRENCY = int(os.environ.get("IMAGE_DOWNLOAD_CONCURRENCY", 8))
+
+# Caps concurrent remote image downloads per worker
+download_semaphore = asyncio.Semaphore(IMAGE_DOWNLOAD_CONCURRENCY)
+
+_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS // 2,
+            ),
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
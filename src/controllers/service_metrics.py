@@ -0,0 +1,235 @@
+import functools
+import inspect
+import logging
+import os
+import time
+import uuid
+from contextvars import ContextVar
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+
+LOG_TRACE_IDS = os.environ.get("LOG_TRACE_IDS", "false").lower() == "true"
+TRACE_ID_HEADER = "X-Request-ID"
+
+# Upload stages range from sub-millisecond lookups to multi-second inference
+STAGE_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+STAGE_DURATION = Histogram(
+    "sampah_stage_duration_seconds",
+    "Duration of each stage of the sampah pipelines",
+    ["pipeline", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+INFERENCE_DURATION = Histogram(
+    "yolo_inference_stage_duration_seconds",
+    "Duration of YOLOv8Seg preprocess, session.run and postprocess",
+    ["model", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=STAGE_BUCKETS,
+)
+STAGE_ERRORS = Counter(
+    "sampah_stage_errors_total",
+    "Stages that ended with an exception",
+    ["pipeline", "stage"],
+)
+
+trace_id_var: ContextVar[str] = ContextVar("trace_id", default="-")
+logger = logging.getLogger("sampah.metrics")
+
+
+class stage_timer:
+    """Time a block or function into ``sampah_stage_duration_seconds``.
+
+    Usable as ``with stage_timer("inference"):`` or as a decorator on sync
+    and async functions.
+    """
+
+    def __init__(self, stage: str, pipeline: str = "upload"):
+        self.stage = stage
+        self.pipeline = pipeline
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        STAGE_DURATION.labels(self.pipeline, self.stage).observe(elapsed)
+        if exc_type is not None:
+            STAGE_ERRORS.labels(self.pipeline, self.stage).inc()
+        logger.debug("%s.%s took %.1f ms", self.pipeline, self.stage, elapsed * 1000)
+        return False
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer(self.stage, self.pipeline):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(self.stage, self.pipeline):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+# Collectors that read this process' state at scrape time. The multiprocess
+# collector only aggregates samples written to PROMETHEUS_MULTIPROC_DIR, so
+# render_metrics adds these next to it.
+_local_collectors = []
+
+
+def register_local_collector(collector):
+    REGISTRY.register(collector)
+    _local_collectors.append(collector)
+
+
+class ExecutorQueueCollector:
+    """Expose the backlog of the tracked thread pools at scrape time."""
+
+    def __init__(self):
+        self.executors = {}
+
+    def collect(self):
+        depth = GaugeMetricFamily(
+            "executor_queue_depth",
+            "Tasks waiting in a background thread pool",
+            labels=["executor"],
+        )
+        for name, executor in self.executors.items():
+            depth.add_metric([name], executor._work_queue.qsize())
+        yield depth
+
+
+executor_queues = ExecutorQueueCollector()
+register_local_collector(executor_queues)
+
+
+def track_executor_queue(name: str, executor):
+    """Report the backlog of a ThreadPoolExecutor at scrape time."""
+    executor_queues.executors[name] = executor
+
+
+class ModelCollector:
+    """Expose loaded model versions and in-flight requests at scrape time."""
+
+    def __init__(self, get_status):
+        # Not named ``describe``: prometheus_client treats that as a method
+        self.get_status = get_status
+
+    def collect(self):
+        info = GaugeMetricFamily(
+            "yolo_model_info",
+            "Model versions known to the registry (1 = loaded)",
+            labels=["model", "version", "role", "input_shape"],
+        )
+        in_flight = GaugeMetricFamily(
+            "yolo_model_in_flight",
+            "Requests currently using the active model version",
+            labels=["model", "version"],
+        )
+        for name, status in self.get_status().items():
+            shape = "x".join(str(x) for x in status.get("input_shape", []))
+            info.add_metric(
+                [name, status["active_version"], "active", shape],
+                1 if status["loaded"] else 0,
+            )
+            if status.get("shadow_version"):
+                info.add_metric([name, status["shadow_version"], "shadow", ""], 1)
+            if status["loaded"]:
+                in_flight.add_metric(
+                    [name, status["active_version"]], status["in_flight"]
+                )
+        yield info
+        yield in_flight
+
+
+class TraceIdFilter(logging.Filter):
+    def filter(self, record):
+        record.trace_id = trace_id_var.get()
+        return True
+
+
+def configure_logging():
+    if not LOG_TRACE_IDS:
+        return
+    handler = logging.StreamHandler()
+    handler.addFilter(TraceIdFilter())
+    handler.setFormatter(
+        logging.Formatter(
+            "%(asctime)s %(levelname)s [%(trace_id)s] %(name)s %(message)s"
+        )
+    )
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+
+async def metrics_middleware(request, call_next):
+    """Assign a trace ID to the request and record its latency by route."""
+    trace_id = request.headers.get(TRACE_ID_HEADER) or uuid.uuid4().hex
+    token = trace_id_var.set(trace_id)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers[TRACE_ID_HEADER] = trace_id
+        return response
+    finally:
+        # Label by route template, not raw path, to keep cardinality bounded
+        route = request.scope.get("route")
+        REQUEST_DURATION.labels(
+            request.method,
+            getattr(route, "path", "unmatched"),
+            str(status),
+        ).observe(time.perf_counter() - start)
+        trace_id_var.reset(token)
+
+
+def render_metrics():
+    """Return ``(body, content_type)`` for the /metrics endpoint."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Aggregate the samples of every worker process
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        # Queue depths and model state describe the worker answering the
+        # scrape, not the sum over workers
+        for collector in _local_collectors:
+            registry.register(collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from fastapi.responses import JSONResponse
+from prometheus_client import Histogram
+from sqlalchemy import event
+
+QUERY_PROFILER_HEADERS = (
+    os.environ.get("QUERY_PROFILER_HEADERS", "false").lower() == "true"
+)
+# Maximum queries per request (0 disables); QUERY_BUDGETS overrides it per
+# route template, e.g. {"/api/v1/stackholder/sampah": 5}
+QUERY_BUDGET = int(os.environ.get("QUERY_BUDGET", 0))
+QUERY_BUDGETS = json.loads(os.environ.get("QUERY_BUDGETS", "{}"))
+# In strict mode a request over budget answers 500 so that test runs fail
+QUERY_BUDGET_STRICT = os.environ.get("QUERY_BUDGET_STRICT", "false").lower() == "true"
+
+QUERY_COUNT = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per request",
+    ["route"],
+    buckets=(1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+QUERY_TIME = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL per request",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DUPLICATE_QUERIES = Histogram(
+    "db_duplicate_queries_per_request",
+    "Repeated executions of the same SQL statement per request",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50),
+)
+
+logger = logging.getLogger("sampah.queries")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.statements = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float):
+        # Repositories may run inside worker threads that share this object
+        with self._lock:
+            self.count += 1
+            self.total_time += elapsed
+            self.statements[statement] += 1
+
+    @property
+    def duplicates(self) -> int:
+        return sum(n - 1 for n in self.statements.values() if n > 1)
+
+    def most_repeated(self, limit: int = 3):
+        return [
+            (n, " ".join(statement.split())[:200])
+            for statement, n in self.statements.most_common(limit)
+            if n > 1
+        ]
+
+
+query_stats_var: ContextVar = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - context._query_started_at)
+
+
+def install_query_profiler(engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def budget_for(route: str) -> int:
+    return QUERY_BUDGETS.get(route, QUERY_BUDGET)
+
+
+@contextmanager
+def query_budget(limit: int):
+    """Raise QueryBudgetExceeded when the block runs more than ``limit`` queries.
+
+    Meant for tests and scripts::
+
+        with query_budget(3) as stats:
+            await repository.pickup_garbage(token, 1, path)
+    """
+    stats = QueryStats()
+    token = query_stats_var.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats_var.reset(token)
+    if stats.count > limit:
+        raise QueryBudgetExceeded(
+            f"{stats.count} queries (budget {limit}), repeated: "
+            f"{stats.most_repeated()}"
+        )
+
+
+async def query_profiler_middleware(request, call_next):
+    """Count the SQL statements of each request and enforce the query budget."""
+    stats = QueryStats()
+    token = query_stats_var.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        query_stats_var.reset(token)
+
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    QUERY_COUNT.labels(route).observe(stats.count)
+    QUERY_TIME.labels(route).observe(stats.total_time)
+    DUPLICATE_QUERIES.labels(route).observe(stats.duplicates)
+
+    budget = budget_for(route)
+    if budget and stats.count > budget:
+        logger.warning(
+            "%s %s ran %d queries (budget %d), repeated: %s",
+            request.method,
+            route,
+            stats.count,
+            budget,
+            stats.most_repeated(),
+        )
+        if QUERY_BUDGET_STRICT:
+            response = JSONResponse(
+                status_code=500,
+                content={
+                    "detail": "Query budget exceeded",
+                    "queries": stats.count,
+                    "budget": budget,
+                    "repeated": stats.most_repeated(),
+                },
+            )
+
+    if QUERY_PROFILER_HEADERS:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Query-Time-Ms"] = f"{stats.total_time * 1000:.1f}"
+        response.headers["X-DB-Duplicate-Queries"] = str(stats.duplicates)
+    return response
@@ -0,0 +1,28 @@
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj):
+    # Pydantic models are dumped without re-validation; datetimes, UUIDs and
+    # numpy values nested inside them are handled natively by orjson.
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
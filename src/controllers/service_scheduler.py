@@ -0,0 +1,45 @@
+import asyncio
+import logging
+from src.controllers.service_metrics import stage_timer
+
+logger = logging.getLogger("sampah.scheduler")
+
+_tasks = {}
+
+
+async def _run_periodically(name: str, interval: float, job, initial_delay: float):
+    await asyncio.sleep(initial_delay)
+    while True:
+        try:
+            with stage_timer(name, pipeline="scheduler"):
+                await job()
+        except Exception:
+            # Keep the schedule alive, the next run may well succeed
+            logger.exception("Scheduled job %s failed", name)
+        await asyncio.sleep(interval)
+
+
+def schedule_periodic(name: str, interval: float, job, initial_delay: float = 0):
+    """Run the coroutine function ``job`` every ``interval`` seconds.
+
+    Must be called from the event loop, typically in a startup handler. An
+    interval of 0 or less disables the job. Each worker process runs its own
+    schedule, so jobs should skip work another worker has already done.
+    """
+    if interval <= 0:
+        return None
+    task = _tasks.get(name)
+    if task is None or task.done():
+        task = asyncio.create_task(
+            _run_periodically(name, interval, job, initial_delay), name=name
+        )
+        _tasks[name] = task
+    return task
+
+
+async def stop_scheduler():
+    tasks = list(_tasks.values())
+    _tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
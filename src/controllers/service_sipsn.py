@@ -1,11 +1,77 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timedelta
 import httpx
 from bs4 import BeautifulSoup
 from fastapi import HTTPException
+from config.database import SessionLocal
 from config.schemas.sipsn_schema import TPS3RRequest
+from src.controllers.service_cache import TTLCache
+from src.controllers.service_http import get_http_client
+from src.repositories.repository_tps_facility import TpsFacilityRepository
 
+SIPSN_MARKER_URL = "https://sipsn.menlhk.go.id/sipsn/public/home/getMarker"
+# Stored sources older than this are fetched again by the background sync,
+# which looks for them every SIPSN_SYNC_CHECK_SECONDS (0 disables the sync)
+SIPSN_SYNC_INTERVAL_SECONDS = float(
+    os.environ.get("SIPSN_SYNC_INTERVAL_SECONDS", 6 * 60 * 60)
+)
+SIPSN_SYNC_CHECK_SECONDS = float(os.environ.get("SIPSN_SYNC_CHECK_SECONDS", 600))
+# Request bodies to keep synced even before anyone asked for them, e.g.
+# [{"dd_propinsi": "31"}]
+SIPSN_SYNC_SOURCES = json.loads(os.environ.get("SIPSN_SYNC_SOURCES", "[]"))
+SIPSN_CACHE_TTL_SECONDS = float(os.environ.get("SIPSN_CACHE_TTL_SECONDS", 300))
 
-async def fetch_tps3r_data(request_data: TPS3RRequest):
-    url = "https://sipsn.menlhk.go.id/sipsn/public/home/getMarker"
+# /tps responses by source key
+tps_cache = TTLCache(SIPSN_CACHE_TTL_SECONDS, max_entries=64)
+logger = logging.getLogger("sampah.sipsn")
+
+
+def source_key(request_data: TPS3RRequest) -> str:
+    return json.dumps(request_data.dict(), sort_keys=True)
+
+
+def parse_markers(response_data: dict):
+    """Turn a getMarker response into facility dicts.
+
+    Markers without usable coordinates are skipped, and a marker id repeated
+    in the response is only kept the first time.
+    """
+    markers = response_data.get("markers", [])
+    infowin = response_data.get("infowin", [])
+
+    result = []
+    seen = set()
+    for marker, info in zip(markers, infowin):
+        try:
+            latitude, longitude = float(marker[1]), float(marker[2])
+        except (TypeError, ValueError):
+            continue
+        sipsn_id = str(marker[5])
+        if sipsn_id in seen:
+            continue
+        seen.add(sipsn_id)
+        soup = BeautifulSoup(info[0], "html.parser")
+        address_parts = [line.strip() for line in soup.stripped_strings]
+        full_address = " ".join(address_parts).split("Lat:")[0].strip()
+
+        result.append(
+            {
+                "name": marker[0],
+                "latitude": latitude,
+                "longitude": longitude,
+                "icon_url": marker[3],
+                "facility_type": marker[4],
+                "id": sipsn_id,
+                "address": full_address,
+            }
+        )
+    return result
+
+
+async def fetch_markers(request_data: TPS3RRequest) -> dict:
     headers = {
         "X-Requested-With": "XMLHttpRequest",
         "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
@@ -19,36 +85,71 @@ async def fetch_tps3r_data(request_data: TPS3RRequest):
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, data=form_data, headers=headers)
-            response.raise_for_status()
-
-        response_data = response.json()
-        markers = response_data.get("markers", [])
-        infowin = response_data.get("infowin", [])
-
-        result = []
-        for marker, info in zip(markers, infowin):
-            soup = BeautifulSoup(info[0], "html.parser")
-            address_parts = [line.strip() for line in soup.stripped_strings]
-            full_address = " ".join(address_parts).split("Lat:")[0].strip()
-
-            result.append(
-                {
-                    "name": marker[0],
-                    "latitude": marker[1],
-                    "longitude": marker[2],
-                    "icon_url": marker[3],
-                    "facility_type": marker[4],
-                    "id": marker[5],
-                    "address": full_address,
-                }
-            )
-        return result
-
+        response = await get_http_client().post(
+            SIPSN_MARKER_URL, data=form_data, headers=headers
+        )
+        response.raise_for_status()
+        return response.json()
     except httpx.RequestError as e:
         raise HTTPException(status_code=500, detail=f"Request error: {e}")
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code, detail=f"HTTP error: {e.response.text}"
         )
+
+
+async def sync_source(
+    repository: TpsFacilityRepository,
+    request_data: TPS3RRequest,
+    response_data: dict = None,
+):
+    """Store the facilities of one request, fetching them unless given.
+
+    Passing a recorded ``response_data`` makes the sync reproducible offline.
+    Returns ``(facilities, stored)``; ``stored`` is False when another worker
+    was rewriting the source and nothing was written.
+    """
+    if response_data is None:
+        response_data = await fetch_markers(request_data)
+    # Parsing thousands of infowindows is CPU bound
+    facilities = await asyncio.to_thread(parse_markers, response_data)
+    key = source_key(request_data)
+    stored = await asyncio.to_thread(repository.replace_source, key, facilities)
+    if stored:
+        tps_cache.delete(key)
+    return facilities, stored
+
+
+async def sync_stale_sources():
+    """Refresh configured sources and stored sources older than the interval.
+
+    Sources another worker refreshed recently are skipped.
+    """
+    db = SessionLocal()
+    try:
+        repository = TpsFacilityRepository(db)
+        synced_before = datetime.now() - timedelta(
+            seconds=SIPSN_SYNC_INTERVAL_SECONDS
+        )
+        keys = set(await repository.get_stale_sources(synced_before))
+        for source in SIPSN_SYNC_SOURCES:
+            key = source_key(TPS3RRequest(**source))
+            synced_at = await repository.get_synced_at(key)
+            if synced_at is None or synced_at < synced_before:
+                keys.add(key)
+
+        for key in sorted(keys):
+            try:
+                facilities, stored = await sync_source(
+                    repository, TPS3RRequest(**json.loads(key))
+                )
+                if stored:
+                    logger.info(
+                        "Synced %d SIPSN facilities for %s", len(facilities), key
+                    )
+                else:
+                    logger.info("Skipped %s, another worker is syncing it", key)
+            except HTTPException as e:
+                logger.warning("SIPSN sync failed for %s: %s", key, e.detail)
+    finally:
+        db.close()
@@ -0,0 +1,220 @@
+import asyncio
+import mimetypes
+import os
+from functools import lru_cache
+from urllib.parse import urlencode
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import RedirectResponse
+from fastapi.staticfiles import StaticFiles
+
+load_dotenv(".env")
+
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "local")
+PUBLIC_BASE_URL = os.environ.get(
+    "PUBLIC_BASE_URL", "https://jjmbm5rz-8000.asse.devtunnels.ms"
+).rstrip("/")
+LOCAL_STORAGE_ROOT = "assets"
+
+# Public route of every image folder, shared by all storage backends
+FOLDER_ROUTES = {
+    "garbage_image": "/garbage-image",
+    "detected_image": "/detected-image",
+    "pickup_image": "/evidence",
+    "article": "/article-image",
+}
+
+
+def storage_key(path: str) -> str:
+    """Map a stored path such as ``assets/garbage_image/a.jpg`` to its key."""
+    path = path.replace("\\", "/")
+    prefix = f"{LOCAL_STORAGE_ROOT}/"
+    return path[len(prefix) :] if path.startswith(prefix) else path
+
+
+def route_url(key: str) -> str:
+    folder, _, name = key.partition("/")
+    return f"{PUBLIC_BASE_URL}{FOLDER_ROUTES.get(folder, '/' + folder)}/{name}"
+
+
+def sized_url(key: str, size: str, fmt: str = None) -> str:
+    params = {"size": size}
+    if fmt:
+        params["format"] = fmt
+    return f"{PUBLIC_BASE_URL}/api/v1/image/{key}?{urlencode(params)}"
+
+
+class LocalStorage:
+    """Images stored under ``assets/`` and served by StaticFiles mounts."""
+
+    def __init__(self, root: str = LOCAL_STORAGE_ROOT):
+        self.root = root
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def put_file(self, local_path: str, key: str, content_type: str = None):
+        target = self.local_path(key)
+        if os.path.abspath(local_path) != os.path.abspath(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(local_path, target)
+        return key
+
+    def put_bytes(self, data: bytes, key: str, content_type: str = None):
+        target = self.local_path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(data)
+        return key
+
+    def read(self, key: str) -> bytes:
+        with open(self.local_path(key), "rb") as f:
+            return f.read()
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.local_path(key))
+
+    def delete(self, key: str):
+        if self.exists(key):
+            os.remove(self.local_path(key))
+
+    def url(self, key: str) -> str:
+        return route_url(key)
+
+    def download_url(self, key: str) -> str:
+        return route_url(key)
+
+    def mount(self, app: FastAPI):
+        for folder, route in FOLDER_ROUTES.items():
+            directory = self.local_path(folder)
+            os.makedirs(directory, exist_ok=True)
+            app.mount(route, StaticFiles(directory=directory), name=folder)
+
+
+class S3Storage:
+    """Images stored in an S3-compatible bucket (AWS S3, MinIO, ...).
+
+    Image routes answer with a redirect to a presigned URL, so image bytes
+    never pass through the API process. When ``S3_PUBLIC_URL`` points at a
+    public bucket or CDN, listings link to it directly instead.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str = None,
+        region: str = None,
+        public_url: str = None,
+        url_expires: int = 3600,
+    ):
+        # boto3 is only required when the s3 backend is enabled
+        import boto3
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.url_expires = url_expires
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        )
+
+    @staticmethod
+    def _content_type(key: str, content_type: str = None) -> str:
+        if content_type:
+            return content_type
+        return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+    def put_file(self, local_path: str, key: str, content_type: str = None):
+        self.client.upload_file(
+            local_path,
+            self.bucket,
+            key,
+            ExtraArgs={"ContentType": self._content_type(key, content_type)},
+        )
+        os.remove(local_path)
+        return key
+
+    def put_bytes(self, data: bytes, key: str, content_type: str = None):
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=self._content_type(key, content_type),
+        )
+        return key
+
+    def read(self, key: str) -> bytes:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError:
+            return False
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def presigned_url(self, key: str) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=self.url_expires,
+        )
+
+    def url(self, key: str) -> str:
+        if self.public_url:
+            return f"{self.public_url}/{key}"
+        return route_url(key)
+
+    def download_url(self, key: str) -> str:
+        if self.public_url:
+            return f"{self.public_url}/{key}"
+        return self.presigned_url(key)
+
+    def _redirect(self, folder: str):
+        def redirect(name: str):
+            if ".." in name.split("/"):
+                raise HTTPException(status_code=404, detail="Image not found")
+            return RedirectResponse(self.presigned_url(f"{folder}/{name}"))
+
+        return redirect
+
+    def mount(self, app: FastAPI):
+        for folder, route in FOLDER_ROUTES.items():
+            app.add_api_route(
+                f"{route}/{{name:path}}",
+                self._redirect(folder),
+                methods=["GET"],
+                include_in_schema=False,
+            )
+
+
+@lru_cache
+def get_storage():
+    if STORAGE_BACKEND == "s3":
+        return S3Storage(
+            bucket=os.environ.get("S3_BUCKET"),
+            endpoint_url=os.environ.get("S3_ENDPOINT_URL"),
+            region=os.environ.get("S3_REGION"),
+            public_url=os.environ.get("S3_PUBLIC_URL"),
+            url_expires=int(os.environ.get("S3_URL_EXPIRES_SECONDS", 3600)),
+        )
+    return LocalStorage()
+
+
+def image_url(path: str, size: str = None) -> str:
+    if size and size != "full":
+        return sized_url(storage_key(path), size)
+    return get_storage().url(storage_key(path))
+
+
+async def publish_file(path: str):
+    """Hand a file written under ``assets/`` over to the configured storage."""
+    await asyncio.to_thread(get_storage().put_file, path, storage_key(path))
@@ -0,0 +1,54 @@
+from typing import Optional
+from fastapi import Depends, HTTPException
+from config.schemas.sipsn_schema import (
+    NearestTPSFacility,
+    TPS3RRequest,
+    TPSFacility,
+)
+from src.controllers.service_sipsn import source_key, sync_source, tps_cache
+from src.repositories.repository_tps_facility import TpsFacilityRepository
+
+
+class SipsnController:
+    def __init__(self, tps_repository: TpsFacilityRepository = Depends()):
+        self.tps_repository = tps_repository
+
+    async def get_tps(self, request_data: TPS3RRequest):
+        key = source_key(request_data)
+        result = tps_cache.get(key)
+        if result is not None:
+            return result
+
+        rows = await self.tps_repository.get_by_source(key)
+        if rows:
+            result = [TPSFacility(**row._mapping) for row in rows]
+        else:
+            # First request for these parameters (or SIPSN had none), the
+            # background sync keeps them fresh from now on
+            facilities, _ = await sync_source(self.tps_repository, request_data)
+            result = [TPSFacility(**facility) for facility in facilities]
+        tps_cache.set(key, result)
+        return result
+
+    async def get_nearest_tps(
+        self,
+        k: int,
+        sampah_id: Optional[int],
+        latitude: Optional[float],
+        longitude: Optional[float],
+        facility_type: Optional[str],
+    ):
+        if sampah_id is not None:
+            rows = await self.tps_repository.find_nearest_to_sampah(
+                sampah_id, k, facility_type
+            )
+        elif latitude is not None and longitude is not None:
+            rows = await self.tps_repository.find_nearest(
+                longitude, latitude, k, facility_type
+            )
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Either sampah_id or latitude and longitude is required",
+            )
+        return [NearestTPSFacility(**row._mapping) for row in rows]
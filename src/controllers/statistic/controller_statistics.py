@@ -3,7 +3,6 @@ from fastapi import Depends, HTTPException
 from src.repositories.repository_sampah import SampahRepository
 from src.repositories.repository_user import UserRepository
 from src.repositories.repository_statistic import StatisticRepository
-import pandas as pd
 import io
 from datetime import datetime
 from fastapi.responses import StreamingResponse
@@ -75,6 +74,9 @@ class StatisticController:
         search: str,
         user: bool,
     ):
+        # pandas is only needed for exports, keep it out of application startup
+        import pandas as pd
+
         try:
             result = await self.statistic_repository.get_data_statistic_sheet(
                 token,
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from config.schemas.article_schema import OutputArticle
-from src.controllers.service_common import delete_image_from_local
+from src.controllers.service_common import delete_image
 
 
 class ArticleRepository:
@@ -77,7 +77,7 @@ class ArticleRepository:
             )
             if article is None:
                 raise HTTPException(status_code=404, detail="Article not found")
-            delete_image_from_local(article.imagePath)
+            delete_image(article.imagePath)
             self.db.delete(article)
             self.db.commit()
             return article
@@ -1,6 +1,6 @@
 from datetime import datetime
 import os
-from typing import List
+from typing import List, Optional
 from fastapi import Depends, HTTPException
 from config.database import get_db
 from config.models import sampah_item_model, sampah_model, jenis_sampah_model
@@ -18,6 +18,7 @@ from config.schemas.sampah_schema import (
     OutputSampahDetail,
     OutputSampahItem,
 )
+from src.controllers.service_metrics import stage_timer
 from src.repositories.repository_point import PointRepository
 
 
@@ -66,39 +67,12 @@ class SampahRepository:
             self.db.commit()
             self.db.refresh(new_sampah)
 
-            # Update user point
-            updated_point = await self.point_repository.update_user_point(
-                user_id, input_sampah.point
-            )
-
-            # Query only the badge that meets the user's point criteria (optimized query)
-            user_point = self.db.query(Point).filter(Point.userId == user_id).first()
-            if user_point:
-                new_badge = (
-                    self.db.query(Badge)
-                    .filter(Badge.pointMinimum <= user_point.point)
-                    .order_by(Badge.pointMinimum.desc())
-                    .first()
-                )
-                # Update user's badge if needed
-                if new_badge and (
-                    user_point.badgeId is None or new_badge.id > user_point.badgeId
-                ):
-                    user_point.badgeId = new_badge.id
-                    self.db.commit()
-                    self.db.refresh(user_point)
-                    return {
-                        "id": new_sampah.id,
-                        "detail": "Success Post Sampah",
-                        "badge": new_badge.name,
-                        "updated_badge": True,
-                    }
-
+            badge = await self.update_point_and_badge(user_id, input_sampah.point)
             return {
                 "id": new_sampah.id,
                 "detail": "Success Post Sampah",
-                "badge": None,
-                "updated_badge": False,
+                "badge": badge,
+                "updated_badge": badge is not None,
             }
 
         except SQLAlchemyError as e:
@@ -109,6 +83,31 @@ class SampahRepository:
                 status_code=500, detail=f"{self.DATABASE_ERROR_MESSAGE}: {str(e)}"
             )
 
+    @stage_timer("badge_update")
+    async def update_point_and_badge(self, user_id, point: int):
+        """Add ``point`` to the user and return the new badge name, if any."""
+        # Update user point
+        await self.point_repository.update_user_point(user_id, point)
+
+        # Query only the badge that meets the user's point criteria (optimized query)
+        user_point = self.db.query(Point).filter(Point.userId == user_id).first()
+        if user_point:
+            new_badge = (
+                self.db.query(Badge)
+                .filter(Badge.pointMinimum <= user_point.point)
+                .order_by(Badge.pointMinimum.desc())
+                .first()
+            )
+            # Update user's badge if needed
+            if new_badge and (
+                user_point.badgeId is None or new_badge.id > user_point.badgeId
+            ):
+                user_point.badgeId = new_badge.id
+                self.db.commit()
+                self.db.refresh(user_point)
+                return new_badge.name
+        return None
+
     async def get_all_user_sampah(self, user_id, page, page_size):
         try:
             query = self.db.query(sampah_model.Sampah).filter(
@@ -152,38 +151,52 @@ class SampahRepository:
 
             data = []
             for sampah in sampahs:
-                sampah_items_list = [
-                    OutputSampahItem(
-                        nama=item.jenis_sampah.nama, point=item.jenis_sampah.point
-                    )
-                    for item in sampah.sampah_items
-                ]
-
-                count_objects = self.calculate_objects(sampah_items_list)
-
-                if sampah_items_list and count_objects:
-                    data.append(
-                        OutputSampahDetail(
-                            id=sampah.id,
-                            is_waste_pile=sampah.isGarbagePile,
-                            address=sampah.address,
-                            geom=to_shape(sampah.geom).wkt,
-                            captureTime=sampah.captureTime,
-                            pickupAt=sampah.pickupAt,
-                            is_pickup=sampah.isPickup,
-                            pickup_by_user=sampah.pickupByUser,
-                            point=sampah.point,
-                            total_sampah=len(sampah_items_list),
-                            sampah_items=sampah_items_list,
-                            count_items=count_objects,
-                            image=sampah.imagePath,
-                            evidence=sampah.evidencePath,
-                        )
-                    )
+                detail = self.build_sampah_detail(sampah)
+                if detail.total_sampah:
+                    data.append(detail)
             return data
         except SQLAlchemyError:
             raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
 
+    async def get_unpicked_locations(
+        self,
+        data_type: str,
+        sampah_ids: Optional[List[int]] = None,
+        bbox: Optional[List[float]] = None,
+        limit: Optional[int] = None,
+    ):
+        """Coordinates of reports still waiting for pickup, oldest first."""
+        try:
+            query = self.db.query(
+                sampah_model.Sampah.id,
+                sampah_model.Sampah.address,
+                func.ST_Y(sampah_model.Sampah.geom).label("latitude"),
+                func.ST_X(sampah_model.Sampah.geom).label("longitude"),
+            ).filter(
+                sampah_model.Sampah.isPickup == False,
+                sampah_model.Sampah.geom.isnot(None),
+            )
+
+            if data_type == "garbage_pile":
+                query = query.filter(sampah_model.Sampah.isGarbagePile == True)
+            elif data_type == "garbage_pcs":
+                query = query.filter(sampah_model.Sampah.isGarbagePile == False)
+            if sampah_ids:
+                query = query.filter(sampah_model.Sampah.id.in_(sampah_ids))
+            if bbox:
+                query = query.filter(
+                    sampah_model.Sampah.geom.intersects(
+                        func.ST_MakeEnvelope(*bbox, 4326)
+                    )
+                )
+
+            query = query.order_by(sampah_model.Sampah.captureTime)
+            if limit:
+                query = query.limit(limit)
+            return query.all()
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
     async def get_sampah_detail(self, sampah_id: int):
         try:
             # Fetch the Sampah object with related SampahItems and JenisSampah
@@ -200,30 +213,22 @@ class SampahRepository:
             if sampah is None:
                 raise HTTPException(status_code=404, detail="Sampah not found")
 
-            sampah_items_list = [
-                OutputSampahItem(
-                    nama=item.jenis_sampah.nama, point=item.jenis_sampah.point
+            return self.build_sampah_detail(sampah)
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
+    async def get_sampah_location(self, sampah_id: int):
+        try:
+            return (
+                self.db.query(
+                    sampah_model.Sampah.id,
+                    func.ST_Y(sampah_model.Sampah.geom).label("latitude"),
+                    func.ST_X(sampah_model.Sampah.geom).label("longitude"),
+                    sampah_model.Sampah.isGarbagePile,
+                    sampah_model.Sampah.isPickup,
                 )
-                for item in sampah.sampah_items
-            ]
-
-            count_objects = self.calculate_objects(sampah_items_list)
-
-            return OutputSampahDetail(
-                id=sampah.id,
-                is_waste_pile=sampah.isGarbagePile,
-                address=sampah.address,
-                geom=to_shape(sampah.geom).wkt,
-                captureTime=sampah.captureTime,
-                pickupAt=sampah.pickupAt,
-                is_pickup=sampah.isPickup,
-                pickup_by_user=sampah.pickupByUser,
-                point=sampah.point,
-                total_sampah=len(sampah_items_list),
-                sampah_items=sampah_items_list,
-                count_items=count_objects,
-                image=sampah.imagePath,
-                evidence=sampah.evidencePath,
+                .filter(sampah_model.Sampah.id == sampah_id)
+                .first()
             )
         except SQLAlchemyError:
             raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
@@ -280,33 +285,9 @@ class SampahRepository:
 
             data = []
             for sampah in sampahs:
-                sampah_items_list = [
-                    OutputSampahItem(
-                        nama=item.jenis_sampah.nama, point=item.jenis_sampah.point
-                    )
-                    for item in sampah.sampah_items
-                ]
-                count_objects = self.calculate_objects(sampah_items_list)
-
-                if sampah_items_list and count_objects:
-                    data.append(
-                        OutputSampahDetail(
-                            id=sampah.id,
-                            is_waste_pile=sampah.isGarbagePile,
-                            address=sampah.address,
-                            geom=to_shape(sampah.geom).wkt,
-                            captureTime=sampah.captureTime,
-                            pickupAt=sampah.pickupAt,
-                            is_pickup=sampah.isPickup,
-                            pickup_by_user=sampah.pickupByUser,
-                            point=sampah.point,
-                            total_sampah=len(sampah_items_list),
-                            sampah_items=sampah_items_list,
-                            count_items=count_objects,
-                            image=sampah.imagePath,
-                            evidence=sampah.evidencePath,
-                        )
-                    )
+                detail = self.build_sampah_detail(sampah)
+                if detail.total_sampah:
+                    data.append(detail)
             print(len(data))
             return data
         except SQLAlchemyError:
@@ -321,26 +302,49 @@ class SampahRepository:
                 object_summary[name].count += 1
                 object_summary[name].point += points
             else:
-                object_summary[name] = CountObject(name=name, count=1, point=points)
+                object_summary[name] = CountObject.model_construct(
+                    name=name, count=1, point=points
+                )
         return list(object_summary.values())
 
+    def build_sampah_detail(self, sampah: sampah_model.Sampah) -> OutputSampahDetail:
+        # Rows come straight from the database, so the output models are built
+        # with model_construct to skip a second round of pydantic validation.
+        sampah_items_list = [
+            OutputSampahItem.model_construct(
+                nama=item.jenis_sampah.nama, point=item.jenis_sampah.point
+            )
+            for item in sampah.sampah_items
+        ]
+        count_objects = self.calculate_objects(sampah_items_list)
+        return OutputSampahDetail.model_construct(
+            id=sampah.id,
+            is_waste_pile=sampah.isGarbagePile,
+            address=sampah.address,
+            geom=to_shape(sampah.geom).wkt,
+            captureTime=sampah.captureTime,
+            pickupAt=sampah.pickupAt,
+            is_pickup=sampah.isPickup,
+            pickup_by_user=sampah.pickupByUser,
+            point=sampah.point,
+            total_sampah=len(sampah_items_list),
+            sampah_items=sampah_items_list,
+            count_items=count_objects,
+            image=sampah.imagePath,
+            evidence=sampah.evidencePath,
+        )
+
     async def pickup_garbage(self, token: TokenData, sampah_id: int, image_path: str):
         try:
-            sampah = self.db.query(sampah_model.Sampah).filter(
-                sampah_model.Sampah.id == sampah_id
-            )
-            if not sampah.first():
+            sampah = self.db.get(sampah_model.Sampah, sampah_id)
+            if sampah is None:
                 raise HTTPException(status_code=404, detail="Sampah not found")
-            if sampah.first().isPickup:
+            if sampah.isPickup:
                 raise HTTPException(status_code=400, detail="Sampah already picked up")
-            sampah.update(
-                {
-                    "isPickup": True,
-                    "pickupAt": datetime.now(),
-                    "pickupByUser": token.name,
-                    "evidencePath": image_path,
-                }
-            )
+            sampah.isPickup = True
+            sampah.pickupAt = datetime.now()
+            sampah.pickupByUser = token.name
+            sampah.evidencePath = image_path
             self.db.commit()
             return {"detail": "Success Update Sampah Status"}
         except SQLAlchemyError:
@@ -349,20 +353,14 @@ class SampahRepository:
 
     async def unpickup_garbage(self, token: TokenData, sampah_id: int):
         try:
-            sampah = self.db.query(sampah_model.Sampah).filter(
-                sampah_model.Sampah.id == sampah_id
-            )
-            if not sampah.first():
+            sampah = self.db.get(sampah_model.Sampah, sampah_id)
+            if sampah is None:
                 raise HTTPException(status_code=404, detail="Sampah not found")
-            if not sampah.first().isPickup:
+            if not sampah.isPickup:
                 raise HTTPException(status_code=400, detail="Sampah already unpicked")
-            sampah.update(
-                {
-                    "isPickup": False,
-                    "pickupAt": None,
-                    "pickupByUser": None,
-                }
-            )
+            sampah.isPickup = False
+            sampah.pickupAt = None
+            sampah.pickupByUser = None
             self.db.commit()
             return {"detail": "Success Update Sampah Status"}
         except SQLAlchemyError:
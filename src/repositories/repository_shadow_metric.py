@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+from fastapi import Depends, HTTPException
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from config.database import get_db
+from config.models.shadow_metric_model import ShadowMetric
+
+
+class ShadowMetricRepository:
+    def __init__(self, db: Session = Depends(get_db)):
+        self.db = db
+
+    DATABASE_ERROR_MESSAGE = "Database error"
+
+    async def get_summary(self, model_name: str, days: int):
+        try:
+            since = datetime.utcnow() - timedelta(days=days)
+            rows = (
+                self.db.query(
+                    ShadowMetric.productionVersion,
+                    ShadowMetric.candidateVersion,
+                    func.count(ShadowMetric.id).label("samples"),
+                    func.avg(ShadowMetric.productionLatencyMs).label(
+                        "production_latency_ms"
+                    ),
+                    func.avg(ShadowMetric.candidateLatencyMs).label(
+                        "candidate_latency_ms"
+                    ),
+                    func.sum(ShadowMetric.productionCount).label("production_count"),
+                    func.sum(ShadowMetric.candidateCount).label("candidate_count"),
+                    func.sum(ShadowMetric.matchedCount).label("matched_count"),
+                    func.avg(ShadowMetric.meanIou).label("mean_iou"),
+                    func.avg(ShadowMetric.classAgreement).label("class_agreement"),
+                )
+                .filter(
+                    ShadowMetric.modelName == model_name,
+                    ShadowMetric.createdAt >= since,
+                )
+                .group_by(
+                    ShadowMetric.productionVersion, ShadowMetric.candidateVersion
+                )
+                .all()
+            )
+            return [dict(row._mapping) for row in rows]
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
@@ -0,0 +1,174 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import Depends, HTTPException
+from sqlalchemy import Integer, cast, delete, func, insert, literal, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from config.database import get_db
+from config.models.sampah_cluster_model import SampahCluster
+from config.models.sampah_model import Sampah
+
+# pg_try_advisory_xact_lock key, so only one worker rebuilds the clusters
+CLUSTER_LOCK_KEY = 4701
+
+
+class StackholderSampahRepository:
+    def __init__(self, db: Session = Depends(get_db)):
+        self.db = db
+
+    DATABASE_ERROR_MESSAGE = "Database error"
+
+    async def get_cluster_version(self):
+        try:
+            return self.db.query(func.max(SampahCluster.dataVersion)).scalar()
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
+    def refresh_clusters(self, data_version: str, eps_meters: float, min_points: int):
+        """Rebuild sampah_clusters in one transaction.
+
+        Clustering the whole table takes a while, so this one is synchronous
+        and meant for ``asyncio.to_thread``. Returns the number of clusters,
+        or None when another worker holds the rebuild lock.
+        """
+        try:
+            locked = self.db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {"key": CLUSTER_LOCK_KEY},
+            ).scalar()
+            if not locked:
+                self.db.rollback()
+                return None
+
+            now = datetime.now()
+            # Web Mercator metres are close enough to ground metres near the
+            # equator, where the reports are
+            clustered = (
+                select(
+                    Sampah.geom,
+                    Sampah.isGarbagePile,
+                    Sampah.isPickup,
+                    Sampah.captureTime,
+                    func.ST_ClusterDBSCAN(
+                        func.ST_Transform(Sampah.geom, 3857), eps_meters, min_points
+                    )
+                    .over()
+                    .label("cluster"),
+                )
+                .where(Sampah.geom.isnot(None))
+                .subquery()
+            )
+            points = func.ST_Collect(clustered.c.geom)
+            centroid = func.ST_Centroid(points)
+            # The second point of the longest line is the farthest report
+            farthest = func.ST_PointN(func.ST_LongestLine(centroid, points), 2)
+            summary = (
+                select(
+                    centroid,
+                    func.coalesce(func.ST_DistanceSphere(centroid, farthest), 0),
+                    func.count(),
+                    func.coalesce(
+                        func.sum(cast(clustered.c.isGarbagePile, Integer)), 0
+                    ),
+                    func.coalesce(func.sum(cast(clustered.c.isPickup, Integer)), 0),
+                    func.min(clustered.c.captureTime),
+                    func.max(clustered.c.captureTime),
+                    literal(data_version),
+                    literal(now),
+                    literal(now),
+                )
+                .where(clustered.c.cluster.isnot(None))
+                .group_by(clustered.c.cluster)
+            )
+
+            self.db.execute(delete(SampahCluster))
+            result = self.db.execute(
+                insert(SampahCluster).from_select(
+                    [
+                        "geom",
+                        "radiusM",
+                        "reportCount",
+                        "garbagePileCount",
+                        "pickedUpCount",
+                        "firstReportAt",
+                        "lastReportAt",
+                        "dataVersion",
+                        "createdAt",
+                        "updatedAt",
+                    ],
+                    summary,
+                )
+            )
+            self.db.commit()
+            return result.rowcount
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
+    async def get_clusters(self, bbox, min_reports: int, recent_since: datetime):
+        try:
+            query = self.db.query(
+                SampahCluster.id,
+                func.ST_Y(SampahCluster.geom).label("latitude"),
+                func.ST_X(SampahCluster.geom).label("longitude"),
+                SampahCluster.radiusM.label("radius_m"),
+                SampahCluster.reportCount.label("report_count"),
+                SampahCluster.garbagePileCount.label("garbage_pile_count"),
+                SampahCluster.pickedUpCount.label("picked_up_count"),
+                SampahCluster.firstReportAt.label("first_report_at"),
+                SampahCluster.lastReportAt.label("last_report_at"),
+            ).filter(SampahCluster.reportCount >= min_reports)
+            if bbox:
+                query = query.filter(
+                    SampahCluster.geom.intersects(func.ST_MakeEnvelope(*bbox, 4326))
+                )
+            if recent_since:
+                query = query.filter(SampahCluster.lastReportAt >= recent_since)
+            return query.order_by(SampahCluster.reportCount.desc()).all()
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
+    async def get_heatmap(
+        self,
+        cell_size: float,
+        data_type: str,
+        status: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        bbox=None,
+    ):
+        """Count reports per grid cell; each cell is keyed by its centre."""
+        try:
+            cell = func.ST_SnapToGrid(Sampah.geom, cell_size)
+            query = self.db.query(
+                func.ST_Y(cell).label("latitude"),
+                func.ST_X(cell).label("longitude"),
+                func.count().label("count"),
+                func.coalesce(func.sum(cast(Sampah.isGarbagePile, Integer)), 0).label(
+                    "garbage_pile_count"
+                ),
+                func.coalesce(func.sum(cast(Sampah.isPickup, Integer)), 0).label(
+                    "picked_up_count"
+                ),
+            ).filter(Sampah.geom.isnot(None))
+
+            if data_type == "garbage_pile":
+                query = query.filter(Sampah.isGarbagePile == True)
+            elif data_type == "garbage_pcs":
+                query = query.filter(Sampah.isGarbagePile == False)
+            if status == "pickup_true":
+                query = query.filter(Sampah.isPickup == True)
+            elif status == "pickup_false":
+                query = query.filter(Sampah.isPickup == False)
+            if start_date:
+                query = query.filter(Sampah.captureTime >= start_date)
+            if end_date:
+                query = query.filter(Sampah.captureTime <= end_date)
+            if bbox:
+                query = query.filter(
+                    Sampah.geom.intersects(func.ST_MakeEnvelope(*bbox, 4326))
+                )
+
+            return query.group_by(cell).all()
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
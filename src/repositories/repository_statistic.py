@@ -9,6 +9,7 @@ from geoalchemy2.shape import to_shape
 from config.models.sampah_item_model import SampahItem
 from config.models.sampah_model import Sampah
 from config.schemas.common_schema import TokenData
+from src.controllers.service_storage import image_url
 
 
 class StatisticRepository:
@@ -322,15 +323,9 @@ class StatisticRepository:
                     "waste_count": item.waste_count,
                     "pickup_by_user": item.pickup_by_user,
                     "pickup_status": item.pickup_status,
-                    "image_url": (
-                        f"https://jjmbm5rz-8000.asse.devtunnels.ms/detected_image/{item.image_url.split('/')[-1]}"
-                        if "detected_image" in item.image_url
-                        else f"https://jjmbm5rz-8000.asse.devtunnels.ms/garbage-image/{item.image_url.split('/')[-1]}"
-                    ),
+                    "image_url": image_url(item.image_url),
                     "evidence_url": (
-                        f"https://jjmbm5rz-8000.asse.devtunnels.ms/evidence/{item.evidence_url.split('/')[-1]}"
-                        if item.evidence_url
-                        else None
+                        image_url(item.evidence_url) if item.evidence_url else None
                     ),
                 }
                 for item in result
@@ -476,15 +471,9 @@ class StatisticRepository:
                             "Collected" if item.pickup_status else "Not Collected"
                         ),
                         "Waste Location": maps_link,
-                        "image_url": (
-                            f"http://localhost:8000/detected_image/{item.image_url.split('/')[-1]}"
-                            if "detected_image" in item.image_url
-                            else f"http://localhost:8000/garbage-image/{item.image_url.split('/')[-1]}"
-                        ),
+                        "image_url": image_url(item.image_url),
                         "evidence_url": (
-                            f"http://localhost:8000/evidence/{item.evidence_url.split('/')[-1]}"
-                            if item.evidence_url
-                            else None
+                            image_url(item.evidence_url) if item.evidence_url else None
                         ),
                     }
                 )
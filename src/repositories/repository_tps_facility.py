@@ -0,0 +1,147 @@
+from datetime import datetime
+from fastapi import Depends, HTTPException
+from geoalchemy2.shape import to_shape
+from sqlalchemy import distinct, func, text
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from config.database import get_db
+from config.models.sampah_model import Sampah
+from config.models.tps_facility_model import TpsFacility
+
+FACILITY_COLUMNS = (
+    TpsFacility.name,
+    func.ST_Y(TpsFacility.geom).label("latitude"),
+    func.ST_X(TpsFacility.geom).label("longitude"),
+    TpsFacility.iconUrl.label("icon_url"),
+    TpsFacility.facilityType.label("facility_type"),
+    TpsFacility.sipsnId.label("id"),
+    TpsFacility.address,
+)
+# First key of pg_try_advisory_xact_lock(key, hashtext(source)), so only one
+# worker rewrites a source at a time
+TPS_SYNC_LOCK_KEY = 4702
+
+
+class TpsFacilityRepository:
+    def __init__(self, db: Session = Depends(get_db)):
+        self.db = db
+
+    DATABASE_ERROR_MESSAGE = "Database error"
+
+    async def get_by_source(self, source_key: str):
+        try:
+            return (
+                self.db.query(*FACILITY_COLUMNS)
+                .filter(TpsFacility.sourceKey == source_key)
+                .order_by(TpsFacility.id)
+                .all()
+            )
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
+    async def get_synced_at(self, source_key: str):
+        try:
+            return (
+                self.db.query(func.max(TpsFacility.syncedAt))
+                .filter(TpsFacility.sourceKey == source_key)
+                .scalar()
+            )
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
+    async def get_stale_sources(self, synced_before: datetime):
+        try:
+            rows = (
+                self.db.query(TpsFacility.sourceKey)
+                .group_by(TpsFacility.sourceKey)
+                .having(func.max(TpsFacility.syncedAt) < synced_before)
+                .all()
+            )
+            return [row.sourceKey for row in rows]
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
+    def replace_source(self, source_key: str, facilities: list):
+        """Replace every facility of ``source_key`` in a single transaction.
+
+        Deleting and inserting thousands of rows blocks for a while, so this
+        one is synchronous and meant for ``asyncio.to_thread``. Returns False
+        without touching anything when another worker is rewriting the source.
+        """
+        try:
+            locked = self.db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key, hashtext(:source))"),
+                {"key": TPS_SYNC_LOCK_KEY, "source": source_key},
+            ).scalar()
+            if not locked:
+                self.db.rollback()
+                return False
+
+            now = datetime.now()
+            self.db.query(TpsFacility).filter(
+                TpsFacility.sourceKey == source_key
+            ).delete(synchronize_session=False)
+            self.db.add_all(
+                TpsFacility(
+                    sourceKey=source_key,
+                    sipsnId=facility["id"],
+                    name=facility["name"],
+                    facilityType=facility["facility_type"],
+                    iconUrl=facility["icon_url"],
+                    address=facility["address"],
+                    geom=f"POINT({facility['longitude']} {facility['latitude']})",
+                    syncedAt=now,
+                    createdAt=now,
+                    updatedAt=now,
+                )
+                for facility in facilities
+            )
+            self.db.commit()
+            return True
+        except SQLAlchemyError:
+            self.db.rollback()
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
+    async def find_nearest(
+        self, longitude: float, latitude: float, k: int, facility_type: str = None
+    ):
+        point = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+        return await self._nearest(point, k, facility_type)
+
+    async def find_nearest_to_sampah(
+        self, sampah_id: int, k: int, facility_type: str = None
+    ):
+        try:
+            geom = self.db.query(Sampah.geom).filter(Sampah.id == sampah_id).scalar()
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+        if geom is None:
+            raise HTTPException(status_code=404, detail="Sampah not found")
+        location = to_shape(geom)
+        return await self.find_nearest(location.x, location.y, k, facility_type)
+
+    async def _nearest(self, point, k: int, facility_type: str = None):
+        try:
+            # A facility is stored once per source, so the k * sources nearest
+            # rows always contain the k nearest distinct facilities
+            sources = self.db.query(
+                func.count(distinct(TpsFacility.sourceKey))
+            ).scalar()
+            query = self.db.query(
+                *FACILITY_COLUMNS,
+                func.ST_DistanceSphere(TpsFacility.geom, point).label("distance_m"),
+            ).filter(TpsFacility.geom.isnot(None))
+            if facility_type:
+                query = query.filter(TpsFacility.facilityType == facility_type)
+            rows = (
+                query.order_by(TpsFacility.geom.op("<->")(point))
+                .limit(k * max(sources, 1))
+                .all()
+            )
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
+        nearest = {}
+        for row in sorted(rows, key=lambda row: row.distance_m):
+            nearest.setdefault(row.id, row)
+        return list(nearest.values())[:k]
@@ -5,6 +5,7 @@ from config.models import user_model, point_model
 from sqlalchemy import or_, cast, String
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from src.controllers.service_cache import principal_cache
 
 
 class UserRepository:
@@ -47,6 +48,12 @@ class UserRepository:
         except SQLAlchemyError:
             raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
 
+    async def find_user_by_id(self, id: int):
+        try:
+            return self.db.get(user_model.User, id)
+        except SQLAlchemyError:
+            raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
+
     async def find_user_by_email(self, email: str):
         try:
             data = (
@@ -79,6 +86,7 @@ class UserRepository:
 
             user.active = not user.active
             self.db.commit()
+            principal_cache.delete(user.id)
             return user
         except SQLAlchemyError as e:
             raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
@@ -94,6 +102,7 @@ class UserRepository:
 
             user.password = password
             self.db.commit()
+            principal_cache.delete(user.id)
             return user
         except SQLAlchemyError as e:
             raise HTTPException(status_code=500, detail=self.DATABASE_ERROR_MESSAGE)
@@ -161,6 +170,7 @@ class UserRepository:
         try:
             user.updatedAt = datetime.now()
             self.db.commit()
+            principal_cache.delete(user.id)
             return user
         except SQLAlchemyError as e:
             print(e)
@@ -1,12 +1,30 @@
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
 from config.schemas.sipsn_schema import TPS3RRequest
-from src.controllers.service_sipsn import fetch_tps3r_data
+from src.controllers.sipsn.controller_sipsn import SipsnController
 
 
 sipsn_tps_router = APIRouter(prefix="/api/v1/stackholder", tags=["SIPSN TPS"])
 
 
 @sipsn_tps_router.post("/tps")
-async def get_tps3r_data(request_data: TPS3RRequest):
-    result = await fetch_tps3r_data(request_data)
-    return result
+async def get_tps3r_data(
+    request_data: TPS3RRequest, sipsn_controller: SipsnController = Depends()
+):
+    return await sipsn_controller.get_tps(request_data)
+
+
+@sipsn_tps_router.get("/tps/nearest")
+async def get_nearest_tps(
+    k: int = Query(5, ge=1, le=50),
+    sampah_id: Optional[int] = Query(
+        None, description="Report to search around instead of a coordinate"
+    ),
+    latitude: Optional[float] = Query(None, ge=-90, le=90),
+    longitude: Optional[float] = Query(None, ge=-180, le=180),
+    facility_type: Optional[str] = Query(None),
+    sipsn_controller: SipsnController = Depends(),
+):
+    return await sipsn_controller.get_nearest_tps(
+        k, sampah_id, latitude, longitude, facility_type
+    )
@@ -4,11 +4,11 @@ from fastapi import APIRouter
 from fastapi.security import OAuth2PasswordRequestForm
 
 from config.schemas.auth_schema import InputLogin, InputUser, OutputLogin
-from config.schemas.common_schema import StandardResponse, TokenData
+from config.schemas.common_schema import AuthenticatedUser, StandardResponse
 from src.controllers.auth.controller_stackholder_auth import (
     AuthStackholderController as AuthController,
 )
-from src.controllers.service_common import get_current_user
+from src.controllers.service_common import get_current_principal
 
 
 auth_stackholder_router = APIRouter(
@@ -40,7 +40,7 @@ async def user_register(
 
 @auth_stackholder_router.get("/profile")
 async def user_profile(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     user_controller: AuthController = Depends(),
 ):
     return await user_controller.get_current_user(token)
@@ -49,7 +49,7 @@ async def user_profile(
 @auth_stackholder_router.put("/deactivate_user")
 async def user_deactivate(
     id: int,
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     user_controller: AuthController = Depends(),
 ):
     try:
@@ -64,7 +64,7 @@ async def user_deactivate(
 async def user_reset_password(
     id: int,
     password: str,
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     user_controller: AuthController = Depends(),
 ):
     try:
@@ -77,7 +77,7 @@ async def user_reset_password(
 
 @auth_stackholder_router.get("/get_all_user")
 async def user_get_all(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     page: int = Query(1, ge=1, description="Page number (default is 1)"),
     page_size: int = Query(
         10, ge=1, le=100, description="Page size (default is 10, max 100)"
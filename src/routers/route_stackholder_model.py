@@ -0,0 +1,67 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from typing_extensions import Annotated
+from config.schemas.common_schema import AuthenticatedUser
+from src.controllers.sampah.service_predict import get_model_status, model_registry
+from src.controllers.service_common import get_current_principal
+from src.repositories.repository_shadow_metric import ShadowMetricRepository
+
+
+model_stackholder_router = APIRouter(
+    prefix="/api/v1/stackholder/model", tags=["Model Stackholder"]
+)
+
+
+def check_model_name(name: str):
+    if name not in model_registry.names():
+        raise HTTPException(status_code=404, detail="Model not found")
+
+
+@model_stackholder_router.get("")
+async def get_models(
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
+):
+    if token.role != "admin":
+        raise HTTPException(status_code=400, detail="Not Permitted")
+    return get_model_status()
+
+
+@model_stackholder_router.post("/{name}/swap")
+async def swap_model(
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
+    name: str = Path(...),
+    version: str = Query(...),
+    drain_timeout: float = Query(30.0, ge=0, le=300),
+):
+    if token.role != "admin":
+        raise HTTPException(status_code=400, detail="Not Permitted")
+    check_model_name(name)
+    if version not in model_registry.versions(name):
+        raise HTTPException(status_code=404, detail="Model version not found")
+    return await asyncio.to_thread(model_registry.swap, name, version, drain_timeout)
+
+
+@model_stackholder_router.post("/{name}/unload")
+async def unload_model(
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
+    name: str = Path(...),
+):
+    if token.role != "admin":
+        raise HTTPException(status_code=400, detail="Not Permitted")
+    check_model_name(name)
+    if not model_registry.unload(name):
+        raise HTTPException(status_code=409, detail="Model is not loaded or in use")
+    return {"name": name, "unloaded": True}
+
+
+@model_stackholder_router.get("/{name}/shadow")
+async def get_shadow_summary(
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
+    name: str = Path(...),
+    days: int = Query(7, ge=1, le=90),
+    shadow_metric_repository: ShadowMetricRepository = Depends(),
+):
+    if token.role != "admin":
+        raise HTTPException(status_code=400, detail="Not Permitted")
+    check_model_name(name)
+    return await shadow_metric_repository.get_summary(name, days)
@@ -1,10 +1,31 @@
-from fastapi import APIRouter, Body, HTTPException, Path
+from fastapi import APIRouter, Body, File, HTTPException, Path, UploadFile
 from fastapi import Depends, Query
+from fastapi.responses import StreamingResponse
 from datetime import datetime
+from typing import Optional
 from typing_extensions import Annotated
-from config.schemas.common_schema import TokenData
+from config.schemas.common_schema import AuthenticatedUser, TokenData
+from config.schemas.sampah_schema import RouteRequest
 from src.controllers.sampah.controller_sampah import SampahController
-from src.controllers.service_common import get_current_user
+from src.controllers.sampah.controller_stackholder_sampah import (
+    HEATMAP_MAX_RESOLUTION,
+    HEATMAP_MIN_RESOLUTION,
+    StackholderSampahController,
+)
+from src.controllers.service_cache import (
+    CLUSTER_TABLES,
+    ConditionalResponse,
+    HEATMAP_TABLES,
+    SAMPAH_TABLES,
+    heatmap_cache,
+)
+from src.controllers.service_common import (
+    get_current_principal,
+    get_current_user,
+    parse_bbox,
+)
+from src.controllers.service_derivative import ImageSize
+from src.controllers.service_events import broker, event_stream
 
 
 sampah_stackholder_router = APIRouter(
@@ -17,9 +38,86 @@ async def get_all_user_sampah(
     token: Annotated[TokenData, Depends(get_current_user)],
     data_type: str = Query("all"),
     status: str = Query("all"),
+    image_size: Optional[ImageSize] = Query(
+        None, description="Image variant: thumb, medium or full (default original)"
+    ),
     sampah_controller: SampahController = Depends(),
+    conditional: ConditionalResponse = Depends(),
+):
+    return await conditional.respond(
+        SAMPAH_TABLES,
+        lambda: sampah_controller.get_all_sampah(
+            token, data_type, status, image_size
+        ),
+    )
+
+
+@sampah_stackholder_router.get("/sampah/clusters")
+async def get_sampah_clusters(
+    token: Annotated[TokenData, Depends(get_current_user)],
+    bbox: Optional[str] = Query(
+        None, description="min_longitude,min_latitude,max_longitude,max_latitude"
+    ),
+    min_reports: int = Query(1, ge=1),
+    recent_days: Optional[int] = Query(
+        None, ge=1, description="Only clusters with a report in the last days"
+    ),
+    stackholder_controller: StackholderSampahController = Depends(),
+    conditional: ConditionalResponse = Depends(),
+):
+    return await conditional.respond(
+        CLUSTER_TABLES,
+        lambda: stackholder_controller.get_clusters(bbox, min_reports, recent_days),
+    )
+
+
+@sampah_stackholder_router.get("/sampah/heatmap")
+async def get_sampah_heatmap(
+    token: Annotated[TokenData, Depends(get_current_user)],
+    resolution: int = Query(
+        14,
+        ge=HEATMAP_MIN_RESOLUTION,
+        le=HEATMAP_MAX_RESOLUTION,
+        description="Grid cells are 180 / 2^resolution degrees wide",
+    ),
+    data_type: str = Query("all"),
+    status: str = Query("all"),
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    bbox: Optional[str] = Query(
+        None, description="min_longitude,min_latitude,max_longitude,max_latitude"
+    ),
+    stackholder_controller: StackholderSampahController = Depends(),
+    conditional: ConditionalResponse = Depends(),
 ):
-    return await sampah_controller.get_all_sampah(token, data_type, status)
+    return await conditional.respond(
+        HEATMAP_TABLES,
+        lambda: stackholder_controller.get_heatmap(
+            resolution, data_type, status, start_date, end_date, bbox
+        ),
+        cache=heatmap_cache,
+    )
+
+
+@sampah_stackholder_router.get("/sampah/events")
+async def stream_sampah_events(
+    token: Annotated[TokenData, Depends(get_current_user)],
+    bbox: Optional[str] = Query(
+        None, description="min_longitude,min_latitude,max_longitude,max_latitude"
+    ),
+):
+    """Server-sent events for new, picked up and unpicked reports.
+
+    A ``resync`` event means events were dropped and the client should reload.
+    """
+    if token.role != "stackholder" and token.role != "admin":
+        raise HTTPException(status_code=400, detail="Not Permitted")
+    subscription = broker.subscribe(parse_bbox(bbox) if bbox else None)
+    return StreamingResponse(
+        event_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @sampah_stackholder_router.get("/sampah/timeseries")
@@ -29,16 +127,34 @@ async def get_sampah_timeseries(
     status: str = Query("all"),
     start_date: datetime = Query(...),
     end_date: datetime = Query(...),
+    image_size: Optional[ImageSize] = Query(
+        None, description="Image variant: thumb, medium or full (default original)"
+    ),
     sampah_controller: SampahController = Depends(),
+    conditional: ConditionalResponse = Depends(),
 ):
-    return await sampah_controller.get_sampah_timeseries(
-        token, data_type, status, start_date, end_date
+    return await conditional.respond(
+        SAMPAH_TABLES,
+        lambda: sampah_controller.get_sampah_timeseries(
+            token, data_type, status, start_date, end_date, image_size
+        ),
     )
 
 
+@sampah_stackholder_router.post("/sampah/route")
+async def plan_pickup_route(
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
+    route_request: RouteRequest,
+    sampah_controller: SampahController = Depends(),
+):
+    if token.role != "stackholder" and token.role != "admin":
+        raise HTTPException(status_code=400, detail="Not Permitted")
+    return await sampah_controller.plan_pickup_route(route_request)
+
+
 @sampah_stackholder_router.put("/sampah/pickup/{sampah_id}")
 async def pickup_garbage(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     sampah_id: int = Path(...),
     image_base64: str = Body(...),
     sampah_controller: SampahController = Depends(),
@@ -48,9 +164,21 @@ async def pickup_garbage(
     return await sampah_controller.pickup_garbage(token, sampah_id, image_base64)
 
 
+@sampah_stackholder_router.put("/sampah/pickup/{sampah_id}/upload")
+async def pickup_garbage_upload(
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
+    sampah_id: int = Path(...),
+    file: UploadFile = File(...),
+    sampah_controller: SampahController = Depends(),
+):
+    if token.role != "stackholder" and token.role != "admin":
+        raise HTTPException(status_code=400, detail="Not Permitted")
+    return await sampah_controller.pickup_garbage_upload(token, sampah_id, file)
+
+
 @sampah_stackholder_router.put("/sampah/unpickup/{sampah_id}")
 async def unpickup_garbage(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     sampah_id: int = Path(...),
     sampah_controller: SampahController = Depends(),
 ):
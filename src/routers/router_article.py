@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, File, Query, UploadFile
 
 from config.schemas.article_schema import InputArticle
 from config.schemas.common_schema import StandardResponse, TokenData
+from src.controllers.service_cache import ARTICLE_TABLES, ConditionalResponse
 from src.controllers.service_common import get_current_user
 from src.controllers.article.controller_article import ArticleController
 
@@ -16,8 +17,12 @@ async def get_all_articles(
     page: int = Query(1, gt=0),
     page_size: int = Query(10, gt=0),
     article_controller: ArticleController = Depends(),
+    conditional: ConditionalResponse = Depends(),
 ):
-    return article_controller.get_articles(page, page_size)
+    async def build():
+        return article_controller.get_articles(page, page_size)
+
+    return await conditional.respond(ARTICLE_TABLES, build)
 
 
 @article_router.get("/article/{title}")
@@ -25,8 +30,12 @@ async def get_article_by_title(
     token: Annotated[TokenData, Depends(get_current_user)],
     title: str,
     article_controller: ArticleController = Depends(),
+    conditional: ConditionalResponse = Depends(),
 ):
-    return article_controller.get_article_by_title(title)
+    async def build():
+        return article_controller.get_article_by_title(title)
+
+    return await conditional.respond(ARTICLE_TABLES, build)
 
 
 @article_router.post("/article")
@@ -9,9 +9,9 @@ from config.schemas.auth_schema import (
     OutputLogin,
     ForgotPassword,
 )
-from config.schemas.common_schema import StandardResponse, TokenData
+from config.schemas.common_schema import AuthenticatedUser, StandardResponse
 from src.controllers.auth.controller_auth import AuthController
-from src.controllers.service_common import get_current_user
+from src.controllers.service_common import get_current_principal
 
 
 auth_router = APIRouter(prefix="/api/v1", tags=["Auth"])
@@ -51,7 +51,7 @@ async def forgot_password(
 
 @auth_router.get("/profile")
 async def user_profile(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     user_controller: AuthController = Depends(),
 ):
     return await user_controller.get_current_user(token)
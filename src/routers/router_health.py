@@ -0,0 +1,28 @@
+import asyncio
+from fastapi import APIRouter, Response
+from src.controllers.sampah.service_predict import get_model_status
+from src.controllers.service_metrics import render_metrics
+from src.controllers.service_response import FastJSONResponse
+
+
+health_router = APIRouter(prefix="/health", tags=["Health"])
+metrics_router = APIRouter(tags=["Health"])
+
+
+@health_router.get("/live")
+async def live():
+    return {"status": "ok"}
+
+
+@health_router.get("/ready")
+async def ready():
+    # Stays 503 until every model is loaded and warmed up
+    status = get_model_status()
+    status_code = 200 if status["ready"] else 503
+    return FastJSONResponse(status, status_code=status_code)
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = await asyncio.to_thread(render_metrics)
+    return Response(content=body, media_type=content_type)
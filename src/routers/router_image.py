@@ -0,0 +1,43 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse
+from src.controllers.service_derivative import (
+    DERIVATIVE_FORMATS,
+    DERIVATIVE_SIZES,
+    derivative_key,
+)
+from src.controllers.service_storage import FOLDER_ROUTES, get_storage
+
+
+image_router = APIRouter(prefix="/api/v1", tags=["Image"])
+
+
+@image_router.get("/image/{folder}/{name}")
+async def get_sized_image(
+    request: Request,
+    folder: str,
+    name: str,
+    size: str = Query("full", description="Options: thumb, medium, full"),
+    format: Optional[str] = Query(
+        None, description="Options: jpeg, webp (default negotiated from Accept)"
+    ),
+):
+    if folder not in FOLDER_ROUTES or size not in DERIVATIVE_SIZES:
+        raise HTTPException(status_code=404, detail="Image not found")
+    if format is None:
+        accept = request.headers.get("accept", "")
+        format = "webp" if "image/webp" in accept else "jpeg"
+    if format not in DERIVATIVE_FORMATS:
+        raise HTTPException(status_code=400, detail="Unsupported image format")
+
+    storage = get_storage()
+    key = f"{folder}/{name}"
+    variant = derivative_key(key, size, format)
+    # Fall back to the original while the derivative is still being generated
+    if not await asyncio.to_thread(storage.exists, variant):
+        variant = key
+    return RedirectResponse(
+        storage.download_url(variant),
+        headers={"Cache-Control": "public, max-age=300", "Vary": "Accept"},
+    )
@@ -1,17 +1,24 @@
+from datetime import date
 from typing_extensions import Annotated
 from fastapi import APIRouter, Depends
 
-from config.schemas.common_schema import TokenData
+from config.schemas.common_schema import AuthenticatedUser, TokenData
 from src.controllers.point.controller_point import PointController
-from src.controllers.service_common import get_current_user
+from src.controllers.service_cache import ConditionalResponse, LEADERBOARD_TABLES
+from src.controllers.service_common import get_current_principal
 
 
 point_router = APIRouter(prefix="/api/v1", tags=["Point"])
 
 
+def leaderboard_vary(token: TokenData):
+    # Rankings flag the querying user and roll over daily, so both vary the key
+    return f"{token.name}:{date.today()}"
+
+
 @point_router.get("/point")
 async def get_current_user_point(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     point_controller: PointController = Depends(),
 ):
     return await point_controller.get_current_user_point(token_data=token)
@@ -19,39 +26,59 @@ async def get_current_user_point(
 
 @point_router.get("/today-point")
 async def get_today_point(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     point_controller: PointController = Depends(),
+    conditional: ConditionalResponse = Depends(),
 ):
-    return await point_controller.get_today_point(token_data=token)
+    return await conditional.respond(
+        LEADERBOARD_TABLES,
+        lambda: point_controller.get_today_point(token_data=token),
+        vary=leaderboard_vary(token),
+    )
 
 
 @point_router.get("/weekly-point")
 async def get_weekly_point(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     point_controller: PointController = Depends(),
+    conditional: ConditionalResponse = Depends(),
 ):
-    return await point_controller.get_weekly_point(token_data=token)
+    return await conditional.respond(
+        LEADERBOARD_TABLES,
+        lambda: point_controller.get_weekly_point(token_data=token),
+        vary=leaderboard_vary(token),
+    )
 
 
 @point_router.get("/monthly-point")
 async def get_monthly_point(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     point_controller: PointController = Depends(),
+    conditional: ConditionalResponse = Depends(),
 ):
-    return await point_controller.get_monthly_point(token_data=token)
+    return await conditional.respond(
+        LEADERBOARD_TABLES,
+        lambda: point_controller.get_monthly_point(token_data=token),
+        vary=leaderboard_vary(token),
+    )
 
 
 @point_router.get("/all-user-point")
 async def get_all_user_point(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     point_controller: PointController = Depends(),
+    conditional: ConditionalResponse = Depends(),
 ):
-    return await point_controller.get_all_user_point(token_data=token)
+    return await conditional.respond(
+        LEADERBOARD_TABLES,
+        lambda: point_controller.get_all_user_point(token_data=token),
+        vary=leaderboard_vary(token),
+    )
 
 
 @point_router.post("/all-user-point-timeseries")
 async def get_all_user_point_timeseries(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    token: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     point_controller: PointController = Depends(),
     start_date: str = None,
     end_date: str = None,
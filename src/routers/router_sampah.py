@@ -1,10 +1,13 @@
 from datetime import datetime
+from typing import Optional
 from typing_extensions import Annotated
 from fastapi import APIRouter, Depends, Query
 from config.schemas.common_schema import TokenData
 from config.schemas.sampah_schema import Timeseries
 from src.controllers.sampah.controller_sampah import SampahController
+from src.controllers.service_cache import ConditionalResponse, SAMPAH_TABLES
 from src.controllers.service_common import get_current_user
+from src.controllers.service_derivative import ImageSize
 
 
 sampah_router = APIRouter(prefix="/api/v1", tags=["Sampah"])
@@ -15,9 +18,18 @@ async def get_all_user_sampah(
     token: Annotated[TokenData, Depends(get_current_user)],
     data_type: str = Query("all"),
     status: str = Query("all"),
+    image_size: Optional[ImageSize] = Query(
+        None, description="Image variant: thumb, medium or full (default original)"
+    ),
     sampah_controller: SampahController = Depends(),
+    conditional: ConditionalResponse = Depends(),
 ):
-    return await sampah_controller.get_all_sampah(token, data_type, status)
+    return await conditional.respond(
+        SAMPAH_TABLES,
+        lambda: sampah_controller.get_all_sampah(
+            token, data_type, status, image_size
+        ),
+    )
 
 
 @sampah_router.get("/sampah/timeseries")
@@ -27,8 +39,15 @@ async def get_sampah_timeseries(
     status: str = Query("all"),
     start_date: datetime = Query(...),
     end_date: datetime = Query(...),
+    image_size: Optional[ImageSize] = Query(
+        None, description="Image variant: thumb, medium or full (default original)"
+    ),
     sampah_controller: SampahController = Depends(),
+    conditional: ConditionalResponse = Depends(),
 ):
-    return await sampah_controller.get_sampah_timeseries(
-        token, data_type, status, start_date, end_date
+    return await conditional.respond(
+        SAMPAH_TABLES,
+        lambda: sampah_controller.get_sampah_timeseries(
+            token, data_type, status, start_date, end_date, image_size
+        ),
     )
@@ -1,4 +1,5 @@
 import datetime
+from typing import Optional
 from typing_extensions import Annotated
 from fastapi import (
     APIRouter,
@@ -8,10 +9,10 @@ from fastapi import (
     Query,
     UploadFile,
 )
-from config.schemas.common_schema import TokenData
+from config.schemas.common_schema import AuthenticatedUser, TokenData
 from config.schemas.sampah_schema import InputSampah, Timeseries
 from src.controllers.sampah.controller_sampah import SampahController
-from src.controllers.service_common import get_current_user
+from src.controllers.service_common import get_current_principal, get_current_user
 
 
 sampah_user_router = APIRouter(prefix="/api/v1/user", tags=["Sampah User"])
@@ -19,12 +20,12 @@ sampah_user_router = APIRouter(prefix="/api/v1/user", tags=["Sampah User"])
 
 @sampah_user_router.get("/sampah")
 async def get_sampah(
-    token: Annotated[TokenData, Depends(get_current_user)],
+    user: Annotated[AuthenticatedUser, Depends(get_current_principal)],
     page: int = Query(1, ge=1),  # Page number (default 1)
     page_size: int = Query(10, ge=1, le=100),  # Page size (default 10, max 100)
     sampah_controller: SampahController = Depends(),
 ):
-    return await sampah_controller.get_all_user_sampah(token, page, page_size)
+    return await sampah_controller.get_all_user_sampah(user, page, page_size)
 
 
 @sampah_user_router.get("/sampah/{sampah_id}")
@@ -48,10 +49,10 @@ async def store_image(
 @sampah_user_router.post("/sampah")
 async def post_sampah(
     input_sampah: InputSampah,
-    token: TokenData = Depends(get_current_user),
+    user: AuthenticatedUser = Depends(get_current_principal),
     sampah_controller: SampahController = Depends(),
 ):
-    return await sampah_controller.post_sampah(input_sampah, token)
+    return await sampah_controller.post_sampah(input_sampah, user)
 
 
 @sampah_user_router.post("/sampah/timeseries")
@@ -68,22 +69,35 @@ async def get_sampah_timeseries(
 @sampah_user_router.post("/sampah-v2")
 async def post_sampah_v2(
     lang: str = Query("id"),
-    longitude: float = Query(...),
-    latitude: float = Query(...),
-    address: str = Query(...),
+    longitude: Optional[float] = Query(
+        None, description="Defaults to the GPS position in the photo's EXIF data"
+    ),
+    latitude: Optional[float] = Query(
+        None, description="Defaults to the GPS position in the photo's EXIF data"
+    ),
+    address: Optional[str] = Query(
+        None, description="Defaults to the place found for the coordinates"
+    ),
     use_garbage_pile_model: bool = Query(False),
-    capture_date: datetime.datetime = Query(...),
+    auto_detect_model: bool = Query(
+        False,
+        description="Detect whether the photo is a garbage pile automatically "
+        "instead of using use_garbage_pile_model",
+    ),
+    capture_date: Optional[datetime.datetime] = Query(
+        None, description="Defaults to the time the photo was taken, from EXIF"
+    ),
     file: UploadFile = File(...),
-    token: TokenData = Depends(get_current_user),
+    user: AuthenticatedUser = Depends(get_current_principal),
     sampah_controller: SampahController = Depends(),
 ):
     return await sampah_controller.post_sampah_v2(
-        token,
+        user,
         lang,
         longitude,
         latitude,
         address,
-        use_garbage_pile_model,
+        None if auto_detect_model else use_garbage_pile_model,
         capture_date,
         file,
     )